@@ -0,0 +1,88 @@
+"""
+Bandingkan sumber media upload: AdaptiveMediaFileUpload (read() per blok)
+vs MmapMediaFileUpload (potongan memoryview dari mmap).
+
+Meniru cara HttpRequest.next_chunk + http.client mengirim body:
+stream().seek(offset) -> _StreamSlice -> read(blocksize) berulang -> sendall.
+Socket diganti os.devnull, jadi yang terukur hanya biaya baca/copy di sisi kita.
+
+    python -m benchmarks.media_upload [file] [--size 2048] [--chunk 64] [--runs 3]
+
+Tanpa argumen file, file acak sebesar --size MiB dibuat sementara.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from googleapiclient.http import _StreamSlice
+
+from core.chunking import AdaptiveMediaFileUpload, MmapMediaFileUpload, MIB
+
+HTTP_BLOCKSIZE = 8192   # http.client.HTTPConnection.blocksize
+
+
+def send_file(media_cls, path, chunk_size, blocksize):
+    """Kirim seluruh file chunk per chunk ke /dev/null. Return (detik, cpu detik, bytes yang di-copy ke bytes baru)."""
+    media = media_cls(path, mimetype="video/*", chunksize=chunk_size, resumable=True)
+    size = media.size()
+    copied = 0
+    started, cpu_started = time.perf_counter(), time.process_time()
+    with open(os.devnull, "wb", buffering=0) as sink:
+        offset = 0
+        while offset < size:
+            data = media.stream()
+            data.seek(offset)
+            body = _StreamSlice(data, offset, media.chunksize())
+            while True:
+                block = body.read(blocksize)
+                if not block:
+                    break
+                if isinstance(block, bytes):
+                    copied += len(block)
+                sink.write(block)
+            offset = min(size, offset + media.chunksize())
+    elapsed, cpu = time.perf_counter() - started, time.process_time() - cpu_started
+    if hasattr(media, "close"):
+        media.close()
+    return elapsed, cpu, copied
+
+
+def make_file(size_mib):
+    fd, path = tempfile.mkstemp(suffix=".bin")
+    block = os.urandom(MIB)
+    with os.fdopen(fd, "wb") as f:
+        for _ in range(size_mib):
+            f.write(block)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("file", nargs="?")
+    parser.add_argument("--size", type=int, default=2048, help="MiB, jika file tidak diberikan")
+    parser.add_argument("--chunk", type=int, default=64, help="Ukuran chunk MiB")
+    parser.add_argument("--block", type=int, default=HTTP_BLOCKSIZE, help="Ukuran blok read() http.client")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    path = args.file or make_file(args.size)
+    try:
+        size = os.path.getsize(path)
+        # Satu putaran awal agar file ada di page cache untuk kedua varian
+        send_file(AdaptiveMediaFileUpload, path, args.chunk * MIB, 1024 * 1024)
+        print(f"{size / MIB:.0f} MiB, chunk {args.chunk} MiB, blok {args.block} B, {args.runs} run (terbaik)")
+        for name, cls in (("file read()", AdaptiveMediaFileUpload), ("mmap", MmapMediaFileUpload)):
+            results = [send_file(cls, path, args.chunk * MIB, args.block) for _ in range(args.runs)]
+            elapsed, cpu, copied = min(results)
+            print(f"{name:<12} {size / MIB / elapsed:8.0f} MiB/s  cpu {cpu:6.2f}s  copy ke bytes {copied / MIB:8.0f} MiB")
+    finally:
+        if not args.file:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from core.auth_manager import AuthManager
+from core.auth_status import get_auth_status_cache
+from core.channel_info import fetch_channel_info
+from core.upload_job import UploadContext, channel_key
+from utils import load_app_settings
+
+
+class AsyncEngine:
+    """
+    Event loop asyncio di satu thread latar untuk semua I/O ke YouTube:
+    refresh statistik, refresh token, dan upload resumable per chunk.
+
+    httplib2 tetap blocking, jadi setiap panggilan dijalankan di executor
+    dengan jumlah thread tetap. Upload dijalankan chunk demi chunk sebagai
+    coroutine: di antara chunk (dan selama backoff retry) thread dilepas.
+
+    Upload punya executor sendiri (upload_threads): satu chunk bisa berjalan
+    beberapa detik dan limiter bandwidth tidur di thread tersebut, jadi upload
+    tidak boleh menghabiskan thread io_threads yang dipakai statistik, refresh
+    token & cek auth.
+
+    Batas konkurensi eksplisit: semaphore 'api' (panggilan API ringan) dan
+    'token' (refresh OAuth). Jumlah upload paralel diatur UploadScheduler.
+    Hasil coroutine ke GUI lewat EngineBridge (core.workers).
+    """
+
+    def __init__(self, io_threads=8, api_concurrency=32, token_concurrency=4, upload_threads=3):
+        self.loop = asyncio.new_event_loop()
+        self.executor = ThreadPoolExecutor(max_workers=io_threads, thread_name_prefix="io")
+        self.upload_executor = ThreadPoolExecutor(max_workers=upload_threads, thread_name_prefix="upload")
+        self.loop.set_default_executor(self.executor)
+        self._limits = {"api": api_concurrency, "token": token_concurrency}
+        self._semaphores = {}
+        self._token_tasks = {}    # channel_key -> Task refresh yang sedang jalan (single-flight)
+        self._thread = threading.Thread(target=self._run, name="asyncio-engine", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro):
+        """Jadwalkan coroutine dari thread mana pun. Return concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self):
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=5)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.upload_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _semaphore(self, kind):
+        # Dibuat di thread loop saat pertama dipakai
+        semaphore = self._semaphores.get(kind)
+        if semaphore is None:
+            semaphore = self._semaphores[kind] = asyncio.Semaphore(self._limits[kind])
+        return semaphore
+
+    async def run_blocking(self, func, *args):
+        """Jalankan fungsi blocking di executor engine (thread tetap)."""
+        return await self.loop.run_in_executor(None, partial(func, *args))
+
+    async def run_upload_blocking(self, func, *args):
+        """Jalankan bagian upload yang blocking (hash, chunk, file jurnal) di executor upload."""
+        return await self.loop.run_in_executor(self.upload_executor, partial(func, *args))
+
+    async def api_call(self, func, *args):
+        """Panggilan API ringan (list, get, ...) dengan batas semaphore 'api'."""
+        async with self._semaphore("api"):
+            return await self.run_blocking(func, *args)
+
+    # --- TOKEN ---
+    async def credentials(self, category, channel_name):
+        """
+        Kredensial channel (refresh jika expired). Permintaan bersamaan untuk
+        channel yang sama menunggu satu refresh yang sama.
+        """
+        key = channel_key(category, channel_name)
+        task = self._token_tasks.get(key)
+        if task is None:
+            task = self.loop.create_task(self._load_credentials(category, channel_name))
+            self._token_tasks[key] = task
+            task.add_done_callback(lambda _: self._token_tasks.pop(key, None))
+        # shield: pemanggil yang dibatalkan tidak ikut membatalkan refresh milik yang lain
+        return await asyncio.shield(task)
+
+    async def _load_credentials(self, category, channel_name):
+        async with self._semaphore("token"):
+            return await self.run_blocking(AuthManager.load_credentials, category, channel_name)
+
+    async def auth_status(self, category, channel_name, save=True):
+        """Cek status auth channel (AuthStatusCache.check) tanpa memblok thread pemanggil."""
+        async with self._semaphore("token"):
+            return await self.run_blocking(get_auth_status_cache().check, category, channel_name, save)
+
+    async def scan_auth(self, channels, on_result=None):
+        """
+        Cek status auth banyak channel [(category, channel_name)] sekaligus;
+        paralel tapi dibatasi semaphore 'token'. on_result(category, channel_name, entry)
+        dipanggil dari thread engine setiap satu channel selesai.
+        Cache disimpan sekali di akhir. Return jumlah channel yang gagal dicek.
+        """
+        async def check_one(category, channel_name):
+            entry = await self.auth_status(category, channel_name, save=False)
+            if on_result:
+                on_result(category, channel_name, entry)
+
+        results = await asyncio.gather(*(check_one(c, n) for c, n in channels), return_exceptions=True)
+        await self.run_blocking(get_auth_status_cache().save)
+        failed = [r for r in results if isinstance(r, Exception)]
+        for error in failed:
+            print(f"Scan auth gagal: {error}")
+        return len(failed)
+
+    # --- STATISTIK ---
+    async def fetch_stats(self, category, channel_name):
+        creds = await self.credentials(category, channel_name)
+        return await self.api_call(fetch_channel_info, category, channel_name, creds)
+
+    # --- UPLOAD ---
+    async def upload(self, category, channel_name, data, progress_callback=None, status_callback=None, on_retry=None):
+        """
+        Sama seperti run_upload, tapi per chunk: thread executor upload hanya
+        dipakai selama request chunk berjalan. Callback dipanggil dari thread engine.
+        """
+        ctx = UploadContext(category, channel_name, data, progress_callback, status_callback, on_retry)
+        try:
+            await self.run_upload_blocking(ctx.check_duplicate)
+            ctx.status("Authenticating...")
+            creds = await self.credentials(category, channel_name)
+            upload = await self.run_upload_blocking(ctx.prepare, creds)
+            while upload.video_id is None:
+                await upload.astep(self.run_upload_blocking)
+            return await self.run_upload_blocking(ctx.complete)
+        except asyncio.CancelledError:
+            # Chunk mungkin masih berjalan di thread upload: transport ditutup, bukan dikembalikan ke pool
+            ctx.discard_transport()
+            raise
+        except Exception as e:
+            # Telemetry & ledger menulis file -> jangan di thread event loop
+            await self.run_upload_blocking(ctx.failed, e)
+            raise
+        finally:
+            ctx.release_transport()
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_engine():
+    """AsyncEngine tunggal untuk seluruh proses (dibuat saat pertama dipakai)."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            settings = load_app_settings()
+            _engine = AsyncEngine(
+                settings["io_threads"], settings["api_concurrency"],
+                upload_threads=settings["upload_threads"] or settings["max_parallel_uploads"],
+            )
+        return _engine
@@ -0,0 +1,97 @@
+import os
+import json
+import threading
+import time
+
+from core.auth_manager import AuthManager, TRANSIENT_STATUSES
+
+STATUS_TTL = 300   # Detik; status lebih muda dari ini tidak dicek ulang saat pindah halaman
+STATUS_CACHE_FILE = os.path.join("cache", "auth_status.json")
+
+
+class AuthStatusCache:
+    """
+    Status auth terakhir per channel (teks & warna dari AuthManager.check_status)
+    beserta waktu cek. GUI menampilkan status cache langsung; cek sebenarnya
+    (baca token, mungkin refresh ke jaringan) dijalankan di AsyncEngine.
+    Disimpan ke STATUS_CACHE_FILE, jadi sidebar & dashboard langsung punya
+    status saat aplikasi dibuka (sebelum scan latar selesai).
+    """
+
+    def __init__(self, ttl=STATUS_TTL, path=STATUS_CACHE_FILE):
+        self.ttl = ttl
+        self.path = path
+        self._entries = {}   # (category, channel_name) -> {"text", "color", "checked_at"}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        for key, entry in data.items():
+            category, _, channel_name = key.partition("/")
+            self._entries[(category, channel_name)] = entry
+
+    def save(self):
+        # Lock ikut menjaga file sementara dari penulisan bersamaan
+        with self._lock:
+            data = {f"{c}/{n}": entry for (c, n), entry in self._entries.items()}
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+
+    def get(self, category, channel_name):
+        with self._lock:
+            return self._entries.get((category, channel_name))
+
+    def is_fresh(self, entry):
+        return entry is not None and time.time() - entry["checked_at"] < self.ttl
+
+    def set(self, category, channel_name, text, color):
+        entry = {"text": text, "color": color, "checked_at": time.time()}
+        with self._lock:
+            self._entries[(category, channel_name)] = entry
+        return entry
+
+    def forget(self, category, channel_name=None):
+        """Buang status channel (channel_name None = semua channel di kategori)."""
+        with self._lock:
+            for key in list(self._entries):
+                if key[0] == category and channel_name in (None, key[1]):
+                    del self._entries[key]
+
+    def check(self, category, channel_name, save=True):
+        """
+        Cek status sekarang (blocking, bisa refresh token ke jaringan) lalu simpan.
+        Status sementara (mis. Offline) dikembalikan tanpa disimpan, jadi status
+        terakhir yang valid tetap dipakai dan dicek ulang pada kesempatan berikutnya.
+        """
+        text, color = AuthManager.check_status(category, channel_name)
+        if text in TRANSIENT_STATUSES:
+            return {"text": text, "color": color, "checked_at": time.time(), "transient": True}
+        entry = self.set(category, channel_name, text, color)
+        if save:
+            self.save()
+        return entry
+
+    def last_checked(self):
+        """Waktu cek terbaru dari semua channel (None jika belum pernah)."""
+        with self._lock:
+            return max((e["checked_at"] for e in self._entries.values()), default=None)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_auth_status_cache():
+    """AuthStatusCache tunggal untuk seluruh proses."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = AuthStatusCache()
+        return _cache
@@ -0,0 +1,192 @@
+import os
+import time
+import threading
+from datetime import datetime
+
+from utils import load_app_settings, APP_SETTINGS_FILE
+
+MBPS = 1000 * 1000 / 8      # 1 Mbit/s dalam bytes/detik
+RELOAD_INTERVAL = 5.0       # Cek perubahan settings.json tiap 5 detik
+MAX_SLEEP = 0.25            # Tidur pendek agar perubahan limit cepat terasa
+
+
+class TokenBucket:
+    """Token bucket sederhana. rate = 0 berarti tanpa batas."""
+
+    def __init__(self, rate=0):
+        self.rate = 0
+        self.tokens = 0.0
+        self.updated = time.monotonic()
+        self.set_rate(rate)
+
+    def set_rate(self, rate):
+        self._refill()
+        self.rate = max(0, rate)
+        # Burst maksimal = 1 detik trafik
+        self.tokens = min(self.tokens, self.capacity())
+
+    def capacity(self):
+        return max(self.rate, 64 * 1024)
+
+    def _refill(self):
+        now = time.monotonic()
+        if self.rate:
+            self.tokens = min(self.capacity(), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, nbytes):
+        """Ambil token (boleh berhutang). Return detik yang harus ditunggu."""
+        if not self.rate:
+            return 0.0
+        self._refill()
+        self.tokens -= nbytes
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def debt_wait(self):
+        if not self.rate:
+            return 0.0
+        self._refill()
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+def _parse_hhmm(text):
+    h, m = text.split(":")
+    return int(h) * 60 + int(m)
+
+
+class BandwidthLimiter:
+    """
+    Pembatas bandwidth upload untuk seluruh proses.
+    - bandwidth_limit_mbps: batas global (0 = tanpa batas)
+    - channel_bandwidth_mbps: {"Kategori/Channel": mbps} batas per channel
+    - bandwidth_schedule: [{"start": "22:00", "end": "06:00", "limit_mbps": 0}]
+      menimpa batas global pada jam tertentu (mis. full speed malam hari)
+    Semua nilai dibaca ulang dari settings.json saat berubah, jadi upload
+    yang sedang berjalan ikut menyesuaikan tanpa restart.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.global_bucket = TokenBucket()
+        self.channel_buckets = {}
+        self.base_rate = 0
+        self.channel_rates = {}
+        self.schedule = []
+        self._settings_mtime = None
+        self._next_reload = 0.0
+        self._next_schedule_check = 0.0
+        self.share = 1.0    # Porsi batas global untuk proses ini (mode multi-proses)
+        self.reload()
+
+    def configure(self, global_mbps=None, channel_mbps=None, schedule=None):
+        """Ubah batas saat runtime (nilai None = tidak diubah)."""
+        with self._lock:
+            if global_mbps is not None:
+                self.base_rate = global_mbps * MBPS
+            if channel_mbps is not None:
+                self.channel_rates = {k: v * MBPS for k, v in channel_mbps.items()}
+                for key, bucket in self.channel_buckets.items():
+                    bucket.set_rate(self.channel_rates.get(key, 0))
+            if schedule is not None:
+                self.schedule = [
+                    (_parse_hhmm(s["start"]), _parse_hhmm(s["end"]), s.get("limit_mbps", 0) * MBPS)
+                    for s in schedule
+                ]
+            self._apply_schedule()
+
+    def reload(self):
+        settings = load_app_settings()
+        self.configure(
+            settings.get("bandwidth_limit_mbps", 0),
+            settings.get("channel_bandwidth_mbps", {}),
+            settings.get("bandwidth_schedule", []),
+        )
+
+    def current_global_rate(self, now=None):
+        now = now or datetime.now()
+        minutes = now.hour * 60 + now.minute
+        for start, end, rate in self.schedule:
+            # Jendela boleh melewati tengah malam (mis. 22:00 - 06:00)
+            inside = start <= minutes < end if start <= end else (minutes >= start or minutes < end)
+            if inside:
+                return rate
+        return self.base_rate
+
+    def set_share(self, share):
+        """Dipakai worker process: batas global dibagi rata antar proses upload."""
+        with self._lock:
+            self.share = share
+            self._apply_schedule()
+
+    def _apply_schedule(self):
+        rate = self.current_global_rate() * self.share
+        if rate != self.global_bucket.rate:
+            self.global_bucket.set_rate(rate)
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now < self._next_reload:
+            return
+        self._next_reload = now + RELOAD_INTERVAL
+        try:
+            mtime = os.path.getmtime(APP_SETTINGS_FILE)
+        except OSError:
+            mtime = None
+        if mtime != self._settings_mtime:
+            self._settings_mtime = mtime
+            self.reload()
+        else:
+            with self._lock:
+                self._apply_schedule()
+
+    def acquire(self, key, nbytes):
+        """Blok sampai nbytes boleh dikirim untuk channel `key`."""
+        self._maybe_reload()
+        with self._lock:
+            bucket = self.channel_buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(self.channel_rates.get(key, 0))
+                self.channel_buckets[key] = bucket
+            wait = max(bucket.take(nbytes), self.global_bucket.take(nbytes))
+
+        while wait > 0:
+            time.sleep(min(wait, MAX_SLEEP))
+            with self._lock:
+                wait = max(bucket.debt_wait(), self.global_bucket.debt_wait())
+
+    def throttle_for(self, key):
+        """Callable throttle(nbytes) untuk dipasang di media upload."""
+        return lambda nbytes: self.acquire(key, nbytes)
+
+
+class ThrottledReader:
+    """
+    Bungkus file object: setiap read() melewati limiter.
+    http.client mengirim body per blok kecil, jadi pacing-nya halus.
+    """
+
+    def __init__(self, fd, throttle):
+        self._fd = fd
+        self._throttle = throttle
+
+    def read(self, n=-1):
+        data = self._fd.read(n)
+        if data:
+            self._throttle(len(data))
+        return data
+
+    def __getattr__(self, name):
+        # seek/tell/close dsb diteruskan ke file asli
+        return getattr(self._fd, name)
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+def get_limiter():
+    """Instance limiter tunggal untuk seluruh proses."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = BandwidthLimiter()
+        return _limiter
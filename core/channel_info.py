@@ -0,0 +1,95 @@
+import os
+import json
+
+from core.auth_manager import AuthManager
+from core.youtube_service import leased_service
+from core.quota import quota_key
+from utils import BASE_CHANNELS_DIR
+
+STATS_CACHE_FILE = "stats.json"   # Per channel, dibaca dashboard
+
+
+def format_count(value):
+    value = int(value)
+    if value >= 1000000:
+        return f"{value/1000000:.1f}M"
+    if value >= 1000:
+        return f"{value/1000:.1f}K"
+    return str(value)
+
+
+def fetch_channel_info(category, channel_name, creds=None):
+    """
+    Ambil statistik channel + 5 video terakhir (dengan jumlah views).
+    creds opsional (mis. dari AsyncEngine.credentials); jika kosong dibaca dari token.json.
+    Raise Exception jika token tidak ada / data channel tidak ditemukan.
+    """
+    # 1. Autentikasi (refresh token jika expired)
+    if creds is None:
+        creds = AuthManager.load_credentials(category, channel_name)
+    # Transport keep-alive per kredensial dipinjam dari pool (tanpa handshake baru)
+    with leased_service(creds, quota_key(category, channel_name)) as youtube:
+        return _fetch(youtube)
+
+
+def _fetch(youtube):
+    # 2. Ambil Statistik Channel & ID Playlist Uploads
+    chan_resp = youtube.channels().list(
+        mine=True,
+        part="statistics,contentDetails"
+    ).execute()
+
+    if not chan_resp.get("items"):
+        raise Exception("Channel data not found")
+
+    item = chan_resp["items"][0]
+    stats = item["statistics"]
+    uploads_playlist_id = item["contentDetails"]["relatedPlaylists"]["uploads"]
+
+    # 3. Ambil 5 Video Terakhir dari 'Uploads Playlist'
+    pl_resp = youtube.playlistItems().list(
+        playlistId=uploads_playlist_id,
+        part="snippet,contentDetails,status",
+        maxResults=5
+    ).execute()
+
+    video_ids = []
+    videos_list = []
+    for play_item in pl_resp.get("items", []):
+        vid_id = play_item["contentDetails"]["videoId"]
+        video_ids.append(vid_id)
+        videos_list.append({
+            "id": vid_id,
+            "title": play_item["snippet"]["title"],
+            "status": play_item["status"]["privacyStatus"],
+            "published": play_item["snippet"]["publishedAt"]
+        })
+
+    # 4. Ambil View Count untuk video-video tersebut
+    vid_stats_map = {}
+    if video_ids:
+        vid_resp = youtube.videos().list(
+            id=",".join(video_ids),
+            part="statistics"
+        ).execute()
+        for v in vid_resp.get("items", []):
+            vid_stats_map[v["id"]] = v["statistics"].get("viewCount", "0")
+
+    for v in videos_list:
+        v["views_fmt"] = format_count(vid_stats_map.get(v["id"], "0"))
+
+    # 5. Kemas semua data
+    return {
+        "subscriberCount": stats.get("subscriberCount", "0"),
+        "viewCount": stats.get("viewCount", "0"),
+        "videoCount": stats.get("videoCount", "0"),
+        "videos": videos_list
+    }
+
+
+def save_stats_cache(category, channel_name, data):
+    """Simpan hasil fetch_channel_info ke channels/<cat>/<chan>/stats.json (untuk dashboard)."""
+    cache_dir = os.path.join(BASE_CHANNELS_DIR, category, channel_name)
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(os.path.join(cache_dir, STATS_CACHE_FILE), "w") as f:
+        json.dump(data, f)
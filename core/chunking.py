@@ -0,0 +1,177 @@
+import mmap
+from googleapiclient.http import MediaFileUpload
+from core.bandwidth import ThrottledReader
+
+# YouTube resumable upload: ukuran chunk WAJIB kelipatan 256 KiB
+CHUNK_ALIGN = 256 * 1024
+MIB = 1024 * 1024
+
+DEFAULT_MIN_CHUNK = 1 * MIB
+DEFAULT_MAX_CHUNK = 64 * MIB
+TARGET_CHUNK_SECONDS = 4.0   # Durasi ideal satu chunk (latency jadi kecil porsinya)
+THROUGHPUT_SMOOTHING = 0.5   # Bobot EWMA untuk sampel throughput terbaru
+
+
+def align_chunk(size):
+    """Bulatkan ke bawah ke kelipatan 256 KiB (minimal 256 KiB)."""
+    return max(CHUNK_ALIGN, (int(size) // CHUNK_ALIGN) * CHUNK_ALIGN)
+
+
+class AdaptiveChunker:
+    """
+    Mengatur ukuran chunk berdasarkan throughput per chunk yang terukur.
+    Target: satu chunk butuh ~TARGET_CHUNK_SECONDS agar pipa tetap penuh
+    dan overhead round-trip per request tidak dominan.
+    """
+
+    def __init__(self, min_size=None, max_size=None, target_seconds=TARGET_CHUNK_SECONDS):
+        self.min_size = align_chunk(min_size or DEFAULT_MIN_CHUNK)
+        self.max_size = max(self.min_size, align_chunk(max_size or DEFAULT_MAX_CHUNK))
+        self.target_seconds = target_seconds
+        self.chunk_size = self.min_size
+        self.throughput = 0.0   # bytes/detik (EWMA)
+
+    def update(self, nbytes, seconds):
+        """Catat satu chunk yang selesai, lalu hitung ukuran chunk berikutnya."""
+        if nbytes <= 0 or seconds <= 0:
+            return self.chunk_size
+
+        sample = nbytes / seconds
+        if self.throughput:
+            self.throughput += THROUGHPUT_SMOOTHING * (sample - self.throughput)
+        else:
+            self.throughput = sample
+
+        # Naik/turun maksimal 2x per langkah agar tidak berosilasi
+        ideal = self.throughput * self.target_seconds
+        ideal = min(ideal, self.chunk_size * 2)
+        ideal = max(ideal, self.chunk_size / 2)
+
+        self.chunk_size = min(self.max_size, max(self.min_size, align_chunk(ideal)))
+        return self.chunk_size
+
+
+class AdaptiveMediaFileUpload(MediaFileUpload):
+    """
+    MediaFileUpload yang ukuran chunk-nya boleh diubah di tengah upload.
+    throttle(nbytes) opsional dipanggil setiap blok dibaca saat dikirim.
+    """
+
+    def __init__(self, filename, throttle=None, **kwargs):
+        super().__init__(filename, **kwargs)
+        self._throttle = throttle
+
+    def stream(self):
+        if self._throttle:
+            return ThrottledReader(self._fd, self._throttle)
+        return self._fd
+
+    def set_chunksize(self, chunksize):
+        # HttpRequest.next_chunk membaca chunksize() setiap kali kirim chunk
+        self._chunksize = align_chunk(chunksize)
+
+
+class MmapReader:
+    """
+    Stream seekable di atas mmap: read() mengembalikan potongan memoryview
+    (tanpa copy ke bytes baru), langsung dikirim http.client lewat sendall.
+    on_seek(offset) dipanggil saat next_chunk pindah ke awal chunk.
+    """
+
+    def __init__(self, view, throttle=None, on_seek=None):
+        self._view = view
+        self._size = len(view)
+        self._pos = 0
+        self._throttle = throttle
+        self._on_seek = on_seek
+
+    def read(self, n=-1):
+        end = self._size if n is None or n < 0 else min(self._size, self._pos + n)
+        data = self._view[self._pos:end]
+        self._pos = end
+        if data and self._throttle:
+            self._throttle(len(data))
+        return data
+
+    def seek(self, offset, whence=0):
+        if whence == 1:
+            offset += self._pos
+        elif whence == 2:
+            offset += self._size
+        self._pos = max(0, min(self._size, offset))
+        if self._on_seek:
+            self._on_seek(self._pos)
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+
+class MmapMediaFileUpload(AdaptiveMediaFileUpload):
+    """
+    AdaptiveMediaFileUpload yang membaca file lewat mmap: chunk dikirim sebagai
+    potongan memoryview, bukan bytes hasil read() per blok. Kernel diberi tahu
+    akses berurutan (MADV_SEQUENTIAL), chunk berikutnya di-prefetch
+    (MADV_WILLNEED) dan bagian yang sudah terkirim dilepas (MADV_DONTNEED) agar
+    RSS tidak ikut membesar sampai ukuran file (2-10 GB).
+    File kosong / mmap gagal -> jalur file biasa.
+    """
+
+    def __init__(self, filename, throttle=None, **kwargs):
+        super().__init__(filename, throttle=throttle, **kwargs)
+        self._mmap = None
+        self._view = None
+        self._released = 0       # Byte [0, _released) sudah dilepas dari memori proses
+        self._prefetched = None  # Offset chunk terakhir yang di-prefetch
+        try:
+            if self.size() > 0:
+                self._mmap = mmap.mmap(self._fd.fileno(), 0, access=mmap.ACCESS_READ)
+                self._view = memoryview(self._mmap)
+                self._advise(getattr(mmap, "MADV_SEQUENTIAL", None), 0, self.size())
+        except (OSError, ValueError) as e:
+            print(f"mmap gagal, pakai pembacaan file biasa: {e}")
+            self.close()
+
+    def _advise(self, option, start, length):
+        if option is None or self._mmap is None or not hasattr(self._mmap, "madvise"):
+            return
+        # Offset madvise wajib kelipatan ukuran page
+        aligned = start - start % mmap.PAGESIZE
+        length = min(length + (start - aligned), self.size() - aligned)
+        if length > 0:
+            try:
+                self._mmap.madvise(option, aligned, length)
+            except OSError:
+                pass
+
+    def _on_seek(self, offset):
+        # Dipanggil di awal setiap chunk (next_chunk seek ke resumable_progress)
+        done = offset - offset % mmap.PAGESIZE
+        if done > self._released:
+            self._advise(getattr(mmap, "MADV_DONTNEED", None), self._released, done - self._released)
+            self._released = done
+        if offset != self._prefetched:
+            self._prefetched = offset
+            self._advise(getattr(mmap, "MADV_WILLNEED", None), offset, self._chunksize)
+
+    def stream(self):
+        if self._view is None:
+            return super().stream()
+        return MmapReader(self._view, self._throttle, self._on_seek)
+
+    def close(self):
+        view, mm = self._view, self._mmap
+        self._view = self._mmap = None
+        try:
+            if view is not None:
+                view.release()
+            if mm is not None:
+                mm.close()
+        except BufferError:
+            # Potongan memoryview masih dipegang (mis. request yang belum selesai):
+            # biarkan GC yang menutup mmap
+            pass
+
+    def __del__(self):
+        self.close()
+        super().__del__()
@@ -0,0 +1,343 @@
+"""
+Mode headless (tanpa Qt) untuk server render / cron.
+
+    python -m core.cli enqueue Kategori/Channel video1.mp4 video2.mp4 --tags "a,b"
+    python -m core.cli import manifest.csv [--channel Kategori/Channel] [--dry-run]
+    python -m core.cli run [--channel Kategori/Channel] [--parallel 3]
+    python -m core.cli stats [Kategori/Channel ...]
+    python -m core.cli list [--state queued]
+    python -m core.cli history [--by hour] [--channel Kategori/Channel]
+    python -m core.cli credentials [--remove-files]   (impor token & secret ke credential store)
+
+Modul berat (google api client, dsb) baru di-import di dalam perintah,
+jadi `--help` dan `list` tetap cepat. PySide6 tidak pernah di-import
+(kecuali job dengan thumbnail, yang butuh QtGui untuk resize).
+Exit code 1 jika ada job yang gagal -> bisa dipantau dari cron.
+"""
+import argparse
+import os
+import sys
+
+
+def parse_channel(value):
+    category, sep, channel_name = value.partition("/")
+    if not sep or not category or not channel_name:
+        raise argparse.ArgumentTypeError("format channel: Kategori/Channel")
+    return category, channel_name
+
+
+def title_from_path(path):
+    # Sama seperti UploadRow.set_file_data
+    filename = os.path.basename(path)
+    return os.path.splitext(filename)[0].replace("_", " ").replace("-", " ").title()
+
+
+# --- ENQUEUE ---
+def cmd_enqueue(args):
+    from core.job_store import get_job_store
+
+    category, channel_name = args.channel
+    schedule_date = schedule_time = None
+    if args.schedule:
+        schedule_date, _, schedule_time = args.schedule.partition(" ")
+
+    items = []
+    for path in args.files:
+        if not os.path.isfile(path):
+            print(f"File tidak ditemukan, dilewati: {path}")
+            continue
+        items.append((category, channel_name, {
+            "video_path": os.path.abspath(path),
+            "title": args.title or title_from_path(path),
+            "desc": args.desc,
+            "tags": args.tags,
+            "privacy": args.privacy,
+            "thumb": os.path.abspath(args.thumb) if args.thumb else None,
+            "schedule_date": schedule_date,
+            "schedule_time": schedule_time,
+        }))
+
+    ids = get_job_store().add_jobs(items)
+    print(f"{len(ids)} job masuk antrean {category}/{channel_name}: {ids}")
+    return 0 if len(ids) == len(args.files) else 1
+
+
+# --- IMPORT MANIFEST ---
+def cmd_import(args):
+    from core.job_store import get_job_store
+    from core.manifest import import_manifest
+
+    result = import_manifest(args.manifest, get_job_store(), default_channel=args.channel, dry_run=args.dry_run)
+    for line_no, msg in result["errors"]:
+        print(f"baris {line_no}: {msg}")
+    for key, count in sorted(result["channels"].items()):
+        print(f"{key}: {count}")
+    verb = "valid" if args.dry_run else "masuk antrean"
+    print(f"{result['imported']} job {verb}, {len(result['errors'])} baris dilewati.")
+    return 1 if result["errors"] else 0
+
+
+# --- RUN ---
+def make_progress_printer(key, title):
+    last = {"step": -1}
+
+    def on_progress(percent, info):
+        step = percent // 10
+        if step != last["step"]:
+            last["step"] = step
+            speed = info.get("throughput", 0) / (1024 * 1024)
+            print(f"[{key}] {title[:30]}: {percent}% ({speed:.1f} MB/s)")
+    return on_progress
+
+
+def run_post_step(store, job):
+    from core.job_store import POST_DONE, POST_PENDING
+    from core.upload_job import apply_thumbnail
+
+    try:
+        apply_thumbnail(job["category"], job["channel_name"], job["video_id"], job["thumb"])
+        store.set_post_state(job["id"], POST_DONE)
+        print(f"[{job['category']}/{job['channel_name']}] Thumbnail terpasang: {job['video_id']}")
+    except Exception as e:
+        # Tetap pending: dicoba lagi oleh run berikutnya / PostUploadPipeline di GUI
+        store.set_post_state(job["id"], POST_PENDING, str(e))
+        print(f"[{job['category']}/{job['channel_name']}] Thumbnail gagal: {e}")
+
+
+def run_job(job):
+    from core.upload_job import run_upload, channel_key
+
+    key = channel_key(job["category"], job["channel_name"])
+    title = job["title"] or os.path.basename(job["video_path"])
+    # Thumbnail dipasang terpisah setelah semua upload (sama seperti scheduler GUI)
+    return run_upload(
+        job["category"], job["channel_name"], job["data"],
+        progress_callback=make_progress_printer(key, title),
+        status_callback=lambda text: print(f"[{key}] {text}"),
+        on_retry=lambda attempt, delay, error: print(f"[{key}] Retry #{attempt} dalam {delay:.0f} detik: {error}"),
+    )
+
+
+def cmd_run(args):
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+    from core.fair_queue import FairQueue
+    from core.job_store import get_job_store, QUEUED, POST_PENDING
+    from core.quota import get_quota_ledger, quota_key, upload_cost
+    from core.retry import QuotaExceededError, ChannelLimitError
+    from core.upload_job import channel_key, quota_check
+    from utils import load_app_settings
+
+    settings = load_app_settings()
+    max_global = args.parallel or settings["max_parallel_uploads"]
+    max_per_channel = args.per_channel or settings["max_uploads_per_channel"]
+    category, channel_name = args.channel or (None, None)
+
+    store = get_job_store()
+    ledger = get_quota_ledger()
+    store.requeue_interrupted()
+
+    # Thumbnail (tertunda dari run sebelumnya + hasil run ini) dipasang setelah
+    # semua upload selesai, jadi tidak menahan slot upload berikutnya
+    post_jobs = [
+        job["id"] for job in store.list_pending_post_steps()
+        if category is None or (job["category"], job["channel_name"]) == (category, channel_name)
+    ]
+
+    queue = FairQueue(max_global, max_per_channel)
+    jobs = {}
+    for job in store.list_jobs(category, channel_name, states=[QUEUED]):
+        jobs[job["id"]] = job
+        queue.push(channel_key(job["category"], job["channel_name"]), job["id"])
+    if not jobs:
+        print("Antrean kosong.")
+        for job_id in post_jobs:
+            run_post_step(store, store.get_job(job_id))
+        return 0
+
+    held = {}
+    def can_start(key, job_id):
+        ok, reason = quota_check(jobs[job_id], ledger)
+        if not ok:
+            held[job_id] = reason
+        return ok
+
+    failed = skipped = 0
+    running = {}   # Future -> (key, job)
+    with ThreadPoolExecutor(max_workers=max_global, thread_name_prefix="upload") as pool:
+        while True:
+            while (ready := queue.next_ready(can_start)) is not None:
+                key, job_id = ready
+                job = jobs[job_id]
+                held.pop(job_id, None)
+                if not store.mark_uploading(job_id):
+                    # Sudah diambil proses lain (GUI / run lain) sejak daftar dibaca
+                    queue.mark_done(key)
+                    skipped += 1
+                    print(f"[{key}] Dilewati (sedang diproses di tempat lain): {job['title']}")
+                    continue
+                ledger.reserve(job_id, quota_key(job["category"], job["channel_name"]), key, upload_cost(bool(job["thumb"])))
+                running[pool.submit(run_job, job)] = (key, job)
+
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                key, job = running.pop(future)
+                ledger.release(job["id"])
+                queue.mark_done(key)
+                try:
+                    result = future.result()
+                except (QuotaExceededError, ChannelLimitError) as e:
+                    # Kuota project / batas channel habis: biarkan tetap queued untuk run berikutnya
+                    store.requeue(job["id"])
+                    held[job["id"]] = str(e)
+                    print(f"[{key}] Ditahan: {job['title']} ({e})")
+                    continue
+                except Exception as e:
+                    failed += 1
+                    store.mark_failed(job["id"], str(e))
+                    print(f"[{key}] GAGAL {job['title']}: {e}")
+                    continue
+
+                store.mark_done(job["id"], result["video_id"])
+                if job["thumb"]:
+                    store.set_post_state(job["id"], POST_PENDING)
+                    post_jobs.append(job["id"])
+
+    for job_id in post_jobs:
+        run_post_step(store, store.get_job(job_id))
+
+    for job_id, reason in held.items():
+        print(f"Ditahan: {jobs[job_id]['title']} ({reason})")
+    print(f"Selesai: {len(jobs) - failed - len(held) - skipped} sukses, {failed} gagal, "
+          f"{len(held)} ditahan, {skipped} dilewati.")
+    return 1 if failed else 0
+
+
+# --- STATS ---
+def cmd_stats(args):
+    from core.channel_info import fetch_channel_info, save_stats_cache
+    from utils import get_channel_structure
+
+    channels = args.channels or [
+        (category, channel_name)
+        for category, names in get_channel_structure().items()
+        for channel_name in names
+    ]
+    failed = 0
+    for category, channel_name in channels:
+        try:
+            data = fetch_channel_info(category, channel_name)
+            save_stats_cache(category, channel_name, data)
+            print(f"{category}/{channel_name}: {data['subscriberCount']} subs, "
+                  f"{data['viewCount']} views, {data['videoCount']} video")
+        except Exception as e:
+            failed += 1
+            print(f"{category}/{channel_name}: gagal ({e})")
+    return 1 if failed else 0
+
+
+# --- LIST / HISTORY ---
+def cmd_list(args):
+    from core.job_store import get_job_store
+
+    category, channel_name = args.channel or (None, None)
+    states = [args.state] if args.state else None
+    for job in get_job_store().list_jobs(category, channel_name, states=states, limit=args.limit):
+        extra = job["video_id"] or job["error"] or ""
+        print(f"{job['id']:>5}  {job['state']:<9} {job['category']}/{job['channel_name']:<20} {job['title'][:40]:<40} {extra}")
+    return 0
+
+
+def cmd_history(args):
+    from core.telemetry import summarize_history
+
+    key = "/".join(args.channel) if args.channel else None
+    for group, s in sorted(summarize_history(group_by=args.by, channel_key=key).items(), key=lambda kv: str(kv[0])):
+        print(f"{str(group):<30} {s['uploads']:>4} upload, {s['failed']:>3} gagal, "
+              f"{s['mean_bps'] / (1024 * 1024):6.2f} MB/s, {s['mean_wall_seconds']:>7.1f}s, {s['retries']} retry")
+    return 0
+
+
+# --- CREDENTIAL STORE ---
+def cmd_credentials(args):
+    from core.token_store import get_credential_store
+
+    store = get_credential_store()
+    if store is None:
+        print("Credential store belum aktif: isi \"credential_store\" di settings.json.")
+        return 1
+    failed = 0
+    for category, channel_name, error in store.migrate(remove_files=args.remove_files):
+        uid = store.uid(category, channel_name)
+        if error:
+            failed += 1
+            print(f"GAGAL  {category}/{channel_name}: {error}")
+        else:
+            print(f"{uid or '-':<32}  {category}/{channel_name}")
+    print(f"{store.load_all()} channel di {store.path}")
+    return 1 if failed else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m core.cli", description="Upload engine tanpa GUI")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("enqueue", help="Masukkan video ke antrean channel")
+    p.add_argument("channel", type=parse_channel, help="Kategori/Channel")
+    p.add_argument("files", nargs="+")
+    p.add_argument("--title", help="Default: dari nama file")
+    p.add_argument("--desc", default="")
+    p.add_argument("--tags", default="")
+    p.add_argument("--privacy", default="private", choices=["private", "unlisted", "public"])
+    p.add_argument("--thumb")
+    p.add_argument("--schedule", help="Jadwal publish WIB, 'YYYY-MM-DD HH:MM'")
+    p.set_defaults(func=cmd_enqueue)
+
+    p = sub.add_parser("import", help="Import manifest CSV / JSONL ke antrean")
+    p.add_argument("manifest")
+    p.add_argument("--channel", type=parse_channel, help="Channel untuk baris tanpa kolom channel")
+    p.add_argument("--dry-run", action="store_true", help="Validasi saja, tanpa menulis job")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("run", help="Jalankan antrean sampai habis")
+    p.add_argument("--channel", type=parse_channel)
+    p.add_argument("--parallel", type=int, help="Default: max_parallel_uploads di settings.json")
+    p.add_argument("--per-channel", type=int, help="Default: max_uploads_per_channel")
+    p.set_defaults(func=cmd_run)
+
+    p = sub.add_parser("stats", help="Refresh statistik channel (stats.json)")
+    p.add_argument("channels", nargs="*", type=parse_channel)
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("list", help="Tampilkan job di antrean")
+    p.add_argument("--channel", type=parse_channel)
+    p.add_argument("--state", choices=["queued", "uploading", "done", "failed"])
+    p.add_argument("--limit", type=int)
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("history", help="Rekap telemetry upload")
+    p.add_argument("--by", default="channel", choices=["channel", "hour"])
+    p.add_argument("--channel", type=parse_channel, help="Hanya upload channel ini (Kategori/Channel)")
+    p.set_defaults(func=cmd_history)
+
+    p = sub.add_parser("credentials", help="Impor client_secret.json & token.json semua channel ke credential store")
+    p.add_argument("--remove-files", action="store_true", help="Hapus file per folder setelah berhasil diimpor")
+    p.set_defaults(func=cmd_credentials)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    finally:
+        # Thread refresh token hanya ada jika perintahnya memakai kredensial
+        credentials = sys.modules.get("core.credentials")
+        if credentials is not None:
+            credentials.get_credential_manager().stop()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
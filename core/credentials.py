@@ -0,0 +1,200 @@
+import os
+import json
+import threading
+from datetime import datetime, timezone
+
+from google.oauth2.credentials import Credentials
+from google.auth.transport.requests import Request
+
+from core.auth_manager import AuthManager, SCOPES
+from core.token_store import get_credential_store
+
+REFRESH_AHEAD = 600            # Detik sebelum expiry token di-refresh oleh thread latar
+MIN_VALIDITY = 60              # get() me-refresh sendiri hanya jika sisa umur token < ini
+REFRESH_CHECK_INTERVAL = 60    # Interval cek thread refresher
+
+
+def _seconds_left(creds):
+    if creds.expiry is None:
+        return float("inf")
+    # google-auth menyimpan expiry sebagai datetime UTC naive
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return (creds.expiry - now).total_seconds()
+
+
+def _write_atomic(path, text):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+class CredentialManager:
+    """
+    Satu objek Credentials per channel di memori proses, dipakai bersama oleh
+    upload, statistik dan thumbnail. Token di-refresh di tempat (objek yang
+    sama), jadi semua transport yang memegangnya langsung memakai token baru.
+
+    - Thread latar me-refresh token REFRESH_AHEAD detik sebelum expiry, sehingga
+      upload yang sedang berjalan tidak pernah menunggu refresh.
+    - Pemanggil bersamaan untuk channel yang sama menunggu satu refresh (lock per channel).
+    - token.json ditulis atomic (file sementara + rename); jika token.json
+      diganti dari luar (login ulang), versi baru dibaca otomatis (mtime).
+    - Jika credential store aktif (core.token_store), token dibaca/ditulis ke
+      store dan penanda versinya token_version, bukan mtime.
+    """
+
+    def __init__(self, refresh_ahead=REFRESH_AHEAD, check_interval=REFRESH_CHECK_INTERVAL):
+        self.refresh_ahead = refresh_ahead
+        self.check_interval = check_interval
+        self._entries = {}   # (category, channel_name) -> {"creds", "stamp", "error"?}
+        self._locks = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _key_lock(self, key):
+        with self._lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    @staticmethod
+    def _mtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _stamp(self, key):
+        # Penanda versi token: versi baris di credential store, atau mtime token.json
+        store = get_credential_store()
+        if store is not None:
+            return store.token_version(*key)
+        return self._mtime(AuthManager.get_paths(*key)["token"])
+
+    def _write(self, key, creds, create=False):
+        store = get_credential_store()
+        if store is not None:
+            return store.put_token(*key, creds.to_json(), create=create)
+        path = AuthManager.get_paths(*key)["token"]
+        _write_atomic(path, creds.to_json())
+        return self._mtime(path)
+
+    def get(self, category, channel_name):
+        """
+        Credentials channel yang masih berlaku (dibaca dari token.json saat
+        pertama kali). Raise Exception jika token tidak ada, RefreshError jika
+        refresh ditolak (mis. invalid_grant).
+        """
+        key = (category, channel_name)
+        entry = self._entries.get(key)
+        if entry and self._usable(key, entry):
+            return entry["creds"]
+
+        with self._key_lock(key):
+            # Cek ulang: thread lain mungkin baru saja membaca / me-refresh
+            entry = self._entries.get(key)
+            if entry is None or self._stamp(key) != entry["stamp"]:
+                entry = self._load(key)
+            if _seconds_left(entry["creds"]) < MIN_VALIDITY:
+                self._refresh(key, entry)
+            return entry["creds"]
+
+    def _usable(self, key, entry):
+        return (
+            self._stamp(key) == entry["stamp"]
+            and _seconds_left(entry["creds"]) >= MIN_VALIDITY
+        )
+
+    def _load(self, key):
+        store = get_credential_store()
+        if store is not None:
+            token_json, stamp = store.get_token(*key)
+            info = json.loads(token_json) if token_json is not None else None
+        else:
+            path = AuthManager.get_paths(*key)["token"]
+            stamp = self._mtime(path)
+            if stamp is not None:
+                with open(path, "r") as f:
+                    info = json.load(f)
+        if stamp is None:
+            self._entries.pop(key, None)
+            raise Exception("Token not found. Please login via OAuth first.")
+        entry = {
+            "creds": Credentials.from_authorized_user_info(info, SCOPES),
+            "stamp": stamp,
+        }
+        self._entries[key] = entry
+        self._ensure_refresher()
+        return entry
+
+    def _refresh(self, key, entry):
+        # Dipanggil dengan lock channel
+        creds = entry["creds"]
+        if not creds.refresh_token:
+            raise Exception("Token expired dan tidak punya refresh token. Silakan login ulang.")
+        creds.refresh(Request())
+        if self._entries.get(key) is not entry:
+            return   # Channel di-forget (rename / hapus) selama refresh: jangan tulis ke nama lama
+        entry["stamp"] = self._write(key, creds)
+
+    def store(self, category, channel_name, creds):
+        """Simpan kredensial baru (hasil login OAuth) ke token.json / credential store dan memori."""
+        key = (category, channel_name)
+        with self._key_lock(key):
+            self._entries[key] = {"creds": creds, "stamp": self._write(key, creds, create=True)}
+        self._ensure_refresher()
+
+    def forget(self, category, channel_name=None):
+        """Buang kredensial dari memori (channel dihapus / di-rename); channel_name None = satu kategori."""
+        for key in list(self._entries):
+            if key[0] == category and channel_name in (None, key[1]):
+                self._entries.pop(key, None)
+
+    # --- REFRESH LATAR ---
+    def _ensure_refresher(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._refresh_loop, name="token-refresher", daemon=True)
+                self._thread.start()
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.check_interval):
+            self.refresh_due()
+
+    def refresh_due(self):
+        """Refresh semua token di memori yang akan expired dalam refresh_ahead detik."""
+        for key, entry in list(self._entries.items()):
+            if entry.get("error") or not entry["creds"].refresh_token or _seconds_left(entry["creds"]) > self.refresh_ahead:
+                continue
+            with self._key_lock(key):
+                if self._entries.get(key) is not entry or _seconds_left(entry["creds"]) > self.refresh_ahead:
+                    continue
+                try:
+                    self._refresh(key, entry)
+                except Exception as e:
+                    # Tidak dicoba lagi di latar sampai token.json berubah; get() tetap mencoba
+                    entry["error"] = str(e)
+                    print(f"Refresh token {key[0]}/{key[1]} gagal: {e}")
+
+    def stop(self, timeout=5.0):
+        """Hentikan thread refresh latar (dipanggil saat aplikasi / perintah CLI selesai)."""
+        self._stop.set()
+        with self._lock:
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+def get_credential_manager():
+    """CredentialManager tunggal untuk seluruh proses."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = CredentialManager()
+        return _manager
@@ -0,0 +1,78 @@
+from collections import OrderedDict, deque
+
+
+class FairQueue:
+    """
+    Antrean round-robin antar channel dengan batas global & per channel.
+    Murni Python (tanpa Qt) supaya bisa dipakai scheduler GUI maupun CLI.
+    """
+
+    def __init__(self, max_global=3, max_per_channel=1):
+        self.max_global = max(1, int(max_global))
+        self.max_per_channel = max(1, int(max_per_channel))
+        self._pending = OrderedDict()   # key -> deque(item)
+        self._running = {}              # key -> jumlah job yang sedang jalan
+
+    def push(self, key, item):
+        self._pending.setdefault(key, deque()).append(item)
+
+    def push_front(self, key, item):
+        """Kembalikan item ke depan antrean channel (mis. ditahan karena kuota)."""
+        self._pending.setdefault(key, deque()).appendleft(item)
+
+    def next_ready(self, can_start=None):
+        """
+        Ambil item berikutnya secara round-robin.
+        can_start(key, item) opsional: return False untuk menahan item
+        (mis. kuota habis) tanpa mengeluarkannya dari antrean.
+        Return (key, item) atau None jika slot penuh / tidak ada yang siap.
+        """
+        if self.running_count() >= self.max_global:
+            return None
+
+        for key in list(self._pending.keys()):
+            if self._running.get(key, 0) >= self.max_per_channel:
+                continue
+
+            items = self._pending[key]
+            if can_start is not None and not can_start(key, items[0]):
+                continue
+            item = items.popleft()
+            if items:
+                # Channel ini pindah ke belakang agar channel lain dapat giliran
+                self._pending.move_to_end(key)
+            else:
+                del self._pending[key]
+
+            self._running[key] = self._running.get(key, 0) + 1
+            return key, item
+
+        return None
+
+    def mark_done(self, key):
+        count = self._running.get(key, 0) - 1
+        if count > 0:
+            self._running[key] = count
+        else:
+            self._running.pop(key, None)
+
+    def rename(self, old_key, new_key):
+        """Pindahkan antrean & hitungan running ke key baru (channel di-rename)."""
+        if old_key in self._pending:
+            self._pending.setdefault(new_key, deque()).extend(self._pending.pop(old_key))
+        if old_key in self._running:
+            self._running[new_key] = self._running.get(new_key, 0) + self._running.pop(old_key)
+
+    def keys(self):
+        """Semua key yang masih punya job menunggu / berjalan."""
+        return set(self._pending) | set(self._running)
+
+    def running_count(self, key=None):
+        if key is not None:
+            return self._running.get(key, 0)
+        return sum(self._running.values())
+
+    def pending_count(self, key=None):
+        if key is not None:
+            return len(self._pending.get(key, ()))
+        return sum(len(items) for items in self._pending.values())
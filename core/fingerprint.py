@@ -0,0 +1,80 @@
+import os
+import mmap
+import time
+import hashlib
+import threading
+
+from core.json_file import read_json, update_json
+from utils import BASE_CHANNELS_DIR
+
+FINGERPRINT_CACHE = os.path.join("cache", "fingerprints.json")
+UPLOADED_INDEX = "uploaded_fingerprints.json"   # Per channel: channels/<cat>/<chan>/
+HASH_WINDOW = 16 * 1024 * 1024                  # Diproses per 16 MiB dari mmap
+
+_lock = threading.Lock()
+_cache = None
+
+
+def _hash_file(path, size):
+    h = hashlib.blake2b(digest_size=20)
+    if size == 0:
+        return h.hexdigest()
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if hasattr(mm, "madvise"):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        # memoryview: potongan mmap langsung ke hashlib tanpa copy ke bytes
+        with memoryview(mm) as view:
+            for offset in range(0, size, HASH_WINDOW):
+                h.update(view[offset:offset + HASH_WINDOW])
+    return h.hexdigest()
+
+
+def file_fingerprint(path):
+    """
+    Hash isi file (BLAKE2b via mmap). Hasil di-cache berdasarkan path+size+mtime,
+    jadi file multi-GB yang tidak berubah tidak di-hash ulang.
+    """
+    global _cache
+    abspath = os.path.abspath(path)
+    st = os.stat(abspath)
+
+    with _lock:
+        if _cache is None:
+            _cache = read_json(FINGERPRINT_CACHE)
+        entry = _cache.get(abspath)
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            return entry["digest"]
+
+    digest = _hash_file(abspath, st.st_size)
+
+    def add(cache):
+        cache[abspath] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "digest": digest}
+
+    with _lock:
+        # Gabung dengan isi file terbaru (proses lain juga menulis cache ini)
+        os.makedirs(os.path.dirname(FINGERPRINT_CACHE), exist_ok=True)
+        _cache = update_json(FINGERPRINT_CACHE, add)
+    return digest
+
+
+def reload_cache():
+    """Buang cache hash di memori; dibaca ulang dari file saat dipakai lagi (mis. di worker process)."""
+    global _cache
+    with _lock:
+        _cache = None
+
+
+def _index_path(category, channel_name):
+    return os.path.join(BASE_CHANNELS_DIR, category, channel_name, UPLOADED_INDEX)
+
+def find_uploaded(category, channel_name, digest):
+    """Return entry upload sebelumnya ({video_id, title, ...}) jika file ini sudah pernah diupload."""
+    return read_json(_index_path(category, channel_name)).get(digest)
+
+def record_uploaded(category, channel_name, digest, video_id, title=""):
+    # Folder channel tidak dibuat: channel yang sudah di-rename/hapus tidak boleh muncul lagi
+    def add(index):
+        index[digest] = {"video_id": video_id, "title": title, "uploaded_at": time.time()}
+
+    with _lock:
+        update_json(_index_path(category, channel_name), add)
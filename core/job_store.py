@@ -0,0 +1,275 @@
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+DB_FILE = "uploads.db"
+HEARTBEAT_INTERVAL = 10   # Detik; proses yang sedang upload memperbarui heartbeat job-nya
+STALE_AFTER = 45          # Detik tanpa heartbeat -> pemilik job dianggap sudah mati
+
+# State job upload
+QUEUED = "queued"
+UPLOADING = "uploading"
+DONE = "done"
+FAILED = "failed"
+
+# State tahap setelah insert (thumbnail, dsb)
+POST_PENDING = "pending"
+POST_DONE = "done"
+POST_FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    category      TEXT NOT NULL,
+    channel_name  TEXT NOT NULL,
+    video_path    TEXT NOT NULL,
+    title         TEXT NOT NULL DEFAULT '',
+    description   TEXT NOT NULL DEFAULT '',
+    tags          TEXT NOT NULL DEFAULT '',
+    privacy       TEXT NOT NULL DEFAULT 'private',
+    thumb         TEXT,
+    schedule_date TEXT,
+    schedule_time TEXT,
+    state         TEXT NOT NULL DEFAULT 'queued',
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    video_id      TEXT,
+    error         TEXT,
+    post_state    TEXT,
+    post_error    TEXT,
+    created_at    REAL NOT NULL,
+    updated_at    REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_channel_state ON jobs(category, channel_name, state);
+CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs(state, id);
+"""
+
+# Kolom yang ditambahkan setelah versi awal (ALTER TABLE untuk DB lama)
+ADDED_COLUMNS = {
+    "post_state": "TEXT",   # Tahap setelah insert (thumbnail): pending/done/failed
+    "post_error": "TEXT",
+    "owner": "TEXT",          # Proses (JobStore) yang sedang meng-upload job ini
+    "heartbeat_at": "REAL",   # Heartbeat terakhir pemilik job
+}
+
+# Kolom DB -> key dict data yang dipakai run_upload / UploadRow.get_data()
+DATA_COLUMNS = {
+    "video_path": "video_path",
+    "title": "title",
+    "description": "desc",
+    "tags": "tags",
+    "privacy": "privacy",
+    "thumb": "thumb",
+    "schedule_date": "schedule_date",
+    "schedule_time": "schedule_time",
+}
+
+
+def row_to_job(row):
+    """Ubah sqlite3.Row jadi dict job (+ sub-dict 'data' siap untuk run_upload)."""
+    job = dict(row)
+    job["data"] = {key: job[col] for col, key in DATA_COLUMNS.items()}
+    return job
+
+
+class JobStore:
+    """
+    Antrean upload persisten (SQLite di folder project).
+    Aman dipakai dari beberapa thread: satu koneksi dijaga dengan lock.
+
+    Bisa dipakai beberapa proses sekaligus (GUI + `core.cli run` dari cron):
+    job diambil dengan mark_uploading() yang atomic (hanya dari state queued),
+    dan proses pemilik memperbarui heartbeat job-nya dari thread latar.
+    requeue_interrupted() hanya mengembalikan job yang pemiliknya sudah mati.
+    """
+
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._heartbeat_thread = None
+
+    def _migrate(self):
+        existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, sql_type in ADDED_COLUMNS.items():
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {sql_type}")
+
+    def _execute(self, sql, params=()):
+        """Jalankan perintah tulis; return jumlah baris yang berubah."""
+        with self._lock:
+            return self._conn.execute(sql, params).rowcount
+
+    def _fetchall(self, sql, params=()):
+        # Hasil diambil selama lock dipegang (koneksi dipakai bersama antar thread)
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _fetchone(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    # --- TULIS ---
+    def add_job(self, category, channel_name, data):
+        return self.add_jobs([(category, channel_name, data)])[0]
+
+    def add_jobs(self, items):
+        """Tambah banyak job dalam satu transaksi. items: [(category, channel, data)]"""
+        now = time.time()
+        columns = list(DATA_COLUMNS.keys())
+        sql = (
+            f"INSERT INTO jobs (category, channel_name, {', '.join(columns)}, state, created_at, updated_at) "
+            f"VALUES (?, ?, {', '.join('?' for _ in columns)}, ?, ?, ?)"
+        )
+        ids = []
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for category, channel_name, data in items:
+                    values = [data.get(key) for key in DATA_COLUMNS.values()]
+                    cur = self._conn.execute(sql, (category, channel_name, *values, QUEUED, now, now))
+                    ids.append(cur.lastrowid)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return ids
+
+    def mark_uploading(self, job_id):
+        """
+        Ambil job untuk di-upload proses ini. Return False jika job sudah
+        diambil proses lain (atau bukan queued lagi) -> jangan di-upload.
+        """
+        now = time.time()
+        claimed = self._execute(
+            "UPDATE jobs SET state = ?, attempts = attempts + 1, error = NULL, owner = ?, "
+            "heartbeat_at = ?, updated_at = ? WHERE id = ? AND state = ?",
+            (UPLOADING, self.owner, now, now, job_id, QUEUED),
+        )
+        if claimed:
+            self._ensure_heartbeat()
+        return bool(claimed)
+
+    def mark_done(self, job_id, video_id):
+        self._execute(
+            "UPDATE jobs SET state = ?, video_id = ?, error = NULL, updated_at = ? WHERE id = ?",
+            (DONE, video_id, time.time(), job_id),
+        )
+
+    def mark_failed(self, job_id, error):
+        self._execute(
+            "UPDATE jobs SET state = ?, error = ?, updated_at = ? WHERE id = ?",
+            (FAILED, error, time.time(), job_id),
+        )
+
+    def set_post_state(self, job_id, post_state, error=None):
+        self._execute(
+            "UPDATE jobs SET post_state = ?, post_error = ?, updated_at = ? WHERE id = ?",
+            (post_state, error, time.time(), job_id),
+        )
+
+    def requeue(self, job_id):
+        self._execute(
+            "UPDATE jobs SET state = ?, owner = NULL, updated_at = ? WHERE id = ?",
+            (QUEUED, time.time(), job_id),
+        )
+
+    def requeue_interrupted(self):
+        """
+        Job 'uploading' yang pemiliknya sudah mati (app tertutup / crash, tanpa
+        heartbeat STALE_AFTER detik) dikembalikan ke antrean. Return daftar job.
+        Job yang sedang di-upload proses lain yang masih hidup tidak disentuh.
+        """
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "UPDATE jobs SET state = ?, owner = NULL, updated_at = ? "
+                "WHERE state = ? AND (owner IS NULL OR owner != ?) "
+                "AND (heartbeat_at IS NULL OR heartbeat_at < ?) RETURNING *",
+                (QUEUED, now, UPLOADING, self.owner, now - STALE_AFTER),
+            ).fetchall()
+        return [row_to_job(r) for r in rows]
+
+    # --- HEARTBEAT ---
+    def _ensure_heartbeat(self):
+        with self._lock:
+            if self._heartbeat_thread is None:
+                self._heartbeat_thread = threading.Thread(target=self._heartbeat_loop, name="job-heartbeat", daemon=True)
+                self._heartbeat_thread.start()
+
+    def _heartbeat_loop(self):
+        while True:
+            time.sleep(HEARTBEAT_INTERVAL)
+            try:
+                self.heartbeat()
+            except sqlite3.Error as e:
+                print(f"Heartbeat job gagal: {e}")
+
+    def heartbeat(self):
+        """Tandai semua job 'uploading' milik proses ini masih hidup."""
+        return self._execute(
+            "UPDATE jobs SET heartbeat_at = ? WHERE owner = ? AND state = ?",
+            (time.time(), self.owner, UPLOADING),
+        )
+
+    def delete_job(self, job_id):
+        self._execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def rename_channel(self, category, old_name, new_name):
+        self._execute(
+            "UPDATE jobs SET channel_name = ? WHERE category = ? AND channel_name = ?",
+            (new_name, category, old_name),
+        )
+
+    def rename_category(self, old_name, new_name):
+        self._execute("UPDATE jobs SET category = ? WHERE category = ?", (new_name, old_name))
+
+    # --- BACA ---
+    def get_job(self, job_id):
+        row = self._fetchone("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        return row_to_job(row) if row else None
+
+    def list_pending_post_steps(self):
+        rows = self._fetchall(
+            "SELECT * FROM jobs WHERE state = ? AND post_state = ? ORDER BY id", (DONE, POST_PENDING)
+        )
+        return [row_to_job(r) for r in rows]
+
+    def list_jobs(self, category=None, channel_name=None, states=None, limit=None):
+        where, params = [], []
+        if category is not None:
+            where.append("category = ?")
+            params.append(category)
+        if channel_name is not None:
+            where.append("channel_name = ?")
+            params.append(channel_name)
+        if states:
+            where.append(f"state IN ({', '.join('?' for _ in states)})")
+            params.extend(states)
+
+        sql = "SELECT * FROM jobs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY id"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return [row_to_job(r) for r in self._fetchall(sql, params)]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_job_store():
+    """Instance JobStore tunggal untuk seluruh proses."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = JobStore()
+        return _store
@@ -0,0 +1,76 @@
+import os
+import json
+import tempfile
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:   # Windows
+    fcntl = None
+    import msvcrt
+
+# File JSON kecil yang ditulis beberapa proses sekaligus (GUI, worker process,
+# `core.cli run`): setiap perubahan = baca isi terbaru di disk + ubah + tulis,
+# di bawah file lock (<path>.lock), ke file sementara unik lalu os.replace.
+# Pembaca tanpa lock selalu melihat file utuh (lama atau baru).
+
+
+def read_json(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def write_json(path, data, indent=None):
+    """Tulis atomic lewat file sementara unik (aman dipakai beberapa proses)."""
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=name + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=indent)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+@contextmanager
+def locked(path):
+    """File lock antar proses untuk path (folder-nya harus sudah ada)."""
+    with open(path + ".lock", "a+") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def update_json(path, func, indent=None):
+    """
+    func(data) mengubah dict isi file terbaru di tempat; return True/None = tulis,
+    False = tidak ada perubahan. Return data setelah diubah.
+    """
+    with locked(path):
+        data = read_json(path)
+        if func(data) is not False:
+            write_json(path, data, indent)
+        return data
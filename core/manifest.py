@@ -0,0 +1,202 @@
+"""
+Import massal dari manifest CSV / JSONL langsung ke JobStore (tanpa UploadRow).
+
+Kolom / key yang dikenali (nama alternatif di ALIASES):
+    path, title, description, tags, thumbnail, schedule, channel, privacy
+- channel: "Kategori/Channel" (boleh kosong jika default_channel diberikan)
+- schedule: "YYYY-MM-DD HH:MM" (WIB), atau kolom schedule_date + schedule_time
+- tags: teks dipisah koma (CSV) atau list (JSONL)
+Path relatif dihitung dari folder file manifest.
+"""
+import os
+import csv
+import json
+from datetime import datetime
+
+from core.upload_job import channel_key
+from utils import BASE_CHANNELS_DIR
+
+
+BATCH_SIZE = 500                  # Job per transaksi SQLite
+MAX_TITLE = 100                   # Batas YouTube
+MAX_DESCRIPTION = 5000
+PRIVACY_VALUES = ("private", "unlisted", "public")
+
+ALIASES = {
+    "path": ("path", "video_path", "file"),
+    "title": ("title", "judul"),
+    "description": ("description", "desc", "deskripsi"),
+    "tags": ("tags",),
+    "thumbnail": ("thumbnail", "thumb"),
+    "schedule": ("schedule", "publish_at"),
+    "channel": ("channel",),
+    "privacy": ("privacy",),
+}
+
+
+def _field(record, name):
+    for alias in ALIASES[name]:
+        value = record.get(alias)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def iter_manifest(path):
+    """Generator (nomor_baris, dict) dari CSV atau JSONL; baris rusak -> dict {'_error': ...}."""
+    if path.lower().endswith((".jsonl", ".ndjson")):
+        with open(path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    record = {"_error": f"JSON tidak valid: {e.msg}"}
+                if not isinstance(record, dict):
+                    record = {"_error": "baris harus berupa object JSON"}
+                yield line_no, record
+    else:
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            reader = csv.DictReader(f)
+            for record in reader:
+                # line_num = baris terakhir yang dibaca (header = baris 1)
+                yield reader.line_num, {k.strip().lower(): (v or "").strip() for k, v in record.items() if k}
+
+
+class ManifestValidator:
+    """Validasi satu baris manifest -> (category, channel_name, data) atau raise ValueError."""
+
+    def __init__(self, base_dir, default_channel=None):
+        self.base_dir = base_dir
+        self.default_channel = default_channel
+        self._channel_exists = {}    # cache: cek folder channel sekali per channel
+
+    def _resolve(self, path):
+        path = os.path.expanduser(path)
+        if not os.path.isabs(path):
+            path = os.path.join(self.base_dir, path)
+        return os.path.abspath(path)
+
+    def _channel(self, record):
+        value = _field(record, "channel")
+        if value:
+            category, sep, channel_name = value.partition("/")
+            if not sep or not category or not channel_name:
+                raise ValueError(f"channel harus 'Kategori/Channel': {value}")
+        elif record.get("category") and record.get("channel_name"):
+            category, channel_name = record["category"], record["channel_name"]
+        elif self.default_channel:
+            category, channel_name = self.default_channel
+        else:
+            raise ValueError("channel kosong")
+
+        key = channel_key(category, channel_name)
+        if key not in self._channel_exists:
+            self._channel_exists[key] = os.path.isdir(os.path.join(BASE_CHANNELS_DIR, category, channel_name))
+        if not self._channel_exists[key]:
+            raise ValueError(f"channel tidak ditemukan: {key}")
+        return category, channel_name
+
+    @staticmethod
+    def _schedule(record):
+        value = _field(record, "schedule")
+        if value:
+            date, _, time = str(value).strip().partition(" ")
+        else:
+            date, time = record.get("schedule_date"), record.get("schedule_time")
+        if not date and not time:
+            return None, None
+        try:
+            datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M")
+        except (ValueError, TypeError):
+            raise ValueError(f"jadwal harus 'YYYY-MM-DD HH:MM': {value or (date, time)}")
+        return date, time
+
+    def validate(self, record):
+        if "_error" in record:
+            raise ValueError(record["_error"])
+        category, channel_name = self._channel(record)
+
+        path = _field(record, "path")
+        if not path:
+            raise ValueError("path video kosong")
+        video_path = self._resolve(path)
+        if not os.path.isfile(video_path):
+            raise ValueError(f"file tidak ditemukan: {video_path}")
+
+        title = str(_field(record, "title") or "").strip()
+        if not title:
+            # Sama seperti UploadRow.set_file_data: judul dari nama file
+            title = os.path.splitext(os.path.basename(video_path))[0].replace("_", " ").replace("-", " ").title()
+        if len(title) > MAX_TITLE:
+            raise ValueError(f"judul lebih dari {MAX_TITLE} karakter")
+        if "<" in title or ">" in title:
+            raise ValueError("judul tidak boleh berisi < atau >")
+
+        description = str(_field(record, "description") or "")
+        if len(description) > MAX_DESCRIPTION:
+            raise ValueError(f"deskripsi lebih dari {MAX_DESCRIPTION} karakter")
+
+        tags = _field(record, "tags") or ""
+        if isinstance(tags, list):
+            tags = ", ".join(str(t) for t in tags)
+
+        thumb = _field(record, "thumbnail")
+        if thumb:
+            thumb = self._resolve(thumb)
+            if not os.path.isfile(thumb):
+                raise ValueError(f"thumbnail tidak ditemukan: {thumb}")
+
+        privacy = str(_field(record, "privacy") or "private").lower()
+        if privacy not in PRIVACY_VALUES:
+            raise ValueError(f"privacy tidak dikenal: {privacy}")
+
+        schedule_date, schedule_time = self._schedule(record)
+        return category, channel_name, {
+            "video_path": video_path,
+            "title": title,
+            "desc": description,
+            "tags": tags,
+            "privacy": privacy,
+            "thumb": thumb,
+            "schedule_date": schedule_date,
+            "schedule_time": schedule_time,
+        }
+
+
+def import_manifest(path, store, default_channel=None, on_batch=None, dry_run=False):
+    """
+    Baca manifest baris per baris, validasi, lalu tulis ke JobStore per batch
+    (satu transaksi per BATCH_SIZE job).
+    on_batch([(channel_key, job_id), ...]) dipanggil setelah setiap batch tersimpan
+    (mis. untuk memasukkan job ke antrean scheduler).
+    Return dict: imported, errors [(baris, pesan)], channels {channel_key: jumlah}.
+    """
+    validator = ManifestValidator(os.path.dirname(os.path.abspath(path)), default_channel)
+    result = {"imported": 0, "errors": [], "channels": {}}
+    batch = []
+
+    def flush():
+        if not batch:
+            return
+        if not dry_run:
+            ids = store.add_jobs(batch)
+            if on_batch:
+                on_batch([(channel_key(c, n), job_id) for (c, n, _), job_id in zip(batch, ids)])
+        for category, channel_name, _ in batch:
+            key = channel_key(category, channel_name)
+            result["channels"][key] = result["channels"].get(key, 0) + 1
+        result["imported"] += len(batch)
+        batch.clear()
+
+    for line_no, record in iter_manifest(path):
+        try:
+            batch.append(validator.validate(record))
+        except ValueError as e:
+            result["errors"].append((line_no, str(e)))
+            continue
+        if len(batch) >= BATCH_SIZE:
+            flush()
+    flush()
+    return result
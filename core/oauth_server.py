@@ -0,0 +1,196 @@
+import html
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from google_auth_oauthlib.flow import InstalledAppFlow
+from PySide6.QtCore import QCoreApplication
+
+from core.auth_manager import AuthManager, SCOPES
+from core.credentials import get_credential_manager
+
+FLOW_TIMEOUT = 600     # Detik; login yang tidak diselesaikan di browser dibatalkan
+POLL_INTERVAL = 0.5    # Interval serve_forever (sekaligus cek timeout flow)
+
+PAGE_STYLE = "body{background:#121212;color:#e0e0e0;font-family:sans-serif;display:flex;justify-content:center;align-items:center;height:100vh;margin:0} .card{background:#1e1e1e;padding:40px;border-radius:12px;text-align:center;border:1px solid #333} h1{color:%s}"
+SUCCESS_PAGE = """<!DOCTYPE html><html><head><title>Login Berhasil</title>
+<style>""" + PAGE_STYLE % "#4caf50" + """</style>
+</head><body><div class="card"><h1>Login Berhasil!</h1><p>Token sudah tersimpan, silakan kembali ke aplikasi.</p><script>setTimeout(function(){window.close()},3000);</script></div></body></html>"""
+FAILED_PAGE = """<!DOCTYPE html><html><head><title>Login Gagal</title>
+<style>""" + PAGE_STYLE % "#f44336" + """</style>
+</head><body><div class="card"><h1>Login Gagal</h1><p>%s</p></div></body></html>"""
+
+
+class _CallbackHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        status, message = self.server.owner.handle_callback(self.path)
+        if status == 200:
+            body = SUCCESS_PAGE
+        else:
+            body = FAILED_PAGE % html.escape(message)
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def service_actions(self):
+        # Dipanggil serve_forever tiap POLL_INTERVAL
+        self.owner.expire_flows()
+
+
+class OAuthCallbackServer:
+    """
+    Satu server callback OAuth di localhost untuk semua channel.
+    Setiap login (flow) didaftarkan dengan parameter `state`-nya; callback dari
+    browser diarahkan ke flow yang cocok, token ditukar & disimpan lewat
+    CredentialManager, lalu Future flow tersebut selesai.
+
+    Flow yang melewati timeout atau Future-nya di-cancel dibuang dari daftar,
+    jadi login yang ditinggalkan tidak menahan thread maupun socket.
+    Server dijalankan saat flow pertama dimulai dan memakai satu port tetap.
+    """
+
+    def __init__(self, host="localhost", timeout=FLOW_TIMEOUT):
+        self.host = host
+        self.timeout = timeout
+        self._pending = {}   # state -> {"flow", "future", "category", "channel_name", "deadline"}
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def redirect_uri(self):
+        return f"http://{self.host}:{self._server.server_address[1]}/"
+
+    def _ensure_server(self):
+        # Dipanggil dengan _lock
+        if self._server is None:
+            self._server = _Server((self.host, 0), _CallbackHandler)
+            self._server.owner = self
+            self._thread = threading.Thread(
+                target=self._server.serve_forever, args=(POLL_INTERVAL,),
+                name="oauth-callback", daemon=True,
+            )
+            self._thread.start()
+
+    def start_flow(self, category, channel_name, timeout=None):
+        """
+        Mulai login OAuth channel. Return (state, auth_url, Future); Future
+        selesai dengan Credentials (sudah disimpan) atau Exception.
+        Future.cancel() / cancel(state) membatalkan flow.
+        """
+        client_config = AuthManager.load_client_config(category, channel_name)
+        if not client_config:
+            raise FileNotFoundError("client_secret.json not found!")
+
+        flow = InstalledAppFlow.from_client_config(client_config, SCOPES)
+        with self._lock:
+            self._ensure_server()
+            flow.redirect_uri = self.redirect_uri
+            auth_url, state = flow.authorization_url(prompt="consent")
+            future = Future()
+            self._pending[state] = {
+                "flow": flow,
+                "future": future,
+                "category": category,
+                "channel_name": channel_name,
+                "deadline": time.monotonic() + (timeout or self.timeout),
+            }
+        future.add_done_callback(lambda f: self._discard(state, f))
+        return state, auth_url, future
+
+    def _discard(self, state, future):
+        with self._lock:
+            entry = self._pending.get(state)
+            if entry is not None and entry["future"] is future:
+                del self._pending[state]
+
+    def cancel(self, state):
+        with self._lock:
+            entry = self._pending.get(state)
+        if entry is not None:
+            entry["future"].cancel()
+
+    def _claim(self, state):
+        # Ambil flow dari daftar (sekali saja); None jika tidak ada / sudah di-cancel
+        with self._lock:
+            entry = self._pending.pop(state, None)
+            if entry is None or not entry["future"].set_running_or_notify_cancel():
+                return None
+            return entry
+
+    def expire_flows(self):
+        now = time.monotonic()
+        with self._lock:
+            expired = [s for s, e in self._pending.items() if e["deadline"] <= now]
+        for state in expired:
+            entry = self._claim(state)
+            if entry is not None:
+                entry["future"].set_exception(TimeoutError("Login timeout, link sudah tidak berlaku."))
+
+    def handle_callback(self, path):
+        """Proses satu request callback. Return (status HTTP, pesan)."""
+        query = parse_qs(urlsplit(path).query)
+        state = (query.get("state") or [None])[0]
+        # Hanya callback pertama per flow yang diproses
+        entry = self._claim(state) if state else None
+        if entry is None:
+            # favicon, link lama, atau flow yang sudah dibatalkan / timeout
+            return 404, "Link login tidak dikenal atau sudah kadaluarsa."
+
+        future = entry["future"]
+        if "error" in query:
+            message = query["error"][0]
+            future.set_exception(Exception(f"Akses ditolak: {message}"))
+            return 400, message
+        if "code" not in query:
+            future.set_exception(Exception("Callback OAuth tanpa kode otorisasi."))
+            return 400, "Kode otorisasi tidak ditemukan."
+
+        flow = entry["flow"]
+        try:
+            flow.fetch_token(authorization_response=self.redirect_uri.rstrip("/") + path)
+            # Tulis token (token.json atomic / credential store) sekaligus ganti kredensial di memori
+            get_credential_manager().store(entry["category"], entry["channel_name"], flow.credentials)
+        except Exception as e:
+            future.set_exception(e)
+            return 500, str(e)
+        future.set_result(flow.credentials)
+        return 200, ""
+
+    def shutdown(self):
+        with self._lock:
+            server, self._server = self._server, None
+            pending, self._pending = list(self._pending.values()), {}
+        for entry in pending:
+            entry["future"].cancel()
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+
+_server = None
+_server_lock = threading.Lock()
+
+def get_oauth_server():
+    """OAuthCallbackServer tunggal untuk seluruh proses."""
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = OAuthCallbackServer()
+            # Thread & port callback dilepas saat aplikasi ditutup
+            app = QCoreApplication.instance()
+            if app is not None:
+                app.aboutToQuit.connect(_server.shutdown)
+        return _server
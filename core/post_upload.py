@@ -0,0 +1,101 @@
+import heapq
+import itertools
+import queue
+import threading
+import time
+from PySide6.QtCore import QObject, Signal
+
+from core.upload_job import apply_thumbnail
+from core.retry import Retrier, QuotaExceededError
+from core.job_store import POST_DONE, POST_FAILED
+
+POST_MAX_ATTEMPTS = 5
+POST_RETRY_BASE = 60          # Detik; gagal berikutnya ditunda 60s, 120s, 240s, ...
+POST_QUOTA_DELAY = 3600       # Kuota habis: coba lagi satu jam kemudian
+STOP_TIMEOUT = 2.0            # Detik; stop() tidak menunggu tahap yang macet lebih lama dari ini
+
+
+class PostUploadPipeline(QObject):
+    """
+    Tahap setelah videos.insert (set thumbnail, dan langkah metadata lain nanti)
+    dijalankan di thread sendiri, sehingga slot upload langsung dipakai video
+    berikutnya. Kegagalan di tahap ini di-retry sendiri tanpa upload ulang video.
+    Thread-nya daemon: stop() hanya menunggu STOP_TIMEOUT detik, tahap yang
+    belum selesai tetap 'pending' di JobStore dan diulang saat app dibuka lagi.
+    """
+    step_finished = Signal(str, int, bool, str)   # channel_key, job_id, sukses, pesan
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.inbox = queue.Queue()
+        self._delayed = []                  # heap (waktu_jalan, urutan, task)
+        self._order = itertools.count()
+        self._stop = threading.Event()   # Juga memutus backoff Retrier yang sedang menunggu
+        self._thread = None
+
+    def submit(self, job):
+        """job: dict dari JobStore (butuh id, category, channel_name, video_id, thumb)."""
+        self.inbox.put({
+            "job_id": job["id"],
+            "category": job["category"],
+            "channel_name": job["channel_name"],
+            "video_id": job["video_id"],
+            "thumb": job["thumb"],
+            "attempt": 0,
+        })
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name="post-upload", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self.inbox.put(None)
+        if self._thread is not None:
+            self._thread.join(STOP_TIMEOUT)
+
+    def run(self):
+        while not self._stop.is_set():
+            task = self._next_task()
+            if task is not None:
+                self._process(task)
+
+    def _next_task(self):
+        # Ambil task tertunda yang sudah jatuh tempo, kalau belum tunggu inbox
+        now = time.monotonic()
+        if self._delayed and self._delayed[0][0] <= now:
+            return heapq.heappop(self._delayed)[2]
+
+        timeout = self._delayed[0][0] - now if self._delayed else None
+        try:
+            return self.inbox.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _retry_later(self, task, delay):
+        heapq.heappush(self._delayed, (time.monotonic() + delay, next(self._order), task))
+
+    def _process(self, task):
+        key = f"{task['category']}/{task['channel_name']}"
+        task["attempt"] += 1
+        try:
+            # Hasil preprocessing biasanya sudah ada di cache (diproses saat dipilih)
+            apply_thumbnail(
+                task["category"], task["channel_name"], task["video_id"], task["thumb"],
+                Retrier(max_retries=5, stop_event=self._stop),
+            )
+
+            self.store.set_post_state(task["job_id"], POST_DONE)
+            self.step_finished.emit(key, task["job_id"], True, f"Thumbnail terpasang: {task['video_id']}")
+
+        except Exception as e:
+            if self._stop.is_set():
+                return   # App ditutup: biarkan 'pending', diulang sesi berikutnya
+            if task["attempt"] < POST_MAX_ATTEMPTS:
+                delay = POST_QUOTA_DELAY if isinstance(e, QuotaExceededError) else POST_RETRY_BASE * 2 ** (task["attempt"] - 1)
+                print(f"Thumbnail {task['video_id']} gagal (percobaan {task['attempt']}), coba lagi {delay}s: {e}")
+                self._retry_later(task, delay)
+            else:
+                self.store.set_post_state(task["job_id"], POST_FAILED, str(e))
+                self.step_finished.emit(key, task["job_id"], False, f"Thumbnail gagal: {e}")
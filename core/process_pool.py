@@ -0,0 +1,177 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from core.bandwidth import get_limiter
+from core.fingerprint import reload_cache
+from core.job_store import JobStore
+from core.quota import get_quota_ledger, set_quota_ledger
+from core.retry import QuotaExceededError, ChannelLimitError
+from core.token_store import get_credential_store
+from core.upload_job import run_upload, DuplicateUploadError
+
+# Pesan IPC (worker process -> proses GUI), lewat satu multiprocessing.Queue:
+#   ("progress", job_id, info)          info = dict dari progress_callback
+#   ("status", job_id, text)
+#   ("quota", nama_method, args)        dijalankan di QuotaLedger proses GUI
+# Hasil akhir (dict run_upload atau exception) kembali lewat Future pool.
+
+# Error yang ditangani scheduler berdasarkan tipenya: dikirim balik apa adanya
+# (dibuat ulang dari pesannya, tanpa traceback/cause yang belum tentu bisa di-pickle)
+KNOWN_ERRORS = (DuplicateUploadError, QuotaExceededError, ChannelLimitError)
+
+
+class UploadProcessError(Exception):
+    """Error dari proses upload (tipe aslinya belum tentu bisa di-pickle)."""
+
+
+class JobClaimedError(Exception):
+    """Job sudah diambil proses lain (mis. `core.cli run`) sebelum worker sempat mulai."""
+
+
+class ForwardingQuotaLedger:
+    """
+    Pengganti QuotaLedger di worker process: catatan kuota dikirim ke proses
+    GUI, sehingga catatan kuota worker tetap lewat satu QuotaLedger.
+    """
+
+    def __init__(self, events):
+        self.events = events
+
+    def record(self, project_key, method_id):
+        self.events.put(("quota", "record", (project_key, method_id)))
+
+    def record_upload(self, channel_key):
+        self.events.put(("quota", "record_upload", (channel_key,)))
+
+    def mark_exhausted(self, project_key):
+        self.events.put(("quota", "mark_exhausted", (project_key,)))
+
+    def mark_channel_limited(self, channel_key):
+        self.events.put(("quota", "mark_channel_limited", (channel_key,)))
+
+
+_events = None
+_job_store = None
+
+def _init_worker(events, bandwidth_share, db_path):
+    global _events, _job_store
+    _events = events
+    _job_store = JobStore(db_path)
+    set_quota_ledger(ForwardingQuotaLedger(events))
+    get_limiter().set_share(bandwidth_share)
+
+def _reload_worker_caches():
+    # Worker dipakai ulang antar job, sementara proses GUI terus mengubah cache
+    # hash file & index credential store -> baca ulang sebelum tiap upload
+    reload_cache()
+    store = get_credential_store()
+    if store is not None:
+        store.load_all()
+
+
+def _upload_in_process(job_id, category, channel_name, data):
+    def on_progress(percent, info):
+        _events.put(("progress", job_id, info))
+
+    def on_status(text):
+        _events.put(("status", job_id, text))
+
+    def on_retry(attempt, delay, error):
+        on_status(f"Retry #{attempt} dalam {delay:.0f} detik: {error}")
+
+    # Job baru ditandai 'uploading' (dengan heartbeat proses ini) saat worker
+    # benar-benar mulai, bukan selama masih menunggu di antrean executor
+    if not _job_store.mark_uploading(job_id):
+        raise JobClaimedError("Dilewati: job sedang diproses di tempat lain")
+    # Channel/kategori bisa di-rename selama job menunggu di antrean executor
+    job = _job_store.get_job(job_id)
+    category, channel_name = job["category"], job["channel_name"]
+    try:
+        _reload_worker_caches()
+        return run_upload(category, channel_name, data, on_progress, on_status, on_retry)
+    except KNOWN_ERRORS as e:
+        raise type(e)(str(e)) from None
+    except Exception as e:
+        raise UploadProcessError(str(e)) from None
+
+
+class UploadProcessPool:
+    """
+    Transfer upload di proses terpisah (spawn): enkripsi SSL & copy buffer
+    tidak berebut GIL dengan thread GUI, bisa memakai banyak core, dan crash
+    satu transfer tidak menjatuhkan jendela aplikasi.
+    on_progress(job_id, info) & on_status(job_id, text) dipanggil dari thread
+    listener IPC (bukan thread GUI).
+    Batas bandwidth global dibagi rata ke setiap proses (limiter per proses).
+    Worker sendiri yang mengklaim job di JobStore (db_path) saat mulai upload;
+    job yang sudah diklaim proses lain selesai dengan JobClaimedError.
+    """
+
+    def __init__(self, processes, on_progress, on_status, db_path):
+        self.processes = max(1, int(processes))
+        self.on_progress = on_progress
+        self.on_status = on_status
+        self.db_path = db_path
+        self._ctx = multiprocessing.get_context("spawn")
+        self.events = self._ctx.Queue()
+        self._executor = None
+        self._lock = threading.Lock()
+        self._listener = threading.Thread(target=self._listen, name="upload-ipc", daemon=True)
+        self._listener.start()
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=self._ctx,
+                    initializer=_init_worker,
+                    initargs=(self.events, 1.0 / self.processes, self.db_path),
+                )
+            return self._executor
+
+    def _discard_if_broken(self, executor, future):
+        # Proses worker mati mendadak -> pool lama tidak bisa dipakai, buat baru saat submit berikutnya
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+
+    def submit(self, job_id, category, channel_name, data):
+        """Return concurrent.futures.Future berisi dict hasil run_upload."""
+        executor = self._pool()
+        try:
+            future = executor.submit(_upload_in_process, job_id, category, channel_name, data)
+        except BrokenProcessPool:
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor = self._pool()
+            future = executor.submit(_upload_in_process, job_id, category, channel_name, data)
+        future.add_done_callback(lambda f, ex=executor: self._discard_if_broken(ex, f))
+        return future
+
+    def _listen(self):
+        while True:
+            message = self.events.get()
+            if message is None:
+                break
+            try:
+                kind = message[0]
+                if kind == "progress":
+                    self.on_progress(message[1], message[2])
+                elif kind == "status":
+                    self.on_status(message[1], message[2])
+                elif kind == "quota":
+                    getattr(get_quota_ledger(), message[1])(*message[2])
+            except Exception as e:
+                print(f"Pesan IPC upload gagal diproses {message!r}: {e}")
+
+    def shutdown(self):
+        self.events.put(None)
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
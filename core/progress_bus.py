@@ -0,0 +1,86 @@
+import time
+import threading
+
+RATE_SMOOTHING = 0.3     # Bobot EWMA untuk kecepatan (sampel baru)
+
+
+class ProgressBus:
+    """
+    Papan progress bersama antara worker upload dan GUI.
+    Worker cukup menimpa snapshot job-nya (satu assignment dict, tanpa signal Qt);
+    GUI membaca snapshot dengan timer berkecepatan tetap, sehingga biaya UI
+    tidak bertambah walau banyak upload berjalan bersamaan.
+    """
+
+    def __init__(self):
+        self._jobs = {}                 # job_id -> snapshot dict (tidak diubah setelah dipasang)
+        self._lock = threading.Lock()   # Hanya untuk tambah/hapus job, bukan per update
+        self.version = 0                # Naik setiap ada update; GUI bisa lewati frame yang sama
+
+    def start(self, job_id, key, title=""):
+        with self._lock:
+            self._jobs[job_id] = {
+                "key": key, "title": title, "percent": 0,
+                "bytes_sent": 0, "total_bytes": 0, "rate": 0.0, "eta": None,
+                "info": {}, "updated_at": time.monotonic(),
+            }
+            self.version += 1
+
+    def publish(self, job_id, bytes_sent, total_bytes, info=None):
+        """Dipanggil dari thread worker setiap chunk. Murah: hitung lalu ganti snapshot."""
+        prev = self._jobs.get(job_id)
+        if prev is None:
+            return
+        now = time.monotonic()
+        elapsed = now - prev["updated_at"]
+        rate = prev["rate"]
+        # Update pertama hanya jadi titik awal (bisa berisi byte hasil resume)
+        if prev["total_bytes"] and elapsed > 0 and bytes_sent > prev["bytes_sent"]:
+            sample = (bytes_sent - prev["bytes_sent"]) / elapsed
+            rate = sample if not rate else RATE_SMOOTHING * sample + (1 - RATE_SMOOTHING) * rate
+
+        remaining = max(0, total_bytes - bytes_sent)
+        self._jobs[job_id] = dict(
+            prev,
+            percent=int(bytes_sent * 100 / total_bytes) if total_bytes else 0,
+            bytes_sent=bytes_sent,
+            total_bytes=total_bytes,
+            rate=rate,
+            eta=remaining / rate if rate else None,
+            info=info or {},
+            updated_at=now,
+        )
+        self.version += 1
+
+    def finish(self, job_id):
+        with self._lock:
+            self._jobs.pop(job_id, None)
+            self.version += 1
+
+    def snapshot(self, key=None):
+        """Salinan {job_id: snapshot}; key (channel_key) opsional untuk memfilter."""
+        with self._lock:
+            jobs = dict(self._jobs)
+        if key is None:
+            return jobs
+        return {job_id: s for job_id, s in jobs.items() if s["key"] == key}
+
+    def totals(self, key=None):
+        """Ringkasan agregat: bytes terkirim, total bytes, kecepatan gabungan, ETA."""
+        jobs = self.snapshot(key).values()
+        sent = sum(s["bytes_sent"] for s in jobs)
+        total = sum(s["total_bytes"] for s in jobs)
+        rate = sum(s["rate"] for s in jobs)
+        return {
+            "bytes_sent": sent,
+            "total_bytes": total,
+            "rate": rate,
+            "eta": (total - sent) / rate if rate else None,
+        }
+
+
+_bus = ProgressBus()
+
+def get_progress_bus():
+    """ProgressBus tunggal yang dipakai semua worker & halaman channel."""
+    return _bus
@@ -0,0 +1,258 @@
+import os
+import json
+import atexit
+import sqlite3
+import threading
+from datetime import datetime
+import pytz
+
+from utils import cached_app_settings
+from core.auth_manager import AuthManager
+from core.job_store import DB_FILE
+
+QUOTA_FILE = "quota_ledger.json"   # Format lama, diimpor ke DB saat pertama dibuka
+DEFAULT_PROJECT_LIMIT = 10000
+FLUSH_DELAY = 5.0    # Detik; catatan record() dikumpulkan lalu ditulis sekaligus
+PACIFIC = pytz.timezone("America/Los_Angeles")   # Kuota YouTube reset tengah malam Pacific
+
+# Biaya unit kuota per method (methodId dari discovery document)
+API_COSTS = {
+    "youtube.videos.insert": 1600,
+    "youtube.thumbnails.set": 50,
+    "youtube.channels.list": 1,
+    "youtube.playlistItems.list": 1,
+    "youtube.videos.list": 1,
+}
+DEFAULT_COST = 1
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS quota_projects (
+    day          TEXT NOT NULL,
+    project_key  TEXT NOT NULL,
+    units        INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, project_key)
+);
+CREATE TABLE IF NOT EXISTS quota_channels (
+    day          TEXT NOT NULL,
+    channel_key  TEXT NOT NULL,
+    uploads      INTEGER NOT NULL DEFAULT 0,
+    limited      INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, channel_key)
+);
+"""
+
+
+def api_cost(method_id):
+    return API_COSTS.get(method_id, DEFAULT_COST)
+
+def upload_cost(with_thumbnail):
+    cost = api_cost("youtube.videos.insert")
+    if with_thumbnail:
+        cost += api_cost("youtube.thumbnails.set")
+    return cost
+
+def pacific_day(now=None):
+    now = now or datetime.now(PACIFIC)
+    return now.astimezone(PACIFIC).strftime("%Y-%m-%d")
+
+def quota_key(category, channel_name):
+    """
+    Kuota dihitung per project Google Cloud -> pakai client_id dari client_secret.json.
+    Channel tanpa secret valid dianggap project sendiri.
+    """
+    try:
+        content = AuthManager.load_client_config(category, channel_name) or {}
+        info = content.get("installed") or content.get("web") or {}
+        if info.get("client_id"):
+            return info["client_id"]
+    except Exception:
+        pass
+    return f"channel:{category}/{channel_name}"
+
+
+class QuotaLedger:
+    """
+    Buku besar pemakaian kuota API per project (reset tengah malam Pacific)
+    dan jumlah upload per channel untuk daily_limit di config.json.
+    Disimpan di database SQLite yang sama dengan JobStore; semua penulisan
+    berupa penambahan (upsert), jadi GUI dan `core.cli run` yang jalan
+    bersamaan saling melihat pemakaian masing-masing tanpa saling menimpa.
+    Scheduler memakai reserve()/release() agar job paralel tidak sama-sama
+    lolos padahal sisa kuota hanya cukup untuk satu.
+    record() (tiap panggilan API) dikumpulkan di memori dan ditulis paling
+    lambat FLUSH_DELAY detik kemudian, saat flush(), atau saat proses keluar.
+    """
+
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        self._lock = threading.RLock()
+        self.reservations = {}   # job_id -> (project_key, channel_key, cost)
+        self._pending = {}       # (day, project_key) -> unit yang belum ditulis
+        self._flush_timer = None
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._import_legacy_file()
+
+    def _import_legacy_file(self):
+        # quota_ledger.json versi lama: pemakaian hari ini dipindah ke DB sekali saja
+        try:
+            with open(QUOTA_FILE, "r") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if data.get("day") == pacific_day():
+            with self._lock:
+                for project_key, units in data.get("projects", {}).items():
+                    self._add_units(data["day"], project_key, units)
+                for channel_key, uploads in data.get("channels", {}).items():
+                    self._add_upload(data["day"], channel_key, uploads)
+                for channel_key in data.get("limited_channels", []):
+                    self._set_limited(data["day"], channel_key)
+        os.remove(QUOTA_FILE)
+
+    def _add_units(self, day, project_key, units):
+        self._conn.execute(
+            "INSERT INTO quota_projects (day, project_key, units) VALUES (?, ?, ?) "
+            "ON CONFLICT (day, project_key) DO UPDATE SET units = units + excluded.units",
+            (day, project_key, units),
+        )
+
+    def _add_upload(self, day, channel_key, uploads=1):
+        self._conn.execute(
+            "INSERT INTO quota_channels (day, channel_key, uploads) VALUES (?, ?, ?) "
+            "ON CONFLICT (day, channel_key) DO UPDATE SET uploads = uploads + excluded.uploads",
+            (day, channel_key, uploads),
+        )
+
+    def _set_limited(self, day, channel_key):
+        self._conn.execute(
+            "INSERT INTO quota_channels (day, channel_key, limited) VALUES (?, ?, 1) "
+            "ON CONFLICT (day, channel_key) DO UPDATE SET limited = 1",
+            (day, channel_key),
+        )
+
+    def _save_later(self):
+        # Dipanggil dengan _lock
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(FLUSH_DELAY, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def flush(self):
+        """Tulis catatan record() yang tertunda (jika ada) ke DB."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            pending, self._pending = self._pending, {}
+            if pending:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    for (day, project_key), units in pending.items():
+                        self._add_units(day, project_key, units)
+                    # Hari yang sudah lewat tidak dipakai lagi
+                    self._conn.execute("DELETE FROM quota_projects WHERE day < ?", (pacific_day(),))
+                    self._conn.execute("DELETE FROM quota_channels WHERE day < ?", (pacific_day(),))
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+
+    def project_limit(self, project_key):
+        settings = cached_app_settings()
+        limits = settings.get("project_quota_limits", {})
+        return limits.get(project_key, settings.get("quota_daily_limit", DEFAULT_PROJECT_LIMIT))
+
+    # --- PENCATATAN ---
+    def record(self, project_key, method_id):
+        with self._lock:
+            key = (pacific_day(), project_key)
+            self._pending[key] = self._pending.get(key, 0) + api_cost(method_id)
+            self._save_later()
+
+    def record_upload(self, channel_key):
+        with self._lock:
+            self._add_upload(pacific_day(), channel_key)
+
+    def mark_exhausted(self, project_key):
+        """Server bilang quotaExceeded -> anggap kuota project habis sampai reset."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO quota_projects (day, project_key, units) VALUES (?, ?, ?) "
+                "ON CONFLICT (day, project_key) DO UPDATE SET units = MAX(units, excluded.units)",
+                (pacific_day(), project_key, self.project_limit(project_key)),
+            )
+
+    def mark_channel_limited(self, channel_key):
+        """Server bilang uploadLimitExceeded -> tahan channel ini saja sampai reset."""
+        with self._lock:
+            self._set_limited(pacific_day(), channel_key)
+
+    # --- ADMISSION CONTROL ---
+    def used(self, project_key):
+        """Unit terpakai hari ini (semua proses + catatan proses ini yang belum ditulis)."""
+        day = pacific_day()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT units FROM quota_projects WHERE day = ? AND project_key = ?", (day, project_key)
+            ).fetchone()
+            return (row[0] if row else 0) + self._pending.get((day, project_key), 0)
+
+    def _channel_row(self, channel_key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT uploads, limited FROM quota_channels WHERE day = ? AND channel_key = ?",
+                (pacific_day(), channel_key),
+            ).fetchone()
+        return row or (0, 0)
+
+    def uploads_today(self, channel_key):
+        return self._channel_row(channel_key)[0]
+
+    def check_upload(self, project_key, channel_key, cost, daily_limit=None):
+        """Return (boleh, alasan). Memperhitungkan reservasi job yang sedang jalan."""
+        with self._lock:
+            reserved_cost = sum(c for p, _, c in self.reservations.values() if p == project_key)
+            reserved_uploads = sum(1 for _, k, _ in self.reservations.values() if k == channel_key)
+
+            uploads, limited = self._channel_row(channel_key)
+            if limited:
+                return False, "Batas upload channel dari YouTube tercapai, menunggu reset"
+            if daily_limit and uploads + reserved_uploads >= daily_limit:
+                return False, f"Batas harian channel tercapai ({daily_limit} video)"
+
+            limit = self.project_limit(project_key)
+            used = self.used(project_key)
+            if used + reserved_cost + cost > limit:
+                return False, f"Kuota API project tidak cukup ({used}/{limit} unit)"
+            return True, ""
+
+    def reserve(self, job_id, project_key, channel_key, cost):
+        with self._lock:
+            self.reservations[job_id] = (project_key, channel_key, cost)
+
+    def release(self, job_id):
+        with self._lock:
+            self.reservations.pop(job_id, None)
+
+
+_ledger = None
+_ledger_lock = threading.Lock()
+
+def get_quota_ledger():
+    """Instance ledger tunggal untuk seluruh proses."""
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = QuotaLedger()
+            atexit.register(_ledger.flush)
+        return _ledger
+
+def set_quota_ledger(ledger):
+    """Ganti ledger proses ini (worker process meneruskan catatan ke proses GUI)."""
+    global _ledger
+    with _ledger_lock:
+        _ledger = ledger
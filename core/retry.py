@@ -0,0 +1,137 @@
+import asyncio
+import json
+import random
+import socket
+import ssl
+import time
+import http.client
+import httplib2
+from googleapiclient.errors import HttpError
+
+RETRIABLE_STATUS = {429, 500, 502, 503, 504}
+RETRIABLE_REASONS = {"rateLimitExceeded", "userRateLimitExceeded", "backendError", "internalError"}
+QUOTA_REASONS = {"quotaExceeded", "dailyLimitExceeded"}
+# Batas upload per channel (bukan kuota project): hanya channel itu yang ditahan
+CHANNEL_LIMIT_REASONS = {"uploadLimitExceeded"}
+
+# Error jaringan sementara (socket putus, timeout, DNS, TLS, dsb)
+NETWORK_ERRORS = (
+    httplib2.HttpLib2Error,
+    http.client.HTTPException,
+    ConnectionError,
+    TimeoutError,
+    socket.timeout,
+    socket.gaierror,
+    ssl.SSLError,
+)
+
+# Hasil klasifikasi error
+RETRIABLE = "retriable"
+QUOTA = "quota"
+CHANNEL_LIMIT = "channel_limit"
+FATAL = "fatal"
+
+
+class QuotaExceededError(Exception):
+    """Kuota API habis: percuma di-retry sampai kuota reset."""
+
+
+class ChannelLimitError(Exception):
+    """Channel mencapai batas upload YouTube: channel ini ditahan, channel lain jalan terus."""
+
+
+def error_reason(error):
+    """Ambil 'reason' dari body HttpError Google (mis. quotaExceeded)."""
+    try:
+        content = error.content.decode("utf-8") if isinstance(error.content, bytes) else error.content
+        details = json.loads(content)["error"]["errors"]
+        return details[0].get("reason", "")
+    except Exception:
+        return ""
+
+
+def classify_error(error):
+    if isinstance(error, HttpError):
+        reason = error_reason(error)
+        if reason in QUOTA_REASONS:
+            return QUOTA
+        if reason in CHANNEL_LIMIT_REASONS:
+            return CHANNEL_LIMIT
+        if error.resp.status in RETRIABLE_STATUS or reason in RETRIABLE_REASONS:
+            return RETRIABLE
+        return FATAL
+    if isinstance(error, NETWORK_ERRORS):
+        return RETRIABLE
+    return FATAL
+
+
+class Retrier:
+    """
+    Menjalankan panggilan API dengan exponential backoff + jitter.
+    max_retries: batas gagal berturut-turut untuk satu panggilan.
+    max_backoff: total waktu tunggu (detik) untuk seluruh upload sebelum menyerah.
+    Statistik (retries, backoff_seconds) bisa dibaca untuk laporan.
+    stop_event (threading.Event) opsional: jika di-set, call() berhenti menunggu
+    backoff dan melempar error terakhir.
+    """
+
+    def __init__(self, max_retries=10, base_delay=1.0, max_delay=64.0, max_backoff=900.0, on_retry=None, stop_event=None):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_backoff = max_backoff
+        self.on_retry = on_retry   # callback(attempt, delay, error)
+        self.stop_event = stop_event
+
+        self.retries = 0            # Total retry selama upload
+        self.backoff_seconds = 0.0  # Total waktu tunggu karena retry
+
+    def delay_for(self, attempt):
+        # "Full jitter": acak antara 0 dan batas eksponensial
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _backoff(self, error, attempt):
+        """Putuskan nasib error ke-attempt: raise, atau return delay sebelum coba lagi."""
+        kind = classify_error(error)
+        if kind == QUOTA:
+            raise QuotaExceededError(f"Kuota YouTube API habis: {error_reason(error)}") from error
+        if kind == CHANNEL_LIMIT:
+            raise ChannelLimitError(f"Batas upload channel tercapai: {error_reason(error)}") from error
+        if kind != RETRIABLE:
+            raise error
+
+        delay = self.delay_for(attempt)
+        if attempt + 1 > self.max_retries or self.backoff_seconds + delay > self.max_backoff:
+            raise error
+
+        self.retries += 1
+        self.backoff_seconds += delay
+        if self.on_retry:
+            self.on_retry(attempt + 1, delay, error)
+        return delay
+
+    def call(self, func, *args, **kwargs):
+        attempt = 0
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                delay = self._backoff(e, attempt)
+                if self.stop_event is None:
+                    time.sleep(delay)
+                elif self.stop_event.wait(delay):
+                    raise
+                attempt += 1
+
+    async def acall(self, run_blocking, func, *args):
+        """
+        Versi asyncio: func (blocking) dijalankan lewat run_blocking (executor engine),
+        dan backoff memakai asyncio.sleep sehingga tidak menahan thread.
+        """
+        attempt = 0
+        while True:
+            try:
+                return await run_blocking(func, *args)
+            except Exception as e:
+                await asyncio.sleep(self._backoff(e, attempt))
+                attempt += 1
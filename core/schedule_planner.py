@@ -0,0 +1,98 @@
+"""
+Perencana jadwal publish untuk antrean upload (tanpa Qt).
+
+Semua slot dihitung sekaligus dari aturan channel, bukan berantai row demi row:
+slot ke-i = hari (i // per_hari) + awal_jam + (i % per_hari) * interval.
+Aturan dibaca dari config.json channel:
+    schedule_interval_minutes   jarak antar video di hari yang sama (default 60)
+    schedule_hours              jam yang diizinkan, "HH:MM-HH:MM" (default seharian)
+    daily_limit                 maksimal video per hari
+Semua waktu dibulatkan ke kelipatan 15 menit (sesuai pilihan jam di ScheduleWidget).
+"""
+from datetime import datetime, timedelta
+
+from utils import load_channel_config
+
+STEP_MINUTES = 15
+DEFAULT_INTERVAL = 60
+DAY_MINUTES = 24 * 60
+
+
+def _round_up(minutes):
+    return -(-minutes // STEP_MINUTES) * STEP_MINUTES
+
+
+def _parse_hhmm(text):
+    hour, _, minute = text.strip().partition(":")
+    return int(hour) * 60 + int(minute or 0)
+
+
+def parse_hours(value):
+    """'08:00-22:00' -> (480, 1320) dalam menit. Kosong/rusak -> seharian."""
+    try:
+        start, _, end = str(value).partition("-")
+        start, end = _parse_hhmm(start), _parse_hhmm(end)
+    except (TypeError, ValueError):
+        return 0, DAY_MINUTES
+    if not 0 <= start < end <= DAY_MINUTES:
+        return 0, DAY_MINUTES
+    return start, end
+
+
+def load_rules(category, channel_name):
+    """Aturan jadwal channel: dict interval, window (menit), daily_limit."""
+    config = load_channel_config(category, channel_name)
+    try:
+        interval = int(config.get("schedule_interval_minutes") or DEFAULT_INTERVAL)
+    except (TypeError, ValueError):
+        interval = DEFAULT_INTERVAL
+    try:
+        daily_limit = int(config.get("daily_limit") or 0)
+    except (TypeError, ValueError):
+        daily_limit = 0
+    return {
+        "interval": max(STEP_MINUTES, _round_up(interval)),
+        "window": parse_hours(config.get("schedule_hours")),
+        "daily_limit": max(0, daily_limit),
+    }
+
+
+def _slots_per_day(first, window_end, interval, daily_limit):
+    # Jumlah slot yang muat di window mulai dari jam `first`, dipotong daily_limit
+    count = max(1, (window_end - 1 - first) // interval + 1)
+    return min(count, daily_limit) if daily_limit else count
+
+
+def plan_slots(start_dt, count, rules):
+    """
+    Daftar `count` datetime publish mulai dari start_dt (slot pertama = start_dt
+    yang dibulatkan / digeser masuk jam yang diizinkan). Hari berikutnya dimulai
+    dari awal jam yang diizinkan. O(count), tanpa akses widget.
+    """
+    if count <= 0:
+        return []
+    interval = rules["interval"]
+    window_start, window_end = rules["window"]
+
+    day = datetime(start_dt.year, start_dt.month, start_dt.day)
+    first = _round_up(start_dt.hour * 60 + start_dt.minute)
+    if first < window_start:
+        first = _round_up(window_start)
+    elif first >= window_end:
+        # Lewat jam terakhir -> mulai hari berikutnya di awal window
+        day += timedelta(days=1)
+        first = _round_up(window_start)
+    if first >= window_end:
+        first = window_start
+
+    # Hari pertama: slot dari jam pertama; hari berikutnya: dari awal window
+    first_day = _slots_per_day(first, window_end, interval, rules["daily_limit"])
+    per_day = _slots_per_day(_round_up(window_start), window_end, interval, rules["daily_limit"])
+    start = _round_up(window_start)
+
+    return [
+        day + timedelta(minutes=first + i * interval) if i < first_day
+        else day + timedelta(days=1 + (i - first_day) // per_day,
+                             minutes=start + (i - first_day) % per_day * interval)
+        for i in range(count)
+    ]
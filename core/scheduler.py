@@ -0,0 +1,308 @@
+from functools import partial
+from concurrent.futures.process import BrokenProcessPool
+
+from PySide6.QtCore import QObject, Signal, QTimer, QCoreApplication
+
+from core.fair_queue import FairQueue
+from core.job_store import get_job_store, QUEUED, POST_PENDING, STALE_AFTER
+from core.post_upload import PostUploadPipeline
+from core.process_pool import UploadProcessPool, JobClaimedError
+from core.progress_bus import get_progress_bus
+from core.quota import get_quota_ledger, quota_key, upload_cost
+from core.retry import QuotaExceededError, ChannelLimitError
+from core.upload_job import channel_key, quota_check
+from core.workers import get_bridge
+from utils import load_app_settings
+
+QUOTA_RECHECK_MS = 60 * 1000   # Job yang ditahan karena kuota dicek ulang tiap menit
+PROCESS_CRASH_RETRIES = 3      # Job yang prosesnya crash diantrekan ulang sampai sekian percobaan
+
+
+class UploadScheduler(QObject):
+    """
+    Scheduler upload global untuk semua channel.
+    Menjalankan beberapa upload paralel sebagai coroutine di AsyncEngine
+    (batas global + per channel) dengan giliran round-robin antar channel.
+    Job disimpan di JobStore (SQLite) sehingga antrean selamat saat app ditutup;
+    FairQueue di memori hanya berisi job_id yang menunggu giliran.
+    Sebelum job dijalankan, QuotaLedger dicek (kuota project + daily_limit
+    channel); job yang tidak muat ditahan di antrean, bukan dikirim lalu gagal.
+    Semua signal membawa channel_key agar ChannelPage bisa memfilter miliknya.
+    Progress per chunk tidak lewat signal, tapi lewat ProgressBus (dibaca GUI per frame).
+    """
+    job_started = Signal(str, int, str)        # channel_key, job_id, title
+    job_status = Signal(str, int, str)         # channel_key, job_id, status
+    job_finished = Signal(str, int, bool, str) # channel_key, job_id, sukses, pesan
+    post_step_finished = Signal(str, int, bool, str) # channel_key, job_id, sukses, pesan (thumbnail)
+
+    def __init__(self, max_global=3, max_per_channel=1, store=None, upload_processes=0, parent=None):
+        super().__init__(parent)
+        self.store = store or get_job_store()
+        self.queue = FairQueue(max_global, max_per_channel)
+        self.bridge = get_bridge()
+        self.tasks = {}         # job_id -> Future upload di AsyncEngine
+        self.running_keys = {}  # job_id -> channel_key
+        self.ledger = get_quota_ledger()
+        self.held = {}          # job_id -> alasan ditahan
+        self._pump_scheduled = False
+        self.progress = get_progress_bus()
+
+        self.quota_timer = QTimer(self)
+        self.quota_timer.setInterval(QUOTA_RECHECK_MS)
+        self.quota_timer.timeout.connect(self._pump)
+
+        # Job milik proses lain (mis. `core.cli run`) yang mati di tengah upload diambil alih
+        self.stale_timer = QTimer(self)
+        self.stale_timer.setInterval(STALE_AFTER * 1000)
+        self.stale_timer.timeout.connect(self.recover_stale_jobs)
+
+        # Tahap setelah insert (thumbnail) jalan di thread sendiri
+        self.post_pipeline = PostUploadPipeline(self.store, self)
+        self.post_pipeline.step_finished.connect(self.post_step_finished.emit)
+        self.post_pipeline.start()
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.post_pipeline.stop)
+
+        # Opsional: transfer di proses terpisah (settings.json: upload_processes)
+        self.process_pool = None
+        if upload_processes:
+            self.process_pool = UploadProcessPool(
+                upload_processes,
+                on_progress=lambda job_id, info: self.progress.publish(job_id, info["bytes_sent"], info["total_bytes"], info),
+                on_status=lambda job_id, text: self.bridge.post(self._emit_for_job, self.job_status, job_id, text),
+                db_path=self.store.path,
+            )
+            if app is not None:
+                app.aboutToQuit.connect(self.process_pool.shutdown)
+
+    def resume_backlog(self):
+        """
+        Muat ulang antrean dari sesi sebelumnya.
+        Job yang terputus saat 'uploading' dikembalikan ke 'queued'
+        (bytes-nya dilanjutkan lewat SessionJournal).
+        """
+        self.store.requeue_interrupted()
+        for job in self.store.list_jobs(states=[QUEUED]):
+            self.queue.push(channel_key(job["category"], job["channel_name"]), job["id"])
+        for job in self.store.list_pending_post_steps():
+            self.post_pipeline.submit(job)
+        self.stale_timer.start()
+        self._pump()
+
+    def recover_stale_jobs(self):
+        for job in self.store.requeue_interrupted():
+            self.queue.push(channel_key(job["category"], job["channel_name"]), job["id"])
+        self._pump()
+
+    def submit(self, category, channel_name, data):
+        """
+        Masukkan satu video ke antrean global. Return job_id.
+        Job baru dijalankan di putaran event loop berikutnya, jadi pemanggil
+        sempat mencatat job_id sebelum job_started dipancarkan.
+        """
+        job_id = self.store.add_job(category, channel_name, data)
+        self.queue.push(channel_key(category, channel_name), job_id)
+        self._schedule_pump()
+        return job_id
+
+    def enqueue_existing(self, items):
+        """Masukkan job yang sudah ada di JobStore (mis. hasil import manifest). items: [(channel_key, job_id)]"""
+        for key, job_id in items:
+            self.queue.push(key, job_id)
+        self._schedule_pump()
+
+    def rename_channel(self, category, old_name, new_name):
+        self.store.rename_channel(category, old_name, new_name)
+        old_key = channel_key(category, old_name)
+        new_key = channel_key(category, new_name)
+        self.queue.rename(old_key, new_key)
+        for job_id, key in self.running_keys.items():
+            if key == old_key:
+                self.running_keys[job_id] = new_key
+
+    def rename_category(self, old_name, new_name):
+        self.store.rename_category(old_name, new_name)
+        prefix = channel_key(old_name, "")
+        renamed = {key: channel_key(new_name, key[len(prefix):]) for key in self.queue.keys() if key.startswith(prefix)}
+        for old_key, new_key in renamed.items():
+            self.queue.rename(old_key, new_key)
+        for job_id, key in self.running_keys.items():
+            if key in renamed:
+                self.running_keys[job_id] = renamed[key]
+
+    def remove_channel(self, category, channel_name=None):
+        """
+        Channel (atau seluruh kategori jika channel_name None) dihapus:
+        upload yang sedang jalan dibatalkan dan job-nya dihapus dari JobStore.
+        Sisa job_id di FairQueue dibuang di _pump karena job-nya sudah tidak ada.
+        """
+        for job in self.store.list_jobs(category, channel_name):
+            task = self.tasks.get(job["id"])
+            if task is not None:
+                task.cancel()
+            self.held.pop(job["id"], None)
+            self.store.delete_job(job["id"])
+        self._pump()
+
+    def _can_start(self, key, job_id):
+        job = self.store.get_job(job_id)
+        if job is None or job["state"] != QUEUED:
+            return True   # Dibuang di _pump
+        ok, reason = quota_check(job, self.ledger)
+        if ok:
+            self.held.pop(job_id, None)
+            return True
+        if self.held.get(job_id) != reason:
+            self.held[job_id] = reason
+            self.job_status.emit(key, job_id, f"Ditahan: {reason}")
+        return False
+
+    def _schedule_pump(self):
+        # Banyak submit berturut-turut cukup memicu satu _pump
+        if not self._pump_scheduled:
+            self._pump_scheduled = True
+            QTimer.singleShot(0, self._pump)
+
+    def _pump(self):
+        self._pump_scheduled = False
+        while True:
+            ready = self.queue.next_ready(self._can_start)
+            if ready is None:
+                break
+            key, job_id = ready
+            job = self.store.get_job(job_id)
+            # Klaim atomic: gagal jika job sudah dihapus / diambil proses lain.
+            # Mode proses: worker yang mengklaim saat upload benar-benar dimulai
+            if job is None or (self.process_pool is None and not self.store.mark_uploading(job_id)):
+                self.queue.mark_done(key)
+                continue
+            self._start_job(key, job)
+
+        # Selama masih ada job yang ditahan, cek ulang kuota secara berkala
+        if self.held and self.queue.pending_count():
+            if not self.quota_timer.isActive():
+                self.quota_timer.start()
+        else:
+            self.held.clear()
+            self.quota_timer.stop()
+
+    def _start_job(self, key, job):
+        job_id = job["id"]
+        self.ledger.reserve(
+            job_id,
+            quota_key(job["category"], job["channel_name"]),
+            key,
+            upload_cost(bool(job["thumb"])),
+        )
+
+        # Thumbnail tidak dipasang saat upload, tapi oleh PostUploadPipeline
+        data = job["data"]
+        self.running_keys[job_id] = key
+        self.progress.start(job_id, key, job["data"].get("title") or "")
+        self.job_started.emit(key, job_id, job["data"].get("title") or "")
+
+        # Callback dipanggil dari thread engine: status diteruskan ke thread GUI
+        def on_status(text):
+            self.bridge.post(self._emit_for_job, self.job_status, job_id, text)
+
+        def on_retry(attempt, delay, error):
+            on_status(f"Retry #{attempt} dalam {delay:.0f} detik: {error}")
+
+        def on_progress(percent, info):
+            self.progress.publish(job_id, info["bytes_sent"], info["total_bytes"], info)
+
+        if self.process_pool is not None:
+            self.tasks[job_id] = self.bridge.watch(
+                self.process_pool.submit(job_id, job["category"], job["channel_name"], data),
+                partial(self._on_upload_done, job_id),
+            )
+            return
+
+        self.tasks[job_id] = self.bridge.run(
+            self.bridge.engine.upload(
+                job["category"], job["channel_name"], data,
+                progress_callback=on_progress,
+                status_callback=on_status,
+                on_retry=on_retry,
+            ),
+            partial(self._on_upload_done, job_id),
+        )
+
+    def _emit_for_job(self, signal, job_id, *args):
+        key = self.running_keys.get(job_id)
+        if key is not None:
+            signal.emit(key, job_id, *args)
+
+    def _on_upload_done(self, job_id, success, result):
+        self.tasks.pop(job_id, None)
+        key = self.running_keys.pop(job_id)
+        self.ledger.release(job_id)
+        self.progress.finish(job_id)
+        self.queue.mark_done(key)
+
+        if self.store.get_job(job_id) is None:
+            # Channel dihapus selama upload (future proses tidak bisa di-cancel): cukup lanjut antrean
+            self.held.pop(job_id, None)
+            self._pump()
+            return
+
+        if isinstance(result, (QuotaExceededError, ChannelLimitError)):
+            # Kuota project / batas channel habis di tengah jalan: kembalikan ke antrean, tunggu reset
+            self.store.requeue(job_id)
+            self.queue.push_front(key, job_id)
+            if isinstance(result, QuotaExceededError):
+                self.held[job_id] = "Kuota API habis, menunggu reset"
+            else:
+                self.held[job_id] = "Batas upload channel tercapai, menunggu reset"
+            self.job_status.emit(key, job_id, f"Ditahan: {self.held[job_id]}")
+            self._pump()
+            return
+
+        if isinstance(result, JobClaimedError):
+            # Worker proses: job keburu diambil proses lain, status job di store tidak diubah
+            self.job_finished.emit(key, job_id, False, str(result))
+            self._pump()
+            return
+
+        if isinstance(result, BrokenProcessPool):
+            # Proses upload crash (jendela tetap hidup): coba lagi, resume lewat SessionJournal
+            job = self.store.get_job(job_id)
+            if job and job["attempts"] < PROCESS_CRASH_RETRIES:
+                self.store.requeue(job_id)
+                self.queue.push_front(key, job_id)
+                self.job_status.emit(key, job_id, "Proses upload crash, diantrekan ulang")
+                self._pump()
+                return
+            result = Exception(f"Proses upload crash {job['attempts'] if job else ''}x: {result}")
+
+        if success:
+            msg = f"Uploaded: {result['video_id']}"
+            if result["retries"]:
+                msg += f" ({result['retries']} retry, {result['backoff_seconds']:.0f}s backoff)"
+            self.store.mark_done(job_id, result["video_id"])
+            job = self.store.get_job(job_id)
+            if job["thumb"] and job["video_id"]:
+                self.store.set_post_state(job_id, POST_PENDING)
+                self.post_pipeline.submit(job)
+        else:
+            msg = str(result)
+            self.store.mark_failed(job_id, msg)
+
+        self.job_finished.emit(key, job_id, success, msg)
+        self._pump()
+
+
+_scheduler = None
+
+def get_scheduler():
+    """Instance scheduler tunggal untuk seluruh aplikasi."""
+    global _scheduler
+    if _scheduler is None:
+        settings = load_app_settings()
+        _scheduler = UploadScheduler(
+            settings["max_parallel_uploads"],
+            settings["max_uploads_per_channel"],
+            upload_processes=settings["upload_processes"],
+        )
+    return _scheduler
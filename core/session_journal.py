@@ -0,0 +1,75 @@
+import os
+import time
+import threading
+
+from core.json_file import update_json
+
+SESSION_FILE = "upload_sessions.json"
+# Session resumable YouTube berlaku sekitar 1 minggu, kita buang lebih awal
+SESSION_MAX_AGE = 6 * 24 * 3600
+
+
+def file_identity(video_path):
+    """Identitas file: path absolut + ukuran + mtime (untuk deteksi file berubah)."""
+    st = os.stat(video_path)
+    return {
+        "path": os.path.abspath(video_path),
+        "size": st.st_size,
+        "mtime": int(st.st_mtime),
+    }
+
+
+class SessionJournal:
+    """
+    Jurnal session resumable upload per channel
+    (channels/<cat>/<chan>/upload_sessions.json).
+    Menyimpan session URI + offset yang sudah diakui server, sehingga upload
+    yang terputus (app ditutup / reboot) bisa lanjut dari byte terakhir.
+    Setiap perubahan lewat update_json (file lock + isi terbaru di disk),
+    jadi worker process, GUI, dan `core.cli run` tidak saling menimpa.
+    """
+    _lock = threading.Lock()   # Dipakai bersama semua worker di proses ini
+
+    def __init__(self, channel_dir):
+        self.path = os.path.join(channel_dir, SESSION_FILE)
+
+    def find(self, video_path):
+        """Return entry session yang masih valid untuk file ini, atau None."""
+        identity = file_identity(video_path)
+        found = {}
+
+        def check(sessions):
+            entry = sessions.get(identity["path"])
+            if not entry:
+                return False
+            expired = time.time() - entry.get("created", 0) > SESSION_MAX_AGE
+            changed = entry.get("size") != identity["size"] or entry.get("mtime") != identity["mtime"]
+            if expired or changed:
+                del sessions[identity["path"]]
+                return True
+            found["entry"] = entry
+            return False
+
+        with self._lock:
+            update_json(self.path, check, indent=2)
+        return found.get("entry")
+
+    def record(self, video_path, session_uri, offset):
+        """Simpan session URI + offset yang sudah di-commit server."""
+        identity = file_identity(video_path)
+
+        def store(sessions):
+            entry = sessions.get(identity["path"])
+            if not entry or entry.get("session_uri") != session_uri:
+                entry = dict(identity, session_uri=session_uri, created=time.time())
+            entry["offset"] = offset
+            entry["updated"] = time.time()
+            sessions[identity["path"]] = entry
+
+        with self._lock:
+            update_json(self.path, store, indent=2)
+
+    def remove(self, video_path):
+        key = os.path.abspath(video_path)
+        with self._lock:
+            update_json(self.path, lambda sessions: sessions.pop(key, None) is not None, indent=2)
@@ -0,0 +1,156 @@
+import os
+import json
+import math
+import time
+import threading
+from collections import defaultdict
+
+HISTORY_FILE = "upload_history.jsonl"   # Satu baris ringkasan per upload selesai/gagal
+BUCKETS_PER_DOUBLING = 4                 # Resolusi histogram: ~19% per bucket
+
+_history_lock = threading.Lock()
+
+
+class LogHistogram:
+    """
+    Histogram bucket logaritmik (ukuran tetap, cocok untuk latency & throughput
+    yang rentangnya lebar). Persentil diambil dari batas atas bucket.
+    """
+
+    def __init__(self):
+        self.buckets = defaultdict(int)   # index bucket -> jumlah sampel
+        self.count = 0
+        self.max = 0.0
+
+    @staticmethod
+    def _index(value):
+        return math.floor(math.log2(value) * BUCKETS_PER_DOUBLING) if value > 0 else None
+
+    def add(self, value):
+        index = self._index(value)
+        if index is None:
+            return
+        self.buckets[index] += 1
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def percentile(self, p):
+        if not self.count:
+            return 0.0
+        rank = p / 100 * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(2 ** ((index + 1) / BUCKETS_PER_DOUBLING), self.max)
+        return self.max
+
+
+class UploadTelemetry:
+    """
+    Catatan per upload: latency & throughput setiap chunk (histogram),
+    offset yang diakui server, dan statistik retry. finish() menulis ringkasan
+    (termasuk persentil histogram) ke upload_history.jsonl.
+    """
+
+    def __init__(self, channel_key, video_path):
+        self.channel_key = channel_key
+        self.video_path = video_path
+        self.latency = LogHistogram()       # detik per request chunk
+        self.throughput = LogHistogram()    # bytes/detik per chunk
+        self.bytes_sent = 0
+        self.chunk_seconds = 0.0
+        self.chunks = 0
+        self.ack_offset = 0
+        self.started_wall = time.time()
+        self.started = time.monotonic()
+        self.finished = False
+
+    def record_chunk(self, nbytes, seconds, ack_offset, sample=True):
+        """
+        sample=False untuk chunk setelah resume/retry: latency tetap dicatat,
+        tapi tidak dijadikan sampel throughput (waktunya termasuk menunggu).
+        """
+        self.chunks += 1
+        self.ack_offset = ack_offset
+        self.latency.add(seconds)
+        if sample and nbytes > 0 and seconds > 0:
+            self.bytes_sent += nbytes
+            self.chunk_seconds += seconds
+            self.throughput.add(nbytes / seconds)
+
+    def summary(self, video_id=None, retries=0, backoff_seconds=0.0, error=None):
+        return {
+            "channel": self.channel_key,
+            "video_path": self.video_path,
+            "video_id": video_id,
+            "success": error is None,
+            "error": error,
+            "started_at": self.started_wall,
+            "hour": time.localtime(self.started_wall).tm_hour,
+            "wall_seconds": round(time.monotonic() - self.started, 3),
+            "bytes": self.ack_offset,
+            "chunks": self.chunks,
+            "mean_bps": round(self.bytes_sent / self.chunk_seconds) if self.chunk_seconds else 0,
+            "p50_bps": round(self.throughput.percentile(50)),
+            "p95_bps": round(self.throughput.percentile(95)),
+            "p50_latency": round(self.latency.percentile(50), 3),
+            "p95_latency": round(self.latency.percentile(95), 3),
+            "retries": retries,
+            "backoff_seconds": round(backoff_seconds, 1),
+        }
+
+    def finish(self, video_id=None, retries=0, backoff_seconds=0.0, error=None):
+        """Tulis ringkasan ke history (sekali saja)."""
+        if self.finished:
+            return None
+        self.finished = True
+        summary = self.summary(video_id, retries, backoff_seconds, error)
+        append_history(summary)
+        return summary
+
+
+def append_history(summary, path=HISTORY_FILE):
+    line = json.dumps(summary, separators=(",", ":"))
+    with _history_lock:
+        with open(path, "a") as f:
+            f.write(line + "\n")
+
+
+def read_history(path=HISTORY_FILE, channel_key=None):
+    """Generator ringkasan upload dari file history (baris rusak dilewati)."""
+    if not os.path.exists(path):
+        return
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if channel_key is None or entry.get("channel") == channel_key:
+                yield entry
+
+
+def summarize_history(path=HISTORY_FILE, group_by="channel", channel_key=None):
+    """
+    Rekap history per 'channel' atau per 'hour' (jam lokal mulai upload):
+    jumlah upload, gagal, rata-rata throughput & wall time, total retry.
+    channel_key opsional: hanya upload channel tersebut.
+    """
+    groups = {}
+    for entry in read_history(path, channel_key):
+        group = groups.setdefault(entry.get(group_by), {
+            "uploads": 0, "failed": 0, "bytes": 0, "wall_seconds": 0.0,
+            "mean_bps_total": 0, "retries": 0,
+        })
+        group["uploads"] += 1
+        group["failed"] += 0 if entry.get("success") else 1
+        group["bytes"] += entry.get("bytes", 0)
+        group["wall_seconds"] += entry.get("wall_seconds", 0)
+        group["mean_bps_total"] += entry.get("mean_bps", 0)
+        group["retries"] += entry.get("retries", 0)
+
+    for group in groups.values():
+        group["mean_bps"] = round(group.pop("mean_bps_total") / group["uploads"])
+        group["mean_wall_seconds"] = round(group["wall_seconds"] / group["uploads"], 1)
+    return groups
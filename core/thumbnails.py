@@ -0,0 +1,77 @@
+import os
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImageReader
+
+THUMB_CACHE_DIR = os.path.join("cache", "thumbnails")
+MAX_WIDTH = 1280
+MAX_HEIGHT = 720
+MAX_BYTES = 2 * 1024 * 1024          # Batas thumbnail YouTube
+JPEG_QUALITIES = (90, 80, 70, 60)    # Turunkan kualitas sampai di bawah 2 MB
+HASH_BLOCK = 1024 * 1024
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="thumb")
+_inflight = {}                        # path -> Future yang sedang diproses
+_inflight_lock = threading.Lock()
+
+
+def content_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def prepare_thumbnail(path):
+    """
+    Decode -> perkecil ke maks 1280x720 -> encode JPEG < 2 MB.
+    Hasil disimpan di cache berdasarkan hash isi file, jadi gambar yang sama
+    (mis. dipakai di banyak channel) hanya diproses sekali.
+    Return path file yang siap diupload.
+    """
+    digest = content_hash(path)
+    cached = os.path.join(THUMB_CACHE_DIR, f"{digest}.jpg")
+    if os.path.exists(cached):
+        return cached
+
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    size = reader.size()
+    fmt = bytes(reader.format()).decode().lower()
+
+    # Sudah JPEG kecil & ukuran pas -> tidak perlu diproses ulang
+    fits = size.isValid() and size.width() <= MAX_WIDTH and size.height() <= MAX_HEIGHT
+    if fits and fmt in ("jpg", "jpeg") and os.path.getsize(path) <= MAX_BYTES:
+        return path
+
+    if size.isValid() and not fits:
+        # Perkecil saat decode (lebih hemat memori untuk gambar besar)
+        reader.setScaledSize(size.scaled(MAX_WIDTH, MAX_HEIGHT, Qt.KeepAspectRatio))
+
+    image = reader.read()
+    if image.isNull():
+        raise ValueError(f"Thumbnail tidak bisa dibaca: {reader.errorString()}")
+
+    os.makedirs(THUMB_CACHE_DIR, exist_ok=True)
+    tmp_path = f"{cached}.{threading.get_ident()}.tmp"
+    for quality in JPEG_QUALITIES:
+        if not image.save(tmp_path, "JPG", quality):
+            raise ValueError("Gagal menyimpan thumbnail JPEG")
+        if os.path.getsize(tmp_path) <= MAX_BYTES:
+            break
+    os.replace(tmp_path, cached)
+    return cached
+
+
+def submit_thumbnail(path):
+    """Proses thumbnail di background pool. Return Future berisi path hasil."""
+    with _inflight_lock:
+        future = _inflight.get(path)
+        if future is None or future.done():
+            future = _executor.submit(prepare_thumbnail, path)
+            _inflight[path] = future
+            future.add_done_callback(lambda _, p=path: _inflight.pop(p, None))
+        return future
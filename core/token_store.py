@@ -0,0 +1,369 @@
+"""
+Credential store gabungan (opsional): client secret & token semua channel
+dalam satu file SQLite, menggantikan client_secret.json / token.json per folder.
+
+Aktif jika settings.json berisi "credential_store": "credentials.db".
+Dengan "credential_store_encrypt": true isi secret & token dienkripsi (Fernet,
+butuh paket cryptography). Kunci diambil dari env CREDENTIAL_STORE_KEY, atau
+file <store>.key yang dibuat otomatis (izin 0600) saat pertama kali.
+
+Setiap channel punya uid tetap; nama kategori/channel hanya kolom berindeks
+yang ikut diubah saat folder di-rename. Semua baris dibaca sekali saat store
+dibuka (index nama -> uid & secret di memori), token dibaca per baris saat
+CredentialManager memuat ulang. File lama diimpor otomatis saat channel
+pertama kali dicari, atau sekaligus lewat `python -m core.cli credentials`.
+"""
+import os
+import json
+import sqlite3
+import threading
+import time
+import uuid
+
+from utils import BASE_CHANNELS_DIR, load_app_settings
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:
+    Fernet = None
+
+KEY_ENV = "CREDENTIAL_STORE_KEY"
+KEY_CHECK = b"credential-store"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS channels (
+    uid           TEXT PRIMARY KEY,
+    category      TEXT NOT NULL,
+    channel_name  TEXT NOT NULL,
+    client_secret BLOB,
+    token         BLOB,
+    token_version INTEGER NOT NULL DEFAULT 0,
+    updated_at    REAL NOT NULL,
+    UNIQUE (category, channel_name)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value BLOB
+);
+"""
+
+
+def _channel_files(category, channel_name):
+    base = os.path.join(BASE_CHANNELS_DIR, category, channel_name)
+    return os.path.join(base, "client_secret.json"), os.path.join(base, "token.json")
+
+
+def _read_text(path):
+    try:
+        with open(path, "r") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def load_store_key(path):
+    """Kunci Fernet dari env CREDENTIAL_STORE_KEY atau file <store>.key (dibuat jika belum ada)."""
+    if Fernet is None:
+        raise RuntimeError("Enkripsi credential store butuh paket 'cryptography' (pip install cryptography).")
+    key = os.environ.get(KEY_ENV)
+    if key:
+        return key.encode()
+    key_path = path + ".key"
+    try:
+        with open(key_path, "rb") as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        key = Fernet.generate_key()
+        fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(key)
+        return key
+
+
+class CredentialStore:
+    """
+    Secret & token channel dalam satu SQLite (lihat docstring modul).
+    Aman dipakai dari beberapa thread (satu koneksi dijaga lock) dan dari
+    proses upload terpisah (WAL; versi token dicek ke DB, bukan cache).
+    """
+
+    def __init__(self, path, key=None):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._cipher = None
+        self._setup_cipher(key)
+        self._index = {}   # (category, channel_name) -> uid
+        self._rows = {}    # uid -> {"category", "channel_name", "secret", "token_version"}
+        self.load_all()
+
+    # --- ENKRIPSI ---
+    def _setup_cipher(self, key):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'key_check'").fetchone()
+        if row is None and key is None:
+            return
+        if key is None:
+            # Sekali dienkripsi, store selalu butuh kunci
+            key = load_store_key(self.path)
+        cipher = Fernet(key)
+        if row is not None:
+            try:
+                cipher.decrypt(row[0])
+            except InvalidToken:
+                raise ValueError(f"Kunci credential store salah: {self.path}") from None
+            self._cipher = cipher
+            return
+        # Store lama tanpa enkripsi -> enkripsi semua baris sekarang
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                rows = self._conn.execute("SELECT uid, client_secret, token FROM channels").fetchall()
+                for uid, secret, token in rows:
+                    self._conn.execute(
+                        "UPDATE channels SET client_secret = ?, token = ? WHERE uid = ?",
+                        (secret and cipher.encrypt(secret), token and cipher.encrypt(token), uid),
+                    )
+                self._conn.execute("INSERT INTO meta (key, value) VALUES ('key_check', ?)", (cipher.encrypt(KEY_CHECK),))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        self._cipher = cipher
+
+    def _seal(self, text):
+        if text is None:
+            return None
+        data = text.encode("utf-8")
+        return self._cipher.encrypt(data) if self._cipher else data
+
+    def _open(self, blob):
+        if blob is None:
+            return None
+        if self._cipher:
+            blob = self._cipher.decrypt(blob)
+        return bytes(blob).decode("utf-8")
+
+    # --- BACA ---
+    def load_all(self):
+        """Baca index semua channel (uid, nama, secret, versi token) dalam satu query."""
+        rows = self._conn.execute(
+            "SELECT uid, category, channel_name, client_secret, "
+            "CASE WHEN token IS NULL THEN NULL ELSE token_version END FROM channels"
+        ).fetchall()
+        index, cached = {}, {}
+        for uid, category, channel_name, secret, token_version in rows:
+            secret = self._open(secret)
+            index[(category, channel_name)] = uid
+            cached[uid] = {
+                "category": category,
+                "channel_name": channel_name,
+                "secret": json.loads(secret) if secret is not None else None,
+                "token_version": token_version,
+            }
+        with self._lock:
+            self._index, self._rows = index, cached
+        return len(cached)
+
+    def uid(self, category, channel_name):
+        return self._index.get((category, channel_name))
+
+    def _row(self, category, channel_name):
+        uid = self._index.get((category, channel_name))
+        return self._rows.get(uid) if uid else None
+
+    def get_secret(self, category, channel_name):
+        """Isi client secret (dict) channel; None jika belum ada. File lama diimpor otomatis."""
+        row = self._row(category, channel_name)
+        if row is None or row["secret"] is None:
+            self.import_files(category, channel_name)
+            row = self._row(category, channel_name)
+        return row["secret"] if row else None
+
+    def has_secret(self, category, channel_name):
+        row = self._row(category, channel_name)
+        if row is not None and row["secret"] is not None:
+            return True
+        return os.path.exists(_channel_files(category, channel_name)[0])
+
+    def has_token(self, category, channel_name):
+        try:
+            return self.token_version(category, channel_name) is not None
+        except ValueError:
+            # token.json rusak belum bisa diimpor -> tetap dianggap ada (status "Corrupt Token")
+            return os.path.exists(_channel_files(category, channel_name)[1])
+
+    def token_version(self, category, channel_name):
+        """Versi token di DB (berubah setiap put_token, juga dari proses lain); None jika belum ada."""
+        uid = self._index.get((category, channel_name))
+        if uid is not None:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT token_version FROM channels WHERE uid = ? AND token IS NOT NULL", (uid,)
+                ).fetchone()
+            if row is not None:
+                return row[0]
+        if self.import_files(category, channel_name, token_only=True):
+            return self.token_version(category, channel_name)
+        return None
+
+    def get_token(self, category, channel_name):
+        """(isi token.json, versi) channel; (None, None) jika belum ada. token.json lama diimpor otomatis."""
+        uid = self._index.get((category, channel_name))
+        row = None
+        if uid is not None:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT token, token_version FROM channels WHERE uid = ? AND token IS NOT NULL", (uid,)
+                ).fetchone()
+        if row is None:
+            if self.import_files(category, channel_name, token_only=True):
+                return self.get_token(category, channel_name)
+            return None, None
+        return self._open(row[0]), row[1]
+
+    # --- TULIS ---
+    def _ensure_uid(self, category, channel_name):
+        # Dipanggil dengan _lock
+        uid = self._index.get((category, channel_name))
+        if uid is None:
+            uid = uuid.uuid4().hex
+            self._conn.execute(
+                "INSERT INTO channels (uid, category, channel_name, updated_at) VALUES (?, ?, ?, ?)",
+                (uid, category, channel_name, time.time()),
+            )
+            self._index[(category, channel_name)] = uid
+            self._rows[uid] = {"category": category, "channel_name": channel_name, "secret": None, "token_version": None}
+        return uid
+
+    def put_secret(self, category, channel_name, client_config):
+        with self._lock:
+            uid = self._ensure_uid(category, channel_name)
+            self._conn.execute(
+                "UPDATE channels SET client_secret = ?, updated_at = ? WHERE uid = ?",
+                (self._seal(json.dumps(client_config)), time.time(), uid),
+            )
+            self._rows[uid]["secret"] = client_config
+
+    def put_token(self, category, channel_name, token_json, create=False):
+        """
+        Simpan token; return versi barunya. Tanpa create=True channel harus
+        sudah ada: refresh token milik channel yang baru di-rename/dihapus
+        tidak boleh membuat baris baru dengan nama lama.
+        """
+        with self._lock:
+            if create:
+                uid = self._ensure_uid(category, channel_name)
+            else:
+                uid = self._index.get((category, channel_name))
+                if uid is None:
+                    raise KeyError(f"Channel {category}/{channel_name} tidak ada di credential store")
+            self._conn.execute(
+                "UPDATE channels SET token = ?, token_version = token_version + 1, updated_at = ? WHERE uid = ?",
+                (self._seal(token_json), time.time(), uid),
+            )
+            version = self._conn.execute("SELECT token_version FROM channels WHERE uid = ?", (uid,)).fetchone()[0]
+            self._rows[uid]["token_version"] = version
+        return version
+
+    def rename_channel(self, category, old_name, new_name):
+        with self._lock:
+            uid = self._index.pop((category, old_name), None)
+            if uid is None:
+                return
+            self._conn.execute("UPDATE channels SET channel_name = ? WHERE uid = ?", (new_name, uid))
+            self._index[(category, new_name)] = uid
+            self._rows[uid]["channel_name"] = new_name
+
+    def rename_category(self, old_name, new_name):
+        with self._lock:
+            self._conn.execute("UPDATE channels SET category = ? WHERE category = ?", (new_name, old_name))
+            for (category, channel_name), uid in list(self._index.items()):
+                if category == old_name:
+                    del self._index[(category, channel_name)]
+                    self._index[(new_name, channel_name)] = uid
+                    self._rows[uid]["category"] = new_name
+
+    def delete_channel(self, category, channel_name):
+        with self._lock:
+            uid = self._index.pop((category, channel_name), None)
+            if uid is not None:
+                self._conn.execute("DELETE FROM channels WHERE uid = ?", (uid,))
+                self._rows.pop(uid, None)
+
+    def delete_category(self, category):
+        for cat, channel_name in list(self._index):
+            if cat == category:
+                self.delete_channel(cat, channel_name)
+
+    # --- MIGRASI DARI FILE PER FOLDER ---
+    def import_files(self, category, channel_name, token_only=False):
+        """
+        Impor client_secret.json / token.json channel yang belum ada di store.
+        Return True jika ada yang diimpor. JSON rusak -> json.JSONDecodeError.
+        """
+        secret_path, token_path = _channel_files(category, channel_name)
+        row = self._row(category, channel_name)
+        imported = False
+        if not token_only and (row is None or row["secret"] is None):
+            text = _read_text(secret_path)
+            if text is not None:
+                self.put_secret(category, channel_name, json.loads(text))
+                imported = True
+        if row is None or row["token_version"] is None:
+            text = _read_text(token_path)
+            if text is not None:
+                json.loads(text)   # Validasi sebelum disimpan
+                self.put_token(category, channel_name, text, create=True)
+                imported = True
+        return imported
+
+    def migrate(self, remove_files=False):
+        """Impor file semua channel di folder channels/. Return daftar (category, channel, error)."""
+        results = []
+        if not os.path.isdir(BASE_CHANNELS_DIR):
+            return results
+        for category in sorted(os.listdir(BASE_CHANNELS_DIR)):
+            cat_path = os.path.join(BASE_CHANNELS_DIR, category)
+            if not os.path.isdir(cat_path):
+                continue
+            for channel_name in sorted(os.listdir(cat_path)):
+                if not os.path.isdir(os.path.join(cat_path, channel_name)):
+                    continue
+                try:
+                    self.import_files(category, channel_name)
+                    error = None
+                except Exception as e:
+                    error = str(e)
+                if remove_files and error is None:
+                    for path in _channel_files(category, channel_name):
+                        if os.path.exists(path):
+                            os.remove(path)
+                results.append((category, channel_name, error))
+        return results
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_store = None
+_store_loaded = False
+_store_lock = threading.Lock()
+
+def get_credential_store():
+    """CredentialStore tunggal untuk seluruh proses; None jika tidak diaktifkan di settings.json."""
+    global _store, _store_loaded
+    if _store_loaded:
+        return _store
+    with _store_lock:
+        if not _store_loaded:
+            settings = load_app_settings()
+            path = settings.get("credential_store")
+            if path:
+                key = load_store_key(path) if settings.get("credential_store_encrypt") else None
+                _store = CredentialStore(path, key=key)
+            _store_loaded = True
+        return _store
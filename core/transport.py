@@ -0,0 +1,115 @@
+import select
+import threading
+import time
+from contextlib import contextmanager
+
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.http import build_http
+
+MAX_IDLE_PER_CREDENTIAL = 4   # Transport nganggur yang disimpan per kredensial
+IDLE_TIMEOUT = 120            # Detik; server Google menutup koneksi keep-alive yang lama diam
+
+
+def credential_key(creds):
+    """Identitas kredensial (sama untuk token.json yang sama walau objeknya dibaca ulang)."""
+    return (getattr(creds, "client_id", None), getattr(creds, "refresh_token", None) or id(creds))
+
+
+def _socket_alive(sock):
+    # Socket keep-alive yang sehat tidak punya data masuk saat nganggur:
+    # readable = server sudah kirim FIN/reset (atau data nyasar) -> jangan dipakai
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+    except (OSError, ValueError):
+        return False
+    return not readable
+
+
+class TransportPool:
+    """
+    Pool AuthorizedHttp (httplib2 + kredensial) per kredensial channel.
+    Koneksi TCP+TLS di dalam httplib2.Http tetap hidup setelah dipakai, jadi
+    upload, refresh statistik dan thumbnail berikutnya tidak handshake ulang.
+
+    httplib2.Http tidak thread-safe: satu transport hanya dipinjam satu
+    pemakai dalam satu waktu (acquire/release atau lease()).
+    Saat dipinjam, koneksi yang sudah ditutup server dibuang (health check);
+    transport nganggur > IDLE_TIMEOUT atau melebihi MAX_IDLE_PER_CREDENTIAL ditutup.
+    """
+
+    def __init__(self, max_idle=MAX_IDLE_PER_CREDENTIAL, idle_timeout=IDLE_TIMEOUT):
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self._idle = {}   # credential_key -> [(AuthorizedHttp, waktu_kembali)], terbaru di akhir
+        self._lock = threading.Lock()
+
+    def acquire(self, creds):
+        key = credential_key(creds)
+        with self._lock:
+            self._prune(time.monotonic())
+            idle = self._idle.get(key)
+            http = idle.pop()[0] if idle else None
+        if http is None:
+            return AuthorizedHttp(creds, http=build_http())
+        # Kredensial terbaru (mis. hasil refresh) dipakai untuk request berikutnya
+        http.credentials = creds
+        self._drop_dead_connections(http)
+        return http
+
+    def release(self, creds, http):
+        key = credential_key(creds)
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append((http, time.monotonic()))
+                return
+        http.http.close()
+
+    @contextmanager
+    def lease(self, creds):
+        http = self.acquire(creds)
+        try:
+            yield http
+        finally:
+            self.release(creds, http)
+
+    def _prune(self, now):
+        # Dipanggil dengan _lock
+        for key in list(self._idle):
+            fresh = []
+            for http, returned in self._idle[key]:
+                if now - returned > self.idle_timeout:
+                    http.http.close()
+                else:
+                    fresh.append((http, returned))
+            if fresh:
+                self._idle[key] = fresh
+            else:
+                del self._idle[key]
+
+    @staticmethod
+    def _drop_dead_connections(http):
+        connections = http.http.connections
+        for conn_key, conn in list(connections.items()):
+            if conn.sock is not None and not _socket_alive(conn.sock):
+                conn.close()
+                del connections[conn_key]
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for entries in idle.values():
+            for http, _ in entries:
+                http.http.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_transport_pool():
+    """TransportPool tunggal untuk seluruh proses."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = TransportPool()
+        return _pool
@@ -0,0 +1,188 @@
+import os
+import pytz
+from datetime import datetime, timezone
+
+from core.auth_manager import AuthManager
+from core.youtube_service import get_service, leased_service
+from core.transport import get_transport_pool
+from core.uploader import build_video_body, VideoUpload, set_thumbnail
+from core.chunking import MIB
+from core.session_journal import SessionJournal
+from core.retry import Retrier, QuotaExceededError, ChannelLimitError
+from core.quota import get_quota_ledger, quota_key, upload_cost
+from core.bandwidth import get_limiter
+from core.telemetry import UploadTelemetry
+from core.fingerprint import file_fingerprint, find_uploaded, record_uploaded
+from utils import load_channel_config, cached_channel_config, BASE_CHANNELS_DIR
+
+# Logika upload tanpa Qt: dipakai AsyncEngine (GUI) maupun core.cli (headless)
+
+
+def channel_key(category, channel_name):
+    return f"{category}/{channel_name}"
+
+
+class DuplicateUploadError(Exception):
+    pass
+
+
+def publish_at_utc(schedule_date, schedule_time):
+    """Jadwal lokal WIB ('YYYY-MM-DD', 'HH:MM') -> RFC3339 UTC untuk publishAt."""
+    if not (schedule_date and schedule_time):
+        return None
+    # Parsing sebagai waktu lokal WIB
+    dt_naive = datetime.strptime(f"{schedule_date} {schedule_time}", "%Y-%m-%d %H:%M")
+    dt_wib = pytz.timezone("Asia/Jakarta").localize(dt_naive)
+    # Konversi ke UTC (WAJIB untuk YouTube API)
+    return dt_wib.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def quota_check(job, ledger=None):
+    """Cek kuota project + daily_limit channel sebelum job dijalankan. Return (ok, alasan)."""
+    ledger = ledger or get_quota_ledger()
+    config = cached_channel_config(job["category"], job["channel_name"])
+    return ledger.check_upload(
+        quota_key(job["category"], job["channel_name"]),
+        channel_key(job["category"], job["channel_name"]),
+        upload_cost(bool(job["thumb"])),
+        config.get("daily_limit"),
+    )
+
+
+class UploadContext:
+    """State satu upload channel: dipakai run_upload (thread) & AsyncEngine.upload (asyncio)."""
+
+    def __init__(self, category, channel_name, data, progress_callback=None, status_callback=None, on_retry=None):
+        self.category = category
+        self.channel_name = channel_name
+        self.key = channel_key(category, channel_name)
+        self.data = data
+        self.progress_callback = progress_callback
+        self.status = status_callback or (lambda text: None)
+        self.on_retry = on_retry
+        self.telemetry = UploadTelemetry(self.key, data['video_path'])
+        self.fingerprint = None
+        self.youtube = None
+        self.creds = None
+        self.http = None      # AuthorizedHttp pinjaman TransportPool, dikembalikan di complete/failed
+        self.retrier = None
+        self.upload = None
+
+    def check_duplicate(self):
+        # 0. Cek duplikat sebelum ada byte terkirim (hash biasanya sudah di-cache)
+        self.status("Checking duplicate...")
+        self.fingerprint = file_fingerprint(self.data['video_path'])
+        previous = find_uploaded(self.category, self.channel_name, self.fingerprint)
+        if previous:
+            raise DuplicateUploadError(f"Duplikat: file ini sudah diupload sebagai https://youtu.be/{previous['video_id']}")
+
+    def prepare(self, creds):
+        """Bangun VideoUpload (service, jadwal, chunk & retry dari config channel)."""
+        data = self.data
+        self.creds = creds
+        self.http = get_transport_pool().acquire(creds)
+        self.youtube = get_service(creds, quota_key(self.category, self.channel_name), http=self.http)
+
+        # Batas chunk adaptif & budget retry per channel (config.json)
+        config = load_channel_config(self.category, self.channel_name)
+        chunk_min = config.get("chunk_min_mb")
+        chunk_max = config.get("chunk_max_mb")
+        self.retrier = Retrier(
+            max_retries=config.get("retry_max_attempts", 10),
+            max_backoff=config.get("retry_max_backoff_seconds", 900),
+            on_retry=self.on_retry,
+        )
+
+        body = build_video_body(
+            data['title'], data['desc'], data['tags'], data['privacy'],
+            # Jadwal WIB -> publishAt UTC
+            publish_at_utc(data.get('schedule_date'), data.get('schedule_time')),
+        )
+        self.status("Uploading Video...")
+        self.upload = VideoUpload(
+            self.youtube, data['video_path'], body,
+            progress_callback=self.progress_callback,
+            chunk_min=int(chunk_min * MIB) if chunk_min else None,
+            chunk_max=int(chunk_max * MIB) if chunk_max else None,
+            # Jurnal session di channels/<cat>/<chan>/ agar bisa resume setelah crash
+            journal=SessionJournal(os.path.join(BASE_CHANNELS_DIR, self.category, self.channel_name)),
+            retrier=self.retrier,
+            # Semua upload berbagi satu limiter bandwidth (global + per channel)
+            throttle=get_limiter().throttle_for(self.key),
+            telemetry=self.telemetry,
+        )
+        return self.upload
+
+    def complete(self):
+        video_id = self.upload.video_id
+        self.telemetry.finish(video_id, self.retrier.retries, self.retrier.backoff_seconds)
+        get_quota_ledger().record_upload(self.key)
+        record_uploaded(self.category, self.channel_name, self.fingerprint, video_id, self.data['title'])
+        # Thumbnail tidak dipasang di sini: gagal set thumbnail tidak boleh
+        # menggagalkan video yang sudah terupload -> tahap terpisah (apply_thumbnail)
+        self.release_transport()
+        self.status("Finalizing...")
+        print(f"UPLOAD SUCCESS: https://youtu.be/{video_id}")
+        return {"video_id": video_id, "retries": self.retrier.retries, "backoff_seconds": self.retrier.backoff_seconds}
+
+    def release_transport(self):
+        if self.http is not None:
+            get_transport_pool().release(self.creds, self.http)
+            self.http = None
+
+    def discard_transport(self):
+        # Upload dibatalkan di tengah chunk: koneksi bisa masih dipakai thread lain
+        if self.http is not None:
+            self.http.http.close()
+            self.http = None
+
+    def failed(self, error):
+        self.release_transport()
+        if isinstance(error, QuotaExceededError):
+            # Tandai kuota project habis agar job lain ditahan sampai reset
+            get_quota_ledger().mark_exhausted(quota_key(self.category, self.channel_name))
+        elif isinstance(error, ChannelLimitError):
+            # Batas upload channel: hanya channel ini yang ditahan
+            get_quota_ledger().mark_channel_limited(channel_key(self.category, self.channel_name))
+        # Hanya upload yang sudah mengirim chunk yang masuk history
+        if self.telemetry.chunks:
+            self.telemetry.finish(
+                retries=self.retrier.retries if self.retrier else 0,
+                backoff_seconds=self.retrier.backoff_seconds if self.retrier else 0.0,
+                error=str(error),
+            )
+
+
+def run_upload(category, channel_name, data, progress_callback=None, status_callback=None, on_retry=None):
+    """
+    Jalankan satu upload video (data: dict seperti UploadRow.get_data()) di thread ini.
+    Return dict {video_id, retries, backoff_seconds}. data['thumb'] diabaikan:
+    thumbnail dipasang PostUploadPipeline / `core.cli run` setelah insert.
+    Raise DuplicateUploadError, QuotaExceededError (kuota project ditandai habis),
+    ChannelLimitError (channel ditahan) atau Exception lain jika gagal.
+    """
+    ctx = UploadContext(category, channel_name, data, progress_callback, status_callback, on_retry)
+    try:
+        ctx.check_duplicate()
+        ctx.status("Authenticating...")
+        # Ambil Kredensial (auto-refresh jika expired)
+        upload = ctx.prepare(AuthManager.load_credentials(category, channel_name))
+        while upload.video_id is None:
+            upload.step()
+        return ctx.complete()
+    except Exception as e:
+        ctx.failed(e)
+        raise
+    finally:
+        ctx.release_transport()
+
+
+def apply_thumbnail(category, channel_name, video_id, thumb, retrier=None):
+    """Tahap setelah insert: preprocess thumbnail (cache) lalu thumbnails.set."""
+    # Import di sini: preprocessing memakai QtGui, CLI tanpa thumbnail tidak perlu memuatnya
+    from core.thumbnails import prepare_thumbnail
+
+    creds = AuthManager.load_credentials(category, channel_name)
+    thumb_path = prepare_thumbnail(thumb)
+    with leased_service(creds, quota_key(category, channel_name)) as youtube:
+        set_thumbnail(youtube, video_id, thumb_path, retrier or Retrier(max_retries=5))
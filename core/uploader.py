@@ -1,24 +1,12 @@
-from googleapiclient.http import MediaFileUpload
 from datetime import datetime, timezone
 import re
+import time
+from googleapiclient.errors import HttpError
+from core.chunking import AdaptiveChunker, MmapMediaFileUpload
+from core.retry import Retrier
 
-def upload_video(
-    youtube,
-    video_path,
-    title,
-    description,
-    tags=None,
-    privacy="public",
-    thumbnail_path=None,
-    publish_at=None,
-    progress_callback=None,
-    category_id="22",
-    language="id"
-):
-    """
-    Upload video YouTube dengan metadata lengkap & natural seperti creator manusia
-    """
-
+def build_video_body(title, description, tags=None, privacy="public", publish_at=None, category_id="22", language="id"):
+    """Body videos.insert (snippet + status)."""
     # --- VALIDASI DASAR ---
     if publish_at:
         # publishAt WAJIB format RFC3339 + UTC
@@ -64,32 +52,151 @@ def upload_video(
         "status": status,
     }
 
-    media = MediaFileUpload(
-        video_path,
-        mimetype="video/*",
-        chunksize=1024 * 1024,
-        resumable=True,
-    )
-
-    request = youtube.videos().insert(
-        part="snippet,status",
-        body=body,
-        media_body=media,
-    )
-
-    response = None
-    while response is None:
-        upload_status, response = request.next_chunk()
-        if upload_status and progress_callback:
-            progress_callback(int(upload_status.progress() * 100))
-
-    video_id = response["id"]
-
-    # --- SET THUMBNAIL (SELALU TERPISAH, SEPERTI MANUSIA) ---
-    if thumbnail_path:
-        youtube.thumbnails().set(
-            videoId=video_id,
-            media_body=thumbnail_path
-        ).execute()
-
-    return video_id
\ No newline at end of file
+    return body
+
+
+class VideoUpload:
+    """
+    Satu upload resumable yang dijalankan chunk per chunk.
+    step() = satu chunk (blocking, retry dengan time.sleep) untuk thread biasa;
+    astep() = versi asyncio, chunk dikirim lewat executor engine dan backoff
+    memakai asyncio.sleep, sehingga banyak upload berbagi sedikit thread.
+    video_id terisi setelah chunk terakhir diterima server.
+
+    progress_callback(percent, info) -> info berisi bytes_sent, total_bytes,
+    chunk_size (bytes) dan throughput (bytes/detik) dari chunk adaptif.
+    chunk_min / chunk_max: batas ukuran chunk dalam bytes (kelipatan 256 KiB).
+    journal: SessionJournal opsional -> session URI & offset disimpan ke disk
+    setiap chunk, sehingga upload yang terputus bisa dilanjutkan.
+    retrier: Retrier untuk error sementara (5xx, jaringan).
+    throttle: callable(nbytes) dari BandwidthLimiter, dipanggil saat data dikirim.
+    telemetry: UploadTelemetry opsional -> latency, bytes & offset tiap chunk dicatat.
+    Thumbnail tidak dipasang di sini (lihat upload_job.apply_thumbnail).
+    """
+
+    def __init__(self, youtube, video_path, body, progress_callback=None, chunk_min=None,
+                 chunk_max=None, journal=None, retrier=None, throttle=None, telemetry=None):
+        self.video_path = video_path
+        self.progress_callback = progress_callback
+        self.journal = journal
+        self.retrier = retrier or Retrier()
+        self.telemetry = telemetry
+        self.video_id = None
+
+        # --- CHUNK ADAPTIF ---
+        # Ukuran chunk diatur ulang setiap chunk selesai berdasarkan throughput
+        # File dibaca lewat mmap: potongan chunk dikirim tanpa copy per blok
+        self.chunker = AdaptiveChunker(chunk_min, chunk_max)
+        self.media = MmapMediaFileUpload(
+            video_path,
+            mimetype="video/*",
+            chunksize=self.chunker.chunk_size,
+            resumable=True,
+            throttle=throttle,
+        )
+
+        self.request = youtube.videos().insert(
+            part="snippet,status",
+            body=body,
+            media_body=self.media,
+        )
+
+        # --- LANJUTKAN SESSION LAMA (JIKA ADA DI JURNAL) ---
+        self.resuming = False
+        session = journal.find(video_path) if journal else None
+        if session:
+            print(f"Melanjutkan upload dari byte {session['offset']}: {video_path}")
+            self.request.resumable_uri = session["session_uri"]
+            # Mode "error state" membuat next_chunk bertanya ke server dulu
+            # (PUT kosong 'bytes */size') lalu lanjut dari offset yang diakui server.
+            # _in_error_state adalah atribut privat HttpRequest googleapiclient
+            # (tidak ada API publik untuk resume lintas proses); versinya dipatok
+            # di requirements.txt -> cek ulang perilaku ini sebelum menaikkan batasnya
+            self.request._in_error_state = True
+            self.resuming = True
+
+    def step(self):
+        self._begin_chunk()
+        try:
+            # Setelah error, next_chunk otomatis menanyakan offset ke server
+            # sehingga retry melanjutkan dari byte yang sudah diakui
+            upload_status, response = self.retrier.call(self.request.next_chunk)
+        except HttpError as e:
+            if self._restart_if_expired(e):
+                return
+            raise
+        self._end_chunk(upload_status, response)
+
+    async def astep(self, run_blocking):
+        """run_blocking: coroutine function (func, *args) -> hasil, mis. AsyncEngine.run_blocking."""
+        self._begin_chunk()
+        try:
+            upload_status, response = await self.retrier.acall(run_blocking, self.request.next_chunk)
+        except HttpError as e:
+            if self._restart_if_expired(e):
+                return
+            raise
+        self._end_chunk(upload_status, response)
+
+    def _begin_chunk(self):
+        self._sent_before = self.request.resumable_progress
+        self._retries_before = self.retrier.retries
+        self._started = time.monotonic()
+
+    def _restart_if_expired(self, error):
+        if not (self.resuming and error.resp.status in (404, 410)):
+            return False
+        # Session sudah kadaluarsa di server -> mulai dari awal
+        print(f"Session lama tidak valid ({error.resp.status}), upload ulang dari awal.")
+        self.journal.remove(self.video_path)
+        self.request.resumable_uri = None
+        self.request.resumable_progress = 0
+        self.request._in_error_state = False   # Atribut privat, lihat catatan di __init__
+        self.resuming = False
+        return True
+
+    def _end_chunk(self, upload_status, response):
+        elapsed = time.monotonic() - self._started
+        sent_before = self._sent_before
+        sent_after = self.media.size() if response is not None else self.request.resumable_progress
+        clean_sample = not self.resuming and self.retrier.retries == self._retries_before
+        if self.telemetry:
+            self.telemetry.record_chunk(sent_after - sent_before, elapsed, sent_after, sample=clean_sample)
+        if not clean_sample:
+            # Chunk setelah resume/retry ikut menghitung offset lama & waktu tunggu,
+            # jangan dijadikan sampel throughput
+            self.resuming = False
+        else:
+            self.media.set_chunksize(self.chunker.update(sent_after - sent_before, elapsed))
+
+        if self.journal:
+            if response is None:
+                self.journal.record(self.video_path, self.request.resumable_uri, self.request.resumable_progress)
+            else:
+                self.journal.remove(self.video_path)
+
+        if upload_status and self.progress_callback:
+            self.progress_callback(int(upload_status.progress() * 100), {
+                "bytes_sent": upload_status.resumable_progress,
+                "total_bytes": upload_status.total_size,
+                "chunk_size": self.chunker.chunk_size,
+                "throughput": self.chunker.throughput,
+                "retries": self.retrier.retries,
+                "backoff_seconds": self.retrier.backoff_seconds,
+            })
+
+        if response is not None:
+            self.media.close()
+            self.video_id = response["id"]
+            if self.retrier.retries:
+                print(f"Upload {self.video_id}: {self.retrier.retries} retry, {self.retrier.backoff_seconds:.1f} detik backoff")
+
+
+def set_thumbnail(youtube, video_id, thumbnail_path, retrier=None):
+    """Langkah setelah insert: pasang thumbnail ke video yang sudah ada."""
+    if retrier is None:
+        retrier = Retrier()
+    return retrier.call(youtube.thumbnails().set(
+        videoId=video_id,
+        media_body=thumbnail_path
+    ).execute)
\ No newline at end of file
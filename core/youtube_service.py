@@ -1,9 +1,95 @@
-from googleapiclient.discovery import build
-
-def get_service(creds):
-    return build(
-        "youtube",
-        "v3",
-        credentials=creds,
-        cache_discovery=False
-    )
+import json
+import threading
+from contextlib import contextmanager
+from functools import partial
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.http import HttpRequest, build_http
+from core.quota import get_quota_ledger
+from core.transport import get_transport_pool, credential_key
+
+_document = None
+_document_lock = threading.Lock()
+_local = threading.local()   # Cache service per thread: (credential_key, project_key, transport_sendiri) -> (http, service)
+
+
+class QuotaTrackedRequest(HttpRequest):
+    """HttpRequest yang mencatat biaya kuota setiap kali dikirim ke API."""
+
+    def __init__(self, project_key, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.project_key = project_key
+
+    def _record_quota(self):
+        get_quota_ledger().record(self.project_key, self.methodId)
+
+    def execute(self, *args, **kwargs):
+        # Upload resumable dicatat di next_chunk (saat session dibuat)
+        if not self.resumable:
+            self._record_quota()
+        return super().execute(*args, **kwargs)
+
+    def next_chunk(self, *args, **kwargs):
+        if self.resumable_uri is None:
+            self._record_quota()
+        return super().next_chunk(*args, **kwargs)
+
+
+def _warm_up(resource, desc):
+    # Membuat semua method sekali: googleapiclient melengkapi parameter di dalam
+    # dokumen (mutasi dict) saat method pertama dibuat. Setelah ini dokumen
+    # aman dipakai bersama oleh banyak thread.
+    for name, child in desc.get("resources", {}).items():
+        _warm_up(getattr(resource, name)(), child)
+
+
+def load_discovery_document():
+    """
+    Dokumen discovery (dict), di-parse sekali per proses. Memakai salinan statis
+    yang dibundel google-api-python-client (tanpa fetch jaringan, jalan offline);
+    diperbarui bersama versi library.
+    """
+    global _document
+    with _document_lock:
+        if _document is None:
+            document = json.loads(get_static_doc("youtube", "v3"))
+            _warm_up(build_from_document(document, http=build_http()), document)
+            _document = document
+        return _document
+
+
+def get_service(creds, project_key=None, http=None):
+    """
+    project_key (client_id project Google Cloud) opsional:
+    jika diisi, semua panggilan API dicatat di QuotaLedger.
+    http: AuthorizedHttp dari TransportPool (koneksi keep-alive dipakai ulang);
+    jika kosong, dipakai transport milik thread ini untuk kredensial tsb.
+    Service di-cache per thread & per kredensial; dibangun dari discovery
+    document yang sudah di-parse (tanpa baca file / jaringan).
+    """
+    cache = getattr(_local, "services", None)
+    if cache is None:
+        cache = _local.services = {}
+    key = (credential_key(creds), project_key, http is None)
+    cached = cache.get(key)
+    if cached and (http is None or cached[0] is http):
+        # Kredensial terbaru (hasil refresh) untuk request berikutnya
+        cached[0].credentials = creds
+        return cached[1]
+
+    if http is None:
+        http = AuthorizedHttp(creds, http=build_http())
+    extra = {}
+    if project_key:
+        extra["requestBuilder"] = partial(QuotaTrackedRequest, project_key)
+    service = build_from_document(load_discovery_document(), http=http, **extra)
+    cache[key] = (http, service)
+    return service
+
+
+@contextmanager
+def leased_service(creds, project_key=None):
+    """Service di atas transport pinjaman dari TransportPool; transport dikembalikan setelah blok selesai."""
+    with get_transport_pool().lease(creds) as http:
+        yield get_service(creds, project_key, http=http)
@@ -1,6 +1,5 @@
 import os
 import random
-import shutil
 import json
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame, QPushButton, 
@@ -13,8 +12,26 @@ from PySide6.QtGui import QColor, QDragEnterEvent, QDropEvent, QAction
 from datetime import datetime, timedelta
 
 from gui.custom_widgets import ScheduleWidget 
-from core.auth_manager import AuthManager, OAuthWorker
-from core.workers import UploadWorker, ChannelInfoWorker
+from core.auth_manager import AuthManager
+from core.workers import FingerprintWorker, get_bridge
+from core.oauth_server import get_oauth_server
+from core.scheduler import get_scheduler, channel_key
+from core.job_store import QUEUED, UPLOADING
+from core.thumbnails import submit_thumbnail
+from core.channel_info import save_stats_cache
+from core.auth_status import get_auth_status_cache
+from core.manifest import import_manifest
+from core.progress_bus import get_progress_bus
+from core.schedule_planner import plan_slots, load_rules as load_schedule_rules
+
+PROGRESS_FPS = 5   # Frekuensi refresh progress upload di UI (frame per detik)
+
+def format_eta(seconds):
+    """Detik -> 'mm:ss' atau 'h:mm:ss'."""
+    seconds = int(seconds)
+    h, rem = divmod(seconds, 3600)
+    m, s = divmod(rem, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m:02d}:{s:02d}"
 
 # ... [BAGIAN STAT CARD & HELPER LAIN TETAP SAMA SEPERTI SEBELUMNYA] ...
 class StatCard(QFrame):
@@ -129,6 +146,9 @@ class UploadRow(QFrame):
         self.parent_layout = parent_layout 
         self.video_path = None
         self.thumb_path = None
+        self.fingerprint = None
+        self.duplicate_reason = None   # Diisi jika file ini sudah pernah diupload / dobel di antrean
+        self.planned_at = None         # Jadwal dari planner yang belum ditulis ke widget (row tidak terlihat)
         self.is_selected = False
         self.setFixedHeight(120)
         self.setContextMenuPolicy(Qt.CustomContextMenu)
@@ -141,6 +161,9 @@ class UploadRow(QFrame):
         self.selected_style = """
             UploadRow { background-color: #2a2a2a; border-bottom: 1px solid #2a2a2a; border-left: 3px solid #cc0000; }
         """
+        self.duplicate_style = """
+            UploadRow { background-color: #2a1a1a; border-bottom: 1px solid #2a2a2a; border-left: 3px solid #ff9800; }
+        """
         self.setStyleSheet(self.default_style)
         layout = QHBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -219,12 +242,22 @@ class UploadRow(QFrame):
 
     def set_selected(self, selected):
         self.is_selected = selected
-        self.setStyleSheet(self.selected_style if selected else self.default_style)
+        if selected:
+            self.setStyleSheet(self.selected_style)
+        else:
+            self.setStyleSheet(self.duplicate_style if self.duplicate_reason else self.default_style)
+
+    def mark_duplicate(self, reason):
+        self.duplicate_reason = reason
+        self.inp_title.setToolTip(f"⚠ {reason}\nSource: {self.video_path}")
+        self.set_selected(self.is_selected)
 
     def select_thumb(self):
         path, _ = QFileDialog.getOpenFileName(self, "Pilih Thumbnail", "", "Images (*.jpg *.png)")
         if path:
             self.thumb_path = path
+            # Resize/encode di background; hasilnya masuk cache untuk dipakai saat upload
+            submit_thumbnail(path)
             self.btn_thumb.setText("✔")
             self.btn_thumb.setStyleSheet("border: none; background: #2ba640; color: white; font-size: 14px; font-weight: bold; border-radius: 4px;")
 
@@ -235,8 +268,24 @@ class UploadRow(QFrame):
         self.inp_title.setText(clean_title)
         self.inp_title.setToolTip(f"Source: {file_path}")
 
+    def apply_planned_schedule(self):
+        if self.planned_at is not None:
+            self.schedule.set_datetime(self.planned_at)
+            self.planned_at = None
+
+    def get_schedule_dt(self):
+        """Datetime jadwal row (jadwal planner yang tertunda diutamakan). None jika tidak valid."""
+        if self.planned_at is not None:
+            return self.planned_at
+        sched = self.schedule.get_scheduled_datetime()
+        try:
+            return datetime.strptime(f"{sched['date']} {sched['time']}", "%Y-%m-%d %H:%M")
+        except ValueError:
+            return None
+
     def get_data(self):
         if not self.video_path: return None
+        self.apply_planned_schedule()
         schedule_info = self.schedule.get_scheduled_datetime()
         return {
             "video_path": self.video_path,
@@ -272,18 +321,19 @@ class VideoDropArea(QScrollArea):
     def dropEvent(self, event: QDropEvent):
         files = [u.toLocalFile() for u in event.mimeData().urls()]
         video_exts = ('.mp4', '.mkv', '.avi', '.mov', '.flv', '.webm')
-        count = 0
-        for f in files:
-            if f.lower().endswith(video_exts):
-                self.page.add_upload_row(file_path=f)
-                count += 1
-        if count > 0: event.acceptProposedAction()
+        videos = [f for f in files if f.lower().endswith(video_exts)]
+        if videos:
+            self.page.add_upload_rows(videos)
+            self.page.check_duplicates(videos)
+            event.acceptProposedAction()
 
     def mousePressEvent(self, event):
         self.page.deselect_all()
         super().mousePressEvent(event)
 
 class ChannelPage(QWidget):
+    auth_status_changed = Signal(str, str, object)   # category, channel_name, entry AuthStatusCache
+
     def __init__(self, category, channel_name, parent=None):
         # [UBAH BARIS INI] Teruskan parent ke super class
         super().__init__(parent) 
@@ -291,11 +341,15 @@ class ChannelPage(QWidget):
         self.category = category
         self.channel_name = channel_name
         self.rng = random.Random(f"{category}_{channel_name}")
-        self.upload_queue = [] 
+        self.active_jobs = {}   # job_id -> judul (job milik channel ini di scheduler global)
+        self.session_total = 0
+        self.session_done = 0
         self.selected_rows = [] 
-        self.info_worker = None
+        self.info_task = None   # Future refresh statistik di AsyncEngine
+        self.fingerprint_workers = []
+        self.plan_anchor = None   # Row terakhir yang jadwalnya diubah user (awal rencana jadwal)
         
-        self.oauth_worker = None
+        self.oauth_state = None   # state flow OAuth yang sedang menunggu callback
         
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(15, 15, 15, 15)
@@ -321,18 +375,79 @@ class ChannelPage(QWidget):
         upload_widget = self.create_upload_widget()
         self.layout.addWidget(upload_widget, 1)
 
+        # Scheduler global: semua channel berbagi slot upload paralel
+        self.scheduler = get_scheduler()
+        self.scheduler.job_started.connect(self.on_job_started)
+        self.scheduler.job_status.connect(self.update_status_ui)
+        self.scheduler.job_finished.connect(self.on_upload_finished)
+        self.scheduler.post_step_finished.connect(self.on_post_step_finished)
+        # Progress dibaca dari ProgressBus per frame, bukan per chunk
+        self.progress_bus = get_progress_bus()
+        self.progress_version = -1
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setInterval(1000 // PROGRESS_FPS)
+        self.progress_timer.timeout.connect(self.refresh_progress)
+        self.adopt_pending_jobs()
+
         self.check_auth_status()
 
+    def channel_key(self):
+        return channel_key(self.category, self.channel_name)
+
+    def adopt_pending_jobs(self):
+        """Tampilkan progres job channel ini yang masih antre dari sesi sebelumnya."""
+        jobs = self.scheduler.store.list_jobs(
+            self.category, self.channel_name, states=[QUEUED, UPLOADING]
+        )
+        if not jobs:
+            return
+        for job in jobs:
+            self.active_jobs[job["id"]] = job["title"]
+        self.start_progress_timer()
+        self.session_total = len(jobs)
+        self.session_done = 0
+        self.btn_action.setEnabled(False)
+        self.btn_action.setStyleSheet("background-color: #555; color: #aaa; border: none;")
+        self.btn_action.setText(f"ANTRI: {self.session_total} VIDEO...")
+
     def update_channel_identity(self, category, new_name):
         self.category = category
         self.channel_name = new_name
         self.check_auth_status()
 
-    def check_auth_status(self):
-        status_text, status_color = AuthManager.check_status(self.category, self.channel_name)
-        paths = AuthManager.get_paths(self.category, self.channel_name)
-        
-        has_secret = os.path.exists(paths["secret"])
+    def check_auth_status(self, force=False):
+        """
+        Tampilkan status auth terakhir (cache) langsung, lalu cek ulang di
+        AsyncEngine jika cache sudah lewat TTL / force. Tidak ada panggilan
+        jaringan di thread GUI.
+        """
+        cache = get_auth_status_cache()
+        cached = cache.get(self.category, self.channel_name)
+        if cached:
+            self.apply_auth_status(cached["text"], cached["color"])
+        else:
+            self.apply_auth_status("Checking...", "gray", load_data=False)
+        if force or not cache.is_fresh(cached):
+            was_connected = bool(cached) and "Connected" in cached["text"]
+            bridge = get_bridge()
+            bridge.run(
+                bridge.engine.auth_status(self.category, self.channel_name),
+                lambda success, result, key=(self.category, self.channel_name), was_connected=was_connected:
+                    self.on_auth_status_done(key, was_connected, success, result),
+            )
+
+    def on_auth_status_done(self, key, was_connected, success, result):
+        if key != (self.category, self.channel_name):
+            return   # Channel sudah di-rename selama pengecekan
+        if not success:
+            print(f"Cek status auth gagal: {result}")
+            return
+        self.auth_status_changed.emit(self.category, self.channel_name, result)
+        # Statistik sudah dimuat dari status cache jika sebelumnya sudah Connected
+        self.apply_auth_status(result["text"], result["color"], load_data=not was_connected)
+
+    def apply_auth_status(self, status_text, status_color, load_data=True):
+        has_secret = AuthManager.has_secret(self.category, self.channel_name)
         is_connected = "Connected" in status_text
 
         # --- A. LOGIKA TOMBOL SECRET ---
@@ -366,7 +481,8 @@ class ChannelPage(QWidget):
                 QPushButton { border: 1px solid #2ba640; color: white; background: #2ba640; font-weight: bold; padding: 4px 10px; font-size: 11px; border-radius: 3px;}
                 QPushButton:disabled { background: #2ba640; color: white; border-color: #2ba640; opacity: 1; }
             """)
-            self.refresh_channel_data()
+            if load_data:
+                self.refresh_channel_data()
         else:
             self.btn_oauth.setText("OAuth Login")
             self.btn_oauth.setEnabled(True)
@@ -390,16 +506,14 @@ class ChannelPage(QWidget):
     # 2. Update Method action_oauth 
     # (Menambah validasi klik jika secret belum ada)
     def action_oauth(self):
-        # 1. Cek keberadaan file
-        paths = AuthManager.get_paths(self.category, self.channel_name)
-        if not os.path.exists(paths["secret"]):
+        # 1. Cek keberadaan secret (file atau credential store)
+        if not AuthManager.has_secret(self.category, self.channel_name):
             QMessageBox.warning(self, "Missing Secret", "File 'client_secret.json' tidak ditemukan!\nSilakan klik 'Add Secret' dulu.")
             return
 
         # 2. [LOGIKA BARU] Validasi Isi File Secret
         try:
-            with open(paths["secret"], "r") as f:
-                content = json.load(f)
+            content = AuthManager.load_client_config(self.category, self.channel_name)
                 
             # Cek apakah file masih dummy (kosong)
             if not content or content == {}:
@@ -430,26 +544,37 @@ class ChannelPage(QWidget):
         self.btn_oauth.setEnabled(False)
         self.btn_oauth.setText("Waiting...")
         
-        # Pastikan Worker dibuat baru setiap kali klik
-        if self.oauth_worker is not None:
-            if self.oauth_worker.isRunning():
-                self.oauth_worker.terminate()
-            self.oauth_worker = None
-
-        self.oauth_worker = OAuthWorker(self.category, self.channel_name)
-        self.oauth_worker.finished.connect(self.on_oauth_finished)
-        self.oauth_worker.auth_url_signal.connect(self.on_auth_url_received)
-        self.oauth_worker.start()
+        # Flow lama (jika ada) dibatalkan; callback dilayani server lokal bersama
+        self.cancel_oauth()
+        try:
+            state, auth_url, future = get_oauth_server().start_flow(self.category, self.channel_name)
+        except Exception as e:
+            self.on_oauth_finished(False, str(e))
+            return
+        self.oauth_state = state
+        get_bridge().watch(future, lambda ok, result: self.on_oauth_done(state, ok, result))
+        self.on_auth_url_received(auth_url)
+
+    def cancel_oauth(self):
+        # state dikosongkan dulu: hasil "Dibatalkan" dari flow ini diabaikan on_oauth_done
+        state, self.oauth_state = self.oauth_state, None
+        if state is not None:
+            get_oauth_server().cancel(state)
+
+    def on_oauth_done(self, state, success, result):
+        # Hasil flow lama (sudah dibatalkan / diganti) diabaikan
+        if state != self.oauth_state:
+            return
+        self.oauth_state = None
+        self.on_oauth_finished(success, "Authorization Successful!" if success else str(result))
 
     def action_add_secret(self):
         path, _ = QFileDialog.getOpenFileName(self, "Pilih client_secret.json", "", "JSON (*.json)")
         if path:
             try:
-                base_dir = os.path.join("channels", self.category, self.channel_name)
-                target_path = os.path.join(base_dir, "client_secret.json")
-                shutil.copy(path, target_path)
+                AuthManager.save_client_secret(self.category, self.channel_name, path)
                 QMessageBox.information(self, "Sukses", "Client Secret berhasil disimpan.\nSilakan klik tombol 'OAuth Login'.")
-                self.check_auth_status()
+                self.check_auth_status(force=True)
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Gagal menyimpan secret: {str(e)}")
 
@@ -496,13 +621,8 @@ class ChannelPage(QWidget):
         if result == QDialog.Rejected:
             print("Login dibatalkan oleh user.")
             
-            # A. Matikan Worker Paksa (Terminate)
-            # Ini penting karena worker sedang blocking menunggu koneksi socket
-            if self.oauth_worker is not None:
-                if self.oauth_worker.isRunning():
-                    self.oauth_worker.terminate()
-                    self.oauth_worker.wait() # Tunggu sampai benar-benar mati
-                self.oauth_worker = None # Bersihkan referensi
+            # A. Batalkan flow di server callback (tanpa thread yang perlu dimatikan)
+            self.cancel_oauth()
 
             # B. Reset Tombol ke Semula
             self.btn_oauth.setText("OAuth Login")
@@ -521,14 +641,10 @@ class ChannelPage(QWidget):
         
         if success:
             QMessageBox.information(self, "Sukses", "Login Berhasil! Token tersimpan.")
-            self.check_auth_status() # Update UI jadi hijau
+            self.check_auth_status(force=True) # Update UI jadi hijau
         else:
             self.btn_oauth.setText("OAuth Login") # Reset teks tombol
             
-            # Jika user membatalkan (menutup dialog), jangan tampilkan error critical
-            if "socket" in str(msg).lower() or "closed" in str(msg).lower():
-                 return # Dianggap cancel
-
             QMessageBox.critical(self, "Gagal", f"Login Gagal:\n{msg}")
 
     def copy_to_clipboard(self, text, btn_sender):
@@ -539,19 +655,23 @@ class ChannelPage(QWidget):
 
     # [TAMBAHKAN METHOD BARU INI]
     def refresh_channel_data(self):
-        # [PENGAMAN] Cek apakah worker sudah ada dan sedang berjalan
-        if self.info_worker is not None and self.info_worker.isRunning():
-            print("Worker sedang berjalan, permintaan refresh diabaikan.")
+        # [PENGAMAN] Cek apakah refresh sebelumnya masih berjalan
+        if self.info_task is not None and not self.info_task.done():
+            print("Refresh sedang berjalan, permintaan refresh diabaikan.")
             return
 
-        # Jika aman, baru jalankan worker baru
-        self.info_worker = ChannelInfoWorker(self.category, self.channel_name)
-        self.info_worker.finished_signal.connect(self.on_channel_data_received)
-        
-        # Bersihkan referensi worker setelah selesai agar memori bersih
-        self.info_worker.finished.connect(lambda: setattr(self, 'info_worker', None))
-        
-        self.info_worker.start()
+        # Coroutine di AsyncEngine (tanpa thread baru); hasil kembali ke thread GUI
+        bridge = get_bridge()
+        self.info_task = bridge.run(
+            bridge.engine.fetch_stats(self.category, self.channel_name),
+            self.on_channel_stats_done,
+        )
+
+    def on_channel_stats_done(self, success, result):
+        if success:
+            self.on_channel_data_received(True, result, "Success")
+        else:
+            self.on_channel_data_received(False, {}, str(result))
 
     def on_channel_data_received(self, success, data, msg):
         # 1. JIKA GAGAL / ERROR
@@ -593,12 +713,7 @@ class ChannelPage(QWidget):
         # [BARU] SIMPAN CACHE UNTUK DASHBOARD
         # =======================================================
         try:
-            cache_dir = os.path.join("channels", self.category, self.channel_name)
-            if not os.path.exists(cache_dir):
-                os.makedirs(cache_dir)
-                
-            with open(os.path.join(cache_dir, "stats.json"), "w") as f:
-                json.dump(data, f)
+            save_stats_cache(self.category, self.channel_name, data)
         except Exception as e:
             print(f"Gagal menyimpan cache stats: {e}")
         # =======================================================
@@ -772,6 +887,8 @@ class ChannelPage(QWidget):
         self.rows_layout.setContentsMargins(0,0,0,0)
         self.rows_layout.setAlignment(Qt.AlignTop)
         self.scroll.setWidget(content_widget)
+        self.scroll.verticalScrollBar().valueChanged.connect(self.apply_visible_schedules)
+        self.scroll.verticalScrollBar().rangeChanged.connect(self.apply_visible_schedules)
         l.addWidget(self.scroll)
 
         footer = QFrame()
@@ -786,6 +903,13 @@ class ChannelPage(QWidget):
         self.btn_import.clicked.connect(self.browse_videos)
         fl.addWidget(self.btn_import)
 
+        self.btn_manifest = QPushButton("Import Manifest")
+        self.btn_manifest.setFixedWidth(120)
+        self.btn_manifest.setToolTip("CSV / JSONL: path, title, description, tags, thumbnail, schedule, channel")
+        self.btn_manifest.setStyleSheet("background: #333; color: #aaa; border: 1px solid #444;")
+        self.btn_manifest.clicked.connect(self.import_manifest_file)
+        fl.addWidget(self.btn_manifest)
+
         self.btn_del_selected = QPushButton("Hapus Terpilih")
         self.btn_del_selected.setFixedWidth(120)
         self.btn_del_selected.setCursor(Qt.PointingHandCursor)
@@ -807,109 +931,142 @@ class ChannelPage(QWidget):
 
     def browse_videos(self):
         files, _ = QFileDialog.getOpenFileNames(self, "Pilih Video", "", "Video Files (*.mp4 *.mkv *.avi *.mov *.flv *.webm)")
-        for f in files:
-            self.add_upload_row(f)
-
-    def add_upload_row(self, file_path=None):
-        row = UploadRow(self.rows_layout)
-        row.clicked.connect(self.handle_row_click)
-        row.deleted.connect(self.on_row_deleted)
-        self.rows_layout.addWidget(row)
-
-        # ===== SMART SCHEDULE WINDOW =====
-        anchor_dt = self.get_last_schedule_anchor()
-        if anchor_dt:
-            # Set tanggal sama
-            row.schedule.date_btn.current_date = QDate(
-                anchor_dt.year, anchor_dt.month, anchor_dt.day
-            )
-            row.schedule.date_btn.setText(
-                row.schedule.date_btn.current_date.toString("yyyy-MM-dd")
-            )
-
-            # Set time window (min = anchor time)
-            row.schedule.populate_times(start_time=anchor_dt.time())
-
-            # Default select = anchor time
-            anchor_time_str = anchor_dt.strftime("%H:%M")
-            idx = row.schedule.time_combo.findText(anchor_time_str)
-            if idx >= 0:
-                row.schedule.time_combo.setCurrentIndex(idx)
-
-        if file_path:
-            row.set_file_data(file_path)
+        if files:
+            self.add_upload_rows(files)
+            self.check_duplicates(files)
+
+    def import_manifest_file(self):
+        """Import manifest langsung ke antrean (tanpa membuat UploadRow per video)."""
+        path, _ = QFileDialog.getOpenFileName(self, "Pilih Manifest", "", "Manifest (*.csv *.jsonl *.ndjson)")
+        if not path:
+            return
+        self.btn_manifest.setEnabled(False)
+        self.btn_manifest.setText("Mengimport...")
+        bridge = get_bridge()
+        # Baris tanpa kolom channel masuk ke channel ini; tiap batch langsung diantrekan
+        on_batch = lambda items: bridge.post(self.on_manifest_batch, items)
+        bridge.run(
+            bridge.engine.run_blocking(
+                import_manifest, path, self.scheduler.store, (self.category, self.channel_name), on_batch
+            ),
+            self.on_manifest_imported,
+        )
+
+    def on_manifest_batch(self, items):
+        own = [job_id for key, job_id in items if key == self.channel_key()]
+        for job_id in own:
+            self.active_jobs[job_id] = ""   # Judul diisi saat job mulai
+        if own:
+            self.start_progress_timer()
+            if self.btn_action.isEnabled():
+                # Belum ada sesi upload berjalan -> mulai hitungan baru
+                self.session_total = self.session_done = 0
+            self.session_total += len(own)
+            self.btn_action.setEnabled(False)
+            self.btn_action.setStyleSheet("background-color: #555; color: #aaa; border: none;")
+            self.btn_action.setText(f"ANTRI: {self.session_total} VIDEO...")
+        self.scheduler.enqueue_existing(items)
+
+    def on_manifest_imported(self, success, result):
+        self.btn_manifest.setEnabled(True)
+        self.btn_manifest.setText("Import Manifest")
+        if not success:
+            QMessageBox.critical(self, "Import Gagal", f"Manifest tidak bisa dibaca:\n{result}")
+            return
 
-    def on_row_schedule_changed(self, changed_row):
+        lines = [f"{result['imported']} video masuk antrean."]
+        lines += [f"  • {key}: {count}" for key, count in sorted(result["channels"].items())]
+        if result["errors"]:
+            lines.append(f"\n{len(result['errors'])} baris dilewati:")
+            lines += [f"  baris {line_no}: {msg}" for line_no, msg in result["errors"][:15]]
+            if len(result["errors"]) > 15:
+                lines.append(f"  ... dan {len(result['errors']) - 15} lainnya")
+        QMessageBox.information(self, "Import Manifest", "\n".join(lines))
+
+    def check_duplicates(self, paths):
+        """Hash file di background, lalu tandai row yang sudah pernah diupload / dobel."""
+        worker = FingerprintWorker(self.category, self.channel_name, paths)
+        worker.result_signal.connect(self.on_fingerprint_result)
+        worker.finished.connect(lambda w=worker: self.fingerprint_workers.remove(w))
+        self.fingerprint_workers.append(worker)
+        worker.start()
+
+    def on_fingerprint_result(self, path, fingerprint, previous):
+        rows = self.get_upload_rows()
+        for row in rows:
+            if row.video_path != path or row.fingerprint is not None:
+                continue
+            row.fingerprint = fingerprint
+            if previous:
+                row.mark_duplicate(f"Sudah pernah diupload: https://youtu.be/{previous['video_id']}")
+            elif any(r is not row and r.fingerprint == fingerprint and not r.duplicate_reason for r in rows):
+                row.mark_duplicate("Video yang sama sudah ada di antrean")
+
+    def get_upload_rows(self):
         rows = []
         for i in range(self.rows_layout.count()):
             w = self.rows_layout.itemAt(i).widget()
             if isinstance(w, UploadRow):
                 rows.append(w)
+        return rows
 
-        if changed_row not in rows:
-            return
-
-        idx = rows.index(changed_row)
-
-        try:
-            sched = changed_row.schedule.get_scheduled_datetime()
-            anchor_dt = datetime.strptime(
-                f"{sched['date']} {sched['time']}",
-                "%Y-%m-%d %H:%M"
-            )
-        except Exception:
+    def add_upload_rows(self, file_paths):
+        """Tambah satu row per file; jadwal semua row baru direncanakan sekali per batch."""
+        if not file_paths:
             return
+        rows = self.get_upload_rows()
+        new_rows = []
+        for _ in file_paths:
+            row = UploadRow(self.rows_layout)
+            row.clicked.connect(self.handle_row_click)
+            row.deleted.connect(self.on_row_deleted)
+            self.rows_layout.addWidget(row)
+            new_rows.append(row)
 
-        anchor_qdate = QDate(anchor_dt.year, anchor_dt.month, anchor_dt.day)
-
-        for next_row in rows[idx + 1:]:
-            # === 1. KUNCI MINIMUM DATE ===
-            next_row.schedule.date_btn.calendar.setMinimumDate(anchor_qdate)
-
-            # === 2. JIKA DATE LEBIH KECIL → PAKSA SAMA ===
-            if next_row.schedule.date_btn.current_date < anchor_qdate:
-                next_row.schedule.date_btn.current_date = anchor_qdate
-                next_row.schedule.date_btn.setText(
-                    anchor_qdate.toString("yyyy-MM-dd")
-                )
-
-            # === 3. KUNCI JAM (TETAP SEPERTI SEBELUMNYA) ===
-            next_row.schedule.populate_times(start_time=anchor_dt.time())
-
-            # Default jam = anchor time
-            t_str = anchor_dt.strftime("%H:%M")
-            idx_time = next_row.schedule.time_combo.findText(t_str)
-            if idx_time >= 0:
-                next_row.schedule.time_combo.setCurrentIndex(idx_time)
+        # ===== SMART SCHEDULE WINDOW =====
+        # Row baru = slot-slot berikutnya dari rencana yang sedang berjalan
+        all_rows = rows + new_rows
+        anchor = self.plan_anchor if self.plan_anchor in rows else all_rows[0]
+        anchor_dt = anchor.get_schedule_dt()
+        if anchor_dt:
+            start = all_rows.index(anchor)
+            slots = plan_slots(anchor_dt, len(all_rows) - start, self.get_schedule_rules())
+            for i, row in enumerate(all_rows[len(rows):], len(rows)):
+                if row is not anchor:
+                    row.schedule.set_datetime(slots[i - start])
 
+        for row, file_path in zip(new_rows, file_paths):
+            row.set_file_data(file_path)
 
+    def get_schedule_rules(self):
+        return load_schedule_rules(self.category, self.channel_name)
 
-    def get_last_schedule_anchor(self):
+    def on_row_schedule_changed(self, changed_row):
         """
-        Ambil datetime schedule dari row terakhir
+        Row diubah user -> semua row sesudahnya dijadwalkan ulang sekaligus oleh
+        planner. Widget hanya ditulis untuk row yang terlihat; sisanya disimpan
+        di row.planned_at dan diterapkan saat di-scroll / saat get_data().
         """
-        cnt = self.rows_layout.count()
-        if cnt == 0:
-            return None
-
-        last_item = self.rows_layout.itemAt(cnt - 1)
-        if not last_item:
-            return None
-
-        last_row = last_item.widget()
-        if not isinstance(last_row, UploadRow):
-            return None
+        rows = self.get_upload_rows()
+        if changed_row not in rows:
+            return
+        changed_row.planned_at = None
+        anchor_dt = changed_row.get_schedule_dt()
+        if anchor_dt is None:
+            return
 
-        sched = last_row.schedule.get_scheduled_datetime()
-        try:
-            dt = datetime.strptime(
-                f"{sched['date']} {sched['time']}",
-                "%Y-%m-%d %H:%M"
-            )
-            return dt
-        except Exception:
-            return None
+        self.plan_anchor = changed_row
+        idx = rows.index(changed_row)
+        slots = plan_slots(anchor_dt, len(rows) - idx, self.get_schedule_rules())
+        for next_row, slot in zip(rows[idx + 1:], slots[1:]):
+            next_row.planned_at = slot
+        self.apply_visible_schedules()
 
+    def apply_visible_schedules(self, *_):
+        viewport = self.scroll.viewport().rect().translated(0, self.scroll.verticalScrollBar().value())
+        for row in self.get_upload_rows():
+            if row.planned_at is not None and row.geometry().intersects(viewport):
+                row.apply_planned_schedule()
 
     def get_next_schedule(self):
         """
@@ -982,64 +1139,115 @@ class ChannelPage(QWidget):
             self.update_delete_button()
 
     def start_upload_queue(self):
-        self.upload_queue = []
-        cnt = self.rows_layout.count()
-        for i in range(cnt):
-            item = self.rows_layout.itemAt(i)
-            if item:
-                widget = item.widget()
-                if isinstance(widget, UploadRow):
-                    data = widget.get_data()
-                    if data:
-                        self.upload_queue.append(data)
-        if not self.upload_queue:
+        queue = []
+        skipped = 0
+        for widget in self.get_upload_rows():
+            if widget.duplicate_reason:
+                skipped += 1
+                continue
+            data = widget.get_data()
+            if data:
+                queue.append(data)
+        if skipped:
+            QMessageBox.information(self, "Duplikat Dilewati", f"{skipped} video dilewati karena duplikat (lihat tooltip judul).")
+        if not queue:
             QMessageBox.warning(self, "Antrean Kosong", "Tidak ada video valid untuk diupload.")
             return
         self.btn_action.setEnabled(False)
         self.btn_action.setStyleSheet("background-color: #555; color: #aaa; border: none;")
-        self.process_next_in_queue()
+        self.session_total = len(queue)
+        self.session_done = 0
+        self.btn_action.setText(f"ANTRI: {self.session_total} VIDEO...")
+
+        # Serahkan ke scheduler global (round-robin antar channel)
+        for data in queue:
+            job_id = self.scheduler.submit(self.category, self.channel_name, data)
+            self.active_jobs[job_id] = data['title']
+        self.start_progress_timer()
+
+    def start_progress_timer(self):
+        # Dipanggil setiap active_jobs mulai berisi (submit, manifest, job sesi lalu)
+        if not self.progress_timer.isActive():
+            self.progress_timer.start()
+
+    def on_job_started(self, key, job_id, title):
+        if key != self.channel_key() or job_id not in self.active_jobs:
+            return
+        self.active_jobs[job_id] = title
+        self.btn_action.setText(f"UPLOADING: {title[:15]}...")
+        self.start_progress_timer()
 
-    def process_next_in_queue(self):
-        if not self.upload_queue:
-            self.finish_upload_session()
+    def refresh_progress(self):
+        """Dipanggil timer (PROGRESS_FPS): ambil snapshot ProgressBus & update tombol sekali."""
+        if not self.isVisible() or self.progress_bus.version == self.progress_version:
+            return
+        self.progress_version = self.progress_bus.version
+        jobs = self.progress_bus.snapshot(self.channel_key())
+        if not jobs:
             return
-        current_data = self.upload_queue.pop(0)
-        self.current_processing_title = current_data['title']
-        self.btn_action.setText(f"UPLOADING: {self.current_processing_title[:15]}...")
-        self.worker = UploadWorker(self.category, self.channel_name, current_data)
-        self.worker.progress_signal.connect(self.update_progress_ui)
-        self.worker.status_signal.connect(self.update_status_ui)
-        self.worker.finished_signal.connect(self.on_upload_finished)
-        self.worker.start()
 
-    def update_progress_ui(self, percent):
-        self.btn_action.setText(f"UPLOADING {percent}% - {self.current_processing_title[:10]}...")
+        totals = self.progress_bus.totals(self.channel_key())
+        rate = totals["rate"]
+        percent = int(totals["bytes_sent"] * 100 / totals["total_bytes"]) if totals["total_bytes"] else 0
+        eta = format_eta(totals["eta"]) if totals["eta"] is not None else "--:--"
+        position = f"{self.session_done + 1}/{self.session_total}"
+        title = next(iter(jobs.values()))["title"]
+        self.btn_action.setText(f"UPLOADING {position} {percent}% ({rate / (1024 * 1024):.1f} MB/s, ETA {eta}) - {title[:10]}...")
+
+        lines = []
+        for snap in jobs.values():
+            info = snap["info"]
+            lines.append(
+                f"{snap['title'][:25]}: {snap['percent']}% | {snap['rate'] / (1024 * 1024):.2f} MB/s | "
+                f"ETA {format_eta(snap['eta']) if snap['eta'] is not None else '--:--'} | "
+                f"Chunk: {info.get('chunk_size', 0) // 1024} KiB | "
+                f"Retry: {info.get('retries', 0)} ({info.get('backoff_seconds', 0):.0f}s backoff)"
+            )
+        self.btn_action.setToolTip("\n".join(lines))
 
-    def update_status_ui(self, status_text): pass 
+    def update_status_ui(self, key, job_id, status_text):
+        if key != self.channel_key() or job_id not in self.active_jobs:
+            return
+        if status_text.startswith("Ditahan"):
+            # Job ditahan scheduler (kuota/daily_limit), tampilkan agar user tahu
+            self.btn_action.setText(status_text[:40].upper())
+        self.btn_action.setToolTip(status_text)
+
+    def on_upload_finished(self, key, job_id, success, msg):
+        if key != self.channel_key() or job_id not in self.active_jobs:
+            return
+        title = self.active_jobs.pop(job_id)
+        self.session_done += 1
 
-    def on_upload_finished(self, success, msg):
         # Logika "Silent Notification" untuk Multitasking
-        
         if success:
-            # Jika sukses, lanjut ke antrean berikutnya
             # Kita tidak perlu popup mengganggu setiap satu video selesai
             print(f"[{self.channel_name}] Sukses: {msg}")
-            self.process_next_in_queue()
         else:
             # Jika Error, baru kita putuskan apakah perlu Popup
             if self.isVisible():
                 # Jika user sedang melihat halaman ini, tampilkan Popup
-                QMessageBox.critical(self, "Upload Gagal", f"Gagal mengupload {self.current_processing_title}:\n{msg}")
+                QMessageBox.critical(self, "Upload Gagal", f"Gagal mengupload {title}:\n{msg}")
             else:
                 # Jika user sedang di channel lain, jangan ganggu!
                 # Cukup ubah tombol jadi merah sebagai tanda
-                self.btn_action.setText(f"ERROR: {self.current_processing_title[:10]}...")
+                self.btn_action.setText(f"ERROR: {title[:10]}...")
                 self.btn_action.setStyleSheet("background: #cc0000; color: white;")
-                
-            # Lanjut (atau stop tergantung kebijakan, di sini kita coba lanjut)
-            self.process_next_in_queue()
+
+        # Scheduler otomatis lanjut ke antrean berikutnya
+        if not self.active_jobs:
+            self.finish_upload_session()
+
+    def on_post_step_finished(self, key, job_id, success, msg):
+        if key != self.channel_key():
+            return
+        # Thumbnail diproses terpisah; cukup catat, jangan ganggu dengan popup
+        print(f"[{self.channel_name}] {msg}")
+        if not success:
+            self.btn_action.setToolTip(msg)
 
     def finish_upload_session(self):
+        self.progress_timer.stop()
         self.btn_action.setText("SEMUA SELESAI! ✔")
         self.btn_action.setStyleSheet("background-color: #2ba640; color: white; border: none;")
         
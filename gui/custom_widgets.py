@@ -246,6 +246,20 @@ class ScheduleWidget(QFrame):
                 self.time_combo.addItem(t)
 
 
+    def set_datetime(self, dt):
+        """Set tanggal & jam tanpa memicu scheduleChanged (dipakai planner jadwal)."""
+        self.blockSignals(True)
+        self.time_combo.blockSignals(True)
+        try:
+            self.date_btn.current_date = QDate(dt.year, dt.month, dt.day)
+            self.date_btn.setText(self.date_btn.current_date.toString("yyyy-MM-dd"))
+            idx = self.time_combo.findText(dt.strftime("%H:%M"))
+            if idx >= 0:
+                self.time_combo.setCurrentIndex(idx)
+        finally:
+            self.time_combo.blockSignals(False)
+            self.blockSignals(False)
+
     def get_scheduled_datetime(self):
         return {
             "date": self.date_btn.get_date_str(),
@@ -1,12 +1,14 @@
 import os
 import json
+from datetime import datetime
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame, 
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame, QPushButton,
     QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QFont, QColor
 from utils import get_channel_structure
+from core.auth_status import get_auth_status_cache
 
 class StatCard(QFrame):
     def __init__(self, title, value, color_hex):
@@ -28,6 +30,8 @@ class StatCard(QFrame):
             labels[1].setText(new_value)
 
 class Dashboard(QWidget):
+    auth_scan_requested = Signal()
+
     def __init__(self):
         super().__init__()
         layout = QVBoxLayout(self)
@@ -45,14 +49,29 @@ class Dashboard(QWidget):
         stats_layout.addWidget(self.card_channels)
         layout.addLayout(stats_layout)
 
-        # 2. Table Label
+        # 2. Table Label + Scan Auth
+        table_header = QHBoxLayout()
         lbl_table = QLabel("Ringkasan Channel")
         lbl_table.setStyleSheet("font-size: 18px; font-weight: bold; margin-top: 10px; color: #ffffff;")
-        layout.addWidget(lbl_table)
+        table_header.addWidget(lbl_table)
+        table_header.addStretch()
+        self.lbl_auth_scan = QLabel("")
+        self.lbl_auth_scan.setStyleSheet("color: #888; font-size: 11px; margin-top: 10px;")
+        table_header.addWidget(self.lbl_auth_scan)
+        self.btn_auth_scan = QPushButton("Scan Auth")
+        self.btn_auth_scan.setCursor(Qt.PointingHandCursor)
+        self.btn_auth_scan.setStyleSheet("""
+            QPushButton { background: #333; color: #ddd; border: 1px solid #444; border-radius: 4px; padding: 6px 14px; margin-top: 10px; }
+            QPushButton:hover { border-color: #cc0000; color: white; }
+            QPushButton:disabled { color: #777; }
+        """)
+        self.btn_auth_scan.clicked.connect(self.auth_scan_requested.emit)
+        table_header.addWidget(self.btn_auth_scan)
+        layout.addLayout(table_header)
 
         # 3. Channel Table (Updated)
-        self.table = QTableWidget(0, 4)
-        self.table.setHorizontalHeaderLabels(["NAMA CHANNEL", "SUBSCRIBERS", "TOTAL VIEWS", "JUMLAH VIDEO"])
+        self.table = QTableWidget(0, 5)
+        self.table.setHorizontalHeaderLabels(["NAMA CHANNEL", "SUBSCRIBERS", "TOTAL VIEWS", "JUMLAH VIDEO", "STATUS AUTH"])
         
         # Konfigurasi Header & Ukuran
         header = self.table.horizontalHeader()
@@ -60,6 +79,7 @@ class Dashboard(QWidget):
         header.setSectionResizeMode(1, QHeaderView.ResizeToContents)
         header.setSectionResizeMode(2, QHeaderView.ResizeToContents)
         header.setSectionResizeMode(3, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(4, QHeaderView.ResizeToContents)
         header.setDefaultAlignment(Qt.AlignLeft | Qt.AlignVCenter)
         
         # Styling Table agar lebih "Clean" dan Tinggi
@@ -103,9 +123,18 @@ class Dashboard(QWidget):
         self.refresh_data()
         super().showEvent(event)
 
+    def set_scan_running(self, running):
+        self.btn_auth_scan.setEnabled(not running)
+        self.btn_auth_scan.setText("Scanning..." if running else "Scan Auth")
+
     def refresh_data(self):
         self.table.setRowCount(0)
         structure = get_channel_structure()
+        auth_cache = get_auth_status_cache()
+        last_checked = auth_cache.last_checked()
+        self.lbl_auth_scan.setText(
+            f"Auth dicek {datetime.fromtimestamp(last_checked).strftime('%d-%m %H:%M')}" if last_checked else ""
+        )
         
         total_subs_count = 0
         total_channels_count = 0
@@ -179,6 +208,14 @@ class Dashboard(QWidget):
                 item_vids.setForeground(QColor("#888888")) # Warna agak redup
                 item_vids.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
                 self.table.setItem(row, 3, item_vids)
+
+                # Col 4: Status Auth (hasil scan terakhir, dari cache)
+                auth = auth_cache.get(category, channel_name)
+                item_auth = QTableWidgetItem(auth["text"] if auth else "Belum dicek")
+                item_auth.setFont(font_normal)
+                item_auth.setForeground(QColor(auth["color"] if auth else "#666666"))
+                item_auth.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+                self.table.setItem(row, 4, item_auth)
         
         # Update Kartu Atas
         self.card_subs.update_value(self.format_number(total_subs_count))
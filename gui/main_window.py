@@ -13,6 +13,9 @@ from gui.channel_page import ChannelPage
 from gui.styles import GLOBAL_STYLESHEET
 from utils import get_channel_structure, create_new_channel, create_category 
 from gui.animations import PageAnimator
+from core.credentials import get_credential_manager
+from core.scheduler import get_scheduler
+from core.workers import get_bridge
 
 class AddChannelDialog(QDialog):
     def __init__(self, categories, parent=None):
@@ -109,6 +112,7 @@ class MainWindow(QMainWindow):
         content_layout.addWidget(self.stack)
 
         self.dashboard_view = Dashboard()
+        self.dashboard_view.auth_scan_requested.connect(self.start_auth_scan)
         self.stack.addWidget(self.dashboard_view)
         
         self.channel_views = {} 
@@ -121,6 +125,45 @@ class MainWindow(QMainWindow):
         
         self.refresh_sidebar()
 
+        # Lanjutkan antrean upload yang tersimpan dari sesi sebelumnya
+        self.scheduler = get_scheduler()
+        self.scheduler.resume_backlog()
+
+        # Thread refresh token latar dihentikan saat aplikasi ditutup
+        QApplication.instance().aboutToQuit.connect(get_credential_manager().stop)
+
+        # Scan status auth semua channel di latar (hasil muncul bertahap di sidebar)
+        self.auth_scan = None
+        self.start_auth_scan()
+
+    def start_auth_scan(self):
+        if self.auth_scan is not None and not self.auth_scan.done():
+            return
+        channels = [
+            (category, channel_name)
+            for category, names in get_channel_structure().items()
+            for channel_name in names
+        ]
+        bridge = get_bridge()
+        self.dashboard_view.set_scan_running(True)
+        self.auth_scan = bridge.run(
+            bridge.engine.scan_auth(
+                channels,
+                on_result=lambda category, channel_name, entry: bridge.post(self.on_auth_status, category, channel_name, entry),
+            ),
+            self.on_auth_scan_done,
+        )
+
+    def on_auth_status(self, category, channel_name, entry):
+        self.sidebar.set_auth_status(category, channel_name, entry)
+
+    def on_auth_scan_done(self, success, result):
+        self.dashboard_view.set_scan_running(False)
+        if not success:
+            print(f"Scan auth gagal: {result}")
+        if self.dashboard_view.isVisible():
+            self.dashboard_view.refresh_data()
+
     # [DIHAPUS] def update_top_bar_auth_status() -> Sudah pindah logic-nya ke ChannelPage
 
     def refresh_sidebar(self):
@@ -162,6 +205,7 @@ class MainWindow(QMainWindow):
                 cat_name, chan_name = identifier.split("/", 1)
                 # Berikan parent self.stack agar lifetime ter-manage
                 page = ChannelPage(cat_name, chan_name, parent=self.stack) 
+                page.auth_status_changed.connect(self.on_auth_status)
                 self.channel_views[identifier] = page
             
             target_widget = self.channel_views[identifier]
@@ -220,6 +264,7 @@ class MainWindow(QMainWindow):
     def handle_channel_renamed(self, category, old_name, new_name):
         old_id = f"{category}/{old_name}"
         new_id = f"{category}/{new_name}"
+        self.scheduler.rename_channel(category, old_name, new_name)
         
         if old_id in self.channel_views:
             page = self.channel_views.pop(old_id)
@@ -230,12 +275,14 @@ class MainWindow(QMainWindow):
             self.lbl_page_title.setText(new_id)
 
     def handle_category_renamed(self, old_name, new_name):
+        self.scheduler.rename_category(old_name, new_name)
         self.refresh_sidebar()
         self.navigate("global", "Dashboard Portofolio")
         self.channel_views = {}
         QMessageBox.information(self, "Sukses", f"Kategori berhasil diubah: {new_name}")
 
-    def handle_channel_deleted(self, channel_name):
+    def handle_channel_deleted(self, category, channel_name):
+        self.scheduler.remove_channel(category, channel_name or None)
         self.refresh_sidebar()
         self.navigate("global", "Dashboard Portofolio")
         self.channel_views = {}
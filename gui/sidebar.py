@@ -1,12 +1,14 @@
 import sys
+from datetime import datetime
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QPushButton, QFrame, QMenu, 
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFrame, QMenu, 
     QMessageBox, QInputDialog, QScrollArea, QSizePolicy
 )
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QAction, QFont, QCursor
 from PySide6.QtWidgets import QWidget
 from utils import rename_channel_folder, delete_channel_folder, delete_category_folder, rename_category_folder
+from core.auth_status import get_auth_status_cache
 
 # =============================================================================
 # COLOR PALETTE (Dark Muted Tints)
@@ -39,10 +41,28 @@ class ChannelBtn(QPushButton):
         # Connect signals
         self.clicked.connect(self.on_click)
         self.customContextMenuRequested.connect(self.on_context_menu)
+
+        # Titik status auth di kanan tombol (dari cache scan, tanpa cek ke jaringan)
+        dot_layout = QHBoxLayout(self)
+        dot_layout.setContentsMargins(0, 0, 10, 0)
+        dot_layout.addStretch()
+        self.auth_dot = QLabel("●")
+        self.auth_dot.setAttribute(Qt.WA_TransparentForMouseEvents)
+        dot_layout.addWidget(self.auth_dot)
+        self.set_auth_status(get_auth_status_cache().get(category, text))
         
         # Initial Style
         self.update_style(False)
 
+    def set_auth_status(self, entry):
+        if not entry:
+            self.auth_dot.setStyleSheet("color: #444; background: transparent; font-size: 10px;")
+            self.setToolTip("Status auth belum dicek")
+            return
+        self.auth_dot.setStyleSheet(f"color: {entry['color']}; background: transparent; font-size: 10px;")
+        checked = datetime.fromtimestamp(entry["checked_at"]).strftime("%d-%m %H:%M")
+        self.setToolTip(f"{entry['text']} (dicek {checked})")
+
     def update_style(self, active):
         if active:
             self.setStyleSheet("""
@@ -171,7 +191,7 @@ class Sidebar(QWidget):
     add_channel_clicked = Signal()
     add_category_clicked = Signal() 
     channel_renamed = Signal(str, str, str) # category, old, new
-    channel_deleted = Signal(str)      
+    channel_deleted = Signal(str, str) # category, channel_name ("" = seluruh kategori)
     category_renamed = Signal(str, str) # old_name, new_name
     
     
@@ -303,6 +323,12 @@ class Sidebar(QWidget):
         full_id = f"{btn.category}/{btn.channel_name}"
         self.selection_changed.emit("channel", full_id, btn)
 
+    def set_auth_status(self, category_name, channel_name, entry):
+        for btn in self.channel_btns:
+            if btn.category == category_name and btn.channel_name == channel_name:
+                btn.set_auth_status(entry)
+                return
+
     def select_channel(self, category_name, channel_name):
         for btn in self.channel_btns:
             if btn.category == category_name and btn.channel_name == channel_name:
@@ -374,7 +400,7 @@ class Sidebar(QWidget):
         if res == QMessageBox.Yes:
             try:
                 delete_channel_folder(btn.category, btn.channel_name)
-                self.channel_deleted.emit(btn.channel_name)
+                self.channel_deleted.emit(btn.category, btn.channel_name)
             except Exception as e:
                 QMessageBox.critical(self, "Error", str(e))
 
@@ -383,6 +409,6 @@ class Sidebar(QWidget):
         if res == QMessageBox.Yes:
             try:
                 delete_category_folder(group.category_name)
-                self.channel_deleted.emit("CAT_DEL")
+                self.channel_deleted.emit(group.category_name, "")
             except Exception as e:
                 QMessageBox.critical(self, "Error", str(e))
\ No newline at end of file
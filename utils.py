@@ -63,6 +63,30 @@ def create_new_channel(category_name, channel_name, source_client_secret):
         
     return channel_path
 
+def _credential_store():
+    # Credential store gabungan (opsional) ikut di-rename/hapus bersama foldernya
+    from core.token_store import get_credential_store
+    return get_credential_store()
+
+def _forget_channel(category, channel_name=None):
+    # Kredensial & status auth di memori masih memakai nama lama -> buang
+    # (channel_name None = semua channel di kategori)
+    from core.credentials import get_credential_manager
+    from core.auth_status import get_auth_status_cache
+    get_credential_manager().forget(category, channel_name)
+    cache = get_auth_status_cache()
+    cache.forget(category, channel_name)
+    cache.save()
+
+def _ensure_not_uploading(category, channel_name=None):
+    # Upload yang sedang jalan menulis jurnal session & index fingerprint di
+    # folder channel -> folder tidak boleh dipindah sampai upload selesai
+    # (JobStore dipakai bersama, jadi upload dari `core.cli run` ikut terhitung)
+    from core.job_store import get_job_store, UPLOADING
+    if get_job_store().list_jobs(category, channel_name, states=[UPLOADING], limit=1):
+        target = f"Channel '{channel_name}'" if channel_name else f"Kategori '{category}'"
+        raise RuntimeError(f"{target} sedang mengupload. Tunggu upload selesai sebelum rename.")
+
 def rename_channel_folder(category, old_name, new_name):
     base = os.path.join(BASE_CHANNELS_DIR, category)
     old_path = os.path.join(base, old_name)
@@ -72,14 +96,23 @@ def rename_channel_folder(category, old_name, new_name):
         raise FileNotFoundError("Channel lama tidak ditemukan.")
     if os.path.exists(new_path):
         raise FileExistsError("Nama channel sudah digunakan.")
+    _ensure_not_uploading(category, old_name)
         
     os.rename(old_path, new_path)
+    store = _credential_store()
+    if store is not None:
+        store.rename_channel(category, old_name, new_name)
+    _forget_channel(category, old_name)
     return new_path
 
 def delete_channel_folder(category, channel_name):
     path = os.path.join(BASE_CHANNELS_DIR, category, channel_name)
     if os.path.exists(path):
         shutil.rmtree(path)
+        store = _credential_store()
+        if store is not None:
+            store.delete_channel(category, channel_name)
+        _forget_channel(category, channel_name)
     else:
         raise FileNotFoundError("Channel tidak ditemukan.")
 
@@ -88,6 +121,10 @@ def delete_category_folder(category):
     path = os.path.join(BASE_CHANNELS_DIR, category)
     if os.path.exists(path):
         shutil.rmtree(path)
+        store = _credential_store()
+        if store is not None:
+            store.delete_category(category)
+        _forget_channel(category)
         
         # [TAMBAHKAN INI DI BAGIAN BAWAH utils.py]
 
@@ -99,6 +136,85 @@ def rename_category_folder(old_name, new_name):
         raise FileNotFoundError("Kategori lama tidak ditemukan.")
     if os.path.exists(new_path):
         raise FileExistsError("Nama kategori sudah digunakan.")
+    _ensure_not_uploading(old_name)
         
     os.rename(old_path, new_path)
-    return new_path
\ No newline at end of file
+    store = _credential_store()
+    if store is not None:
+        store.rename_category(old_name, new_name)
+    _forget_channel(old_name)
+    return new_path
+
+# =============================================================================
+# KONFIGURASI APLIKASI & CHANNEL
+# =============================================================================
+APP_SETTINGS_FILE = "settings.json"
+
+DEFAULT_APP_SETTINGS = {
+    "max_parallel_uploads": 3,      # Batas upload bersamaan (semua channel)
+    "max_uploads_per_channel": 1,   # Batas upload bersamaan per channel
+    "bandwidth_limit_mbps": 0,      # Batas bandwidth upload global (0 = tanpa batas)
+    "channel_bandwidth_mbps": {},   # {"Kategori/Channel": mbps}
+    "bandwidth_schedule": [],       # [{"start": "22:00", "end": "06:00", "limit_mbps": 0}]
+    "quota_daily_limit": 10000,     # Kuota YouTube API per project per hari
+    "project_quota_limits": {},     # {"client_id": unit} jika project punya kuota lebih
+    "io_threads": 8,                # Thread executor AsyncEngine (API, token, statistik)
+    "api_concurrency": 32,          # Batas panggilan API ringan bersamaan
+    "upload_threads": 0,            # Thread executor khusus upload (0 = max_parallel_uploads)
+    "upload_processes": 0,          # >0: transfer upload di proses terpisah (0 = di AsyncEngine)
+    "credential_store": "",         # Path SQLite secret & token gabungan (kosong = file per folder)
+    "credential_store_encrypt": False,  # Enkripsi isi credential store (butuh paket cryptography)
+}
+
+def load_app_settings():
+    """
+    Baca settings.json global (opsional). Key yang tidak ada diisi default.
+    """
+    settings = dict(DEFAULT_APP_SETTINGS)
+    try:
+        if os.path.exists(APP_SETTINGS_FILE):
+            with open(APP_SETTINGS_FILE, "r") as f:
+                settings.update(json.load(f))
+    except Exception as e:
+        print(f"Gagal membaca {APP_SETTINGS_FILE}: {e}")
+    return settings
+
+def load_channel_config(category, channel_name):
+    """
+    Baca config.json milik channel. Return dict kosong jika tidak ada/rusak.
+    """
+    path = os.path.join(BASE_CHANNELS_DIR, category, channel_name, "config.json")
+    try:
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                return json.load(f)
+    except Exception as e:
+        print(f"Gagal membaca config {category}/{channel_name}: {e}")
+    return {}
+
+_json_cache = {}   # path -> (mtime_ns, size, data)
+
+def _load_json_cached(path, loader):
+    try:
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        stamp = None
+    cached = _json_cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    data = loader()
+    _json_cache[path] = (stamp, data)
+    return data
+
+def cached_app_settings():
+    """
+    load_app_settings() yang hanya dibaca ulang jika settings.json berubah (mtime).
+    Untuk pemanggilan sering (admission control kuota); dict hasilnya jangan diubah.
+    """
+    return _load_json_cached(APP_SETTINGS_FILE, load_app_settings)
+
+def cached_channel_config(category, channel_name):
+    """load_channel_config() versi cache, sama seperti cached_app_settings()."""
+    path = os.path.join(BASE_CHANNELS_DIR, category, channel_name, "config.json")
+    return _load_json_cached(path, lambda: load_channel_config(category, channel_name))